@@ -0,0 +1,181 @@
+"""grid_session.py
+State retained between grid volume runs for incremental recomputation.
+
+A :class:`GridSession` keeps, for every tile of the last
+:meth:`VolumeCalculator.calculate_grid_method` run, the sampled elevation
+rasters of both surfaces, the stripping-depth raster and the tile's partial
+cut/fill sums.  On the next run with the same grid the calculator asks the
+session which tiles are *dirty*:
+
+* regions whose polygon or stripping depth changed (or that were added or
+  removed) dirty the tiles covered by their old and new bounding boxes;
+* a surface whose geometry changed dirties only the tiles covered by the
+  faces that appeared or disappeared, found by comparing order-independent
+  per-face hashes.
+
+Only those tiles are re-sampled and re-summed; every other tile reuses its
+stored partial sums.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .sparse_grid import tile_coverage
+
+__all__ = ["GridSession", "FaceSignature", "RegionState", "face_signature", "surface_signature", "region_state"]
+
+logger = logging.getLogger(__name__)
+
+Tile = Tuple[int, int, int, int]
+# (region id, polygon, strip depth) in project order
+RegionState = Tuple[Tuple[str, Tuple[Tuple[float, float], ...], Optional[float]], ...]
+
+
+@dataclass
+class FaceSignature:
+    """Order-independent hashes and bounding boxes of a surface's faces."""
+
+    keys: np.ndarray   # (M,) uint64, sorted
+    boxes: np.ndarray  # (M, 4) x_min, y_min, x_max, y_max aligned with keys
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.boxes.nbytes
+
+
+def _mix(u: np.ndarray) -> np.ndarray:
+    """SplitMix64 finaliser on a uint64 array (wrapping arithmetic)."""
+    u = u ^ (u >> np.uint64(30))
+    u = u * np.uint64(0xBF58476D1CE4E5B9)
+    u = u ^ (u >> np.uint64(27))
+    u = u * np.uint64(0x94D049BB133111EB)
+    return u ^ (u >> np.uint64(31))
+
+
+def face_signature(vertices: np.ndarray, faces: np.ndarray) -> Optional[FaceSignature]:
+    """Hash every face by its corner coordinates, independent of vertex order.
+
+    Returns ``None`` for point-only surfaces, whose interpolation depends on
+    a Delaunay triangulation that can change beyond the edited points.
+    """
+    if len(faces) == 0:
+        return None
+    bits = np.ascontiguousarray(vertices, dtype=np.float64).view(np.uint64).reshape(-1, 3)
+    with np.errstate(over="ignore"):
+        hv = _mix(_mix(_mix(bits[:, 0]) ^ bits[:, 1]) ^ bits[:, 2])
+        h = hv[faces]
+        keys = _mix(h[:, 0] + h[:, 1] + h[:, 2]) ^ (h[:, 0] ^ h[:, 1] ^ h[:, 2])
+    tri = vertices[faces]
+    boxes = np.column_stack([
+        tri[:, :, 0].min(axis=1), tri[:, :, 1].min(axis=1),
+        tri[:, :, 0].max(axis=1), tri[:, :, 1].max(axis=1),
+    ])
+    order = np.argsort(keys, kind="stable")
+    return FaceSignature(keys[order], boxes[order])
+
+
+def surface_signature(surface) -> Optional[FaceSignature]:
+    """:func:`face_signature` of a surface's TIN.
+
+    Raster surfaces (grids and lazy expressions) have no faces and return
+    ``None`` without touching ``vertices``, which would materialise or
+    evaluate them; any change to them dirties every tile.
+    """
+    if surface.is_raster:
+        return None
+    return face_signature(surface.vertices, surface.faces)
+
+
+def region_state(regions: Sequence) -> RegionState:
+    """Snapshot the parts of project regions that influence volumes."""
+    return tuple(
+        (r.id, tuple((float(x), float(y)) for x, y in (r.polygon or [])), r.strip_depth_ft)
+        for r in regions
+    )
+
+
+def _polygon_box(polygon: Tuple[Tuple[float, float], ...]) -> Optional[Tuple[float, float, float, float]]:
+    if not polygon:
+        return None
+    xs, ys = zip(*polygon)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+@dataclass
+class GridSession:
+    """Per-tile rasters and partial sums of the last grid volume run."""
+
+    grid_resolution: float
+    gx: np.ndarray
+    gy: np.ndarray
+    tiles: List[Tile]
+    tile_rows: int
+    tile_cols: int
+    fingerprints: List[str]
+    signatures: List[Optional[FaceSignature]]
+    regions: RegionState
+    default_depth: float
+    z1: List[np.ndarray] = field(default_factory=list)
+    z2: List[np.ndarray] = field(default_factory=list)
+    strip: List[np.ndarray] = field(default_factory=list)
+    sums: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))  # cut, fill, n_valid
+
+    @staticmethod
+    def estimate_nbytes(num_cells: int, num_faces: int) -> int:
+        """Memory needed to keep a session for a grid/surfaces of this size."""
+        return num_cells * 3 * 8 + num_faces * 40
+
+    def matches(self, grid_resolution: float, gx: np.ndarray, gy: np.ndarray,
+                tiles: Sequence[Tile]) -> bool:
+        """True if a run on this grid and tile layout can reuse the stored tiles."""
+        return (
+            self.grid_resolution == grid_resolution
+            and list(tiles) == self.tiles
+            and len(self.gx) == len(gx) and len(self.gy) == len(gy)
+            and np.array_equal(self.gx, gx) and np.array_equal(self.gy, gy)
+        )
+
+    # ------------------------------------------------------------------
+    def surface_dirty_tiles(self, index: int, fingerprint: str,
+                            signature: Optional[FaceSignature]) -> np.ndarray:
+        """Tiles whose samples of surface *index* are stale."""
+        if fingerprint == self.fingerprints[index]:
+            return np.zeros(len(self.tiles), dtype=bool)
+        old = self.signatures[index]
+        if old is None or signature is None:
+            return np.ones(len(self.tiles), dtype=bool)
+
+        removed = old.boxes[~np.isin(old.keys, signature.keys, assume_unique=False)]
+        added = signature.boxes[~np.isin(signature.keys, old.keys, assume_unique=False)]
+        return self._tiles_touching(np.vstack([removed, added]))
+
+    def region_dirty_tiles(self, regions: RegionState, default_depth: float) -> np.ndarray:
+        """Tiles whose stripping depths may have changed."""
+        if regions == self.regions and default_depth == self.default_depth:
+            return np.zeros(len(self.tiles), dtype=bool)
+        if default_depth != self.default_depth or [r[0] for r in regions] != [r[0] for r in self.regions]:
+            # A new default or re-ordered precedence can change any cell
+            return np.ones(len(self.tiles), dtype=bool)
+
+        boxes = []
+        for old, new in zip(self.regions, regions):
+            if old != new:
+                boxes.extend(b for b in (_polygon_box(old[1]), _polygon_box(new[1])) if b is not None)
+        if not boxes:
+            return np.zeros(len(self.tiles), dtype=bool)
+        return self._tiles_touching(np.asarray(boxes, dtype=np.float64))
+
+    def _tiles_touching(self, boxes: np.ndarray) -> np.ndarray:
+        """Mark stored tiles containing grid nodes inside any ``(x0, y0, x1, y1)`` box."""
+        if len(boxes) == 0:
+            return np.zeros(len(self.tiles), dtype=bool)
+        covered = tile_coverage(self.gx, self.gy, self.tile_rows, self.tile_cols, boxes)
+        # Sparse runs store a subset of the tile grid; look each one up by position
+        rows = np.fromiter((t[0] // self.tile_rows for t in self.tiles), dtype=np.intp, count=len(self.tiles))
+        cols = np.fromiter((t[2] // self.tile_cols for t in self.tiles), dtype=np.intp, count=len(self.tiles))
+        return covered[rows, cols]
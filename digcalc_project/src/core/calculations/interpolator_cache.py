@@ -0,0 +1,156 @@
+"""interpolator_cache.py
+Process-wide LRU cache for expensive per-surface derived objects such as
+SciPy ``LinearNDInterpolator`` instances (which embed a Delaunay
+triangulation).
+
+Entries are keyed by ``(kind, Surface.fingerprint())`` so re-running a volume
+calculation at a different grid resolution, or after a region edit, reuses the
+triangulation as long as the surface geometry itself is unchanged.  The cache
+evicts least-recently-used entries once the summed size of its entries exceeds
+the memory budget configured via :pymeth:`SettingsService.interpolator_cache_mb`.
+
+Example
+-------
+>>> cache = InterpolatorCache()
+>>> interp = cache.get_or_build(("linear", surface.fingerprint()), build_fn)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import numpy as np
+
+from ...services.settings_service import SettingsService
+from ...utils.singleton import Singleton
+
+__all__ = ["InterpolatorCache", "estimate_nbytes"]
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_nbytes(obj: Any) -> int:
+    """Best-effort size estimate (bytes) of a cached interpolator/triangulation.
+
+    Objects exposing an integer ``nbytes`` report their own size.  Otherwise
+    sums the NumPy arrays hanging off *obj* and, for SciPy interpolators, off
+    its ``tri`` attribute.  Delaunay's barycentric ``transform`` is built
+    lazily on first use, so it is accounted for up-front (48 bytes/simplex).
+    """
+    own = getattr(obj, "nbytes", None)
+    if isinstance(own, int):
+        return max(own, 1)
+    total = 0
+    seen = set()
+    holders = [obj]
+    tri = getattr(obj, "tri", None)
+    if tri is not None:
+        holders.append(tri)
+    for holder in holders:
+        for attr in ("points", "simplices", "neighbors", "equations", "values", "vertices", "faces"):
+            arr = getattr(holder, attr, None)
+            if isinstance(arr, np.ndarray) and id(arr) not in seen:
+                seen.add(id(arr))
+                total += arr.nbytes
+    simplices = getattr(tri, "simplices", None) if tri is not None else None
+    if isinstance(simplices, np.ndarray):
+        total += len(simplices) * 6 * 8
+    return max(total, 1)
+
+
+class InterpolatorCache(Singleton):
+    """Thread-safe, memory-budgeted LRU cache (singleton)."""
+
+    def __init__(self) -> None:
+        # Guard – only run once due to Singleton inheritance
+        if getattr(self, "_initialized", False):  # type: ignore[attr-defined]
+            return
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        self._budget = SettingsService().interpolator_cache_mb() * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._initialized = True  # type: ignore[attr-defined]
+
+    # ------------------------------------------------------------------
+    @property
+    def budget_bytes(self) -> int:
+        """Return the current memory budget in bytes."""
+        return self._budget
+
+    def set_budget(self, nbytes: int) -> None:
+        """Change the memory budget, evicting entries if it shrank."""
+        with self._lock:
+            self._budget = max(int(nbytes), 0)
+            self._evict_locked()
+
+    @property
+    def nbytes(self) -> int:
+        """Return the estimated size of all cached entries in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    # ------------------------------------------------------------------
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for *key* (marking it most recent) or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None) -> None:
+        """Insert *value* under *key*, evicting LRU entries beyond the budget.
+
+        Values larger than the whole budget are not cached at all.
+        """
+        size = estimate_nbytes(value) if nbytes is None else int(nbytes)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            if size > self._budget:
+                logger.debug("Not caching %s: %d bytes exceeds budget %d", key, size, self._budget)
+                return
+            self._entries[key] = (value, size)
+            self._nbytes += size
+            self._evict_locked()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value for *key*, calling *build()* on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        else:
+            logger.debug("Interpolator cache hit for %s", key)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    # ------------------------------------------------------------------
+    def _evict_locked(self) -> None:
+        """Pop least-recently-used entries until within budget (lock held)."""
+        while self._entries and self._nbytes > self._budget:
+            key, (_, size) = self._entries.popitem(last=False)
+            self._nbytes -= size
+            logger.debug("Evicted %s from interpolator cache (%d bytes)", key, size)
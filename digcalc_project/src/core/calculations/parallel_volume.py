@@ -0,0 +1,195 @@
+"""parallel_volume.py
+Fan the tiles of a grid volume calculation out over several workers.
+
+Two back-ends are offered:
+
+* **threads** – tiles run in a :class:`~concurrent.futures.ThreadPoolExecutor`
+  and read the caller's surface arrays directly.  NumPy releases the GIL in
+  the heavy kernels, so this scales well without any copying.
+* **processes** – tiles run in a :class:`~concurrent.futures.ProcessPoolExecutor`.
+  The surface vertex/face arrays are written once to ``.npy`` files in a
+  temporary directory and every worker memory-maps them in its initializer,
+  so the geometry is shared through the OS page cache and never pickled per
+  task.  Only tile bounds travel to the workers and only per-tile totals
+  (plus the dz tile when requested) travel back.
+
+Both back-ends yield tile results in tile order, so the caller accumulates
+cut/fill in exactly the same order as the serial loop.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...models.project import Project
+from ...models.surface import Surface
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .volume_calculator import VolumeCalculator
+
+__all__ = ["TileResult", "resolve_worker_count", "iter_tile_results"]
+
+logger = logging.getLogger(__name__)
+
+Tile = Tuple[int, int, int, int]
+TileResult = Tuple[float, float, int, Optional[np.ndarray], Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]]
+
+# Per-process state populated by _init_worker (process back-end only)
+_WORKER: Optional[SimpleNamespace] = None
+
+
+def resolve_worker_count(workers: Optional[int]) -> int:
+    """Translate a worker option into a concrete count (``0``/``None`` → all cores)."""
+    if not workers or workers < 0:
+        return os.cpu_count() or 1
+    return int(workers)
+
+
+def iter_tile_results(
+    calculator: VolumeCalculator,
+    surface1: Surface,
+    surface2: Surface,
+    gx: np.ndarray,
+    gy: np.ndarray,
+    tiles: Sequence[Tile],
+    cell_area: float,
+    workers: int,
+    use_processes: bool = False,
+    want_dz: bool = True,
+    keep_rasters: bool = False,
+) -> Iterator[TileResult]:
+    """Yield ``(cut, fill, n_valid, dz_tile, rasters)`` for every tile, in tile order.
+
+    Args:
+        calculator: Calculator whose project regions drive stripping depths.
+        surface1: Existing surface.
+        surface2: Proposed surface.
+        gx: Full grid X coordinates.
+        gy: Full grid Y coordinates.
+        tiles: ``(row_start, row_stop, col_start, col_stop)`` tuples.
+        cell_area: Area of one grid cell.
+        workers: Number of workers; ``1`` runs serially in the calling thread.
+        use_processes: Use a process pool instead of a thread pool.
+        want_dz: Return dz tiles (otherwise ``None`` is yielded in their place).
+        keep_rasters: Return each tile's ``(z1, z2, strip)`` rasters as well.
+
+    """
+    if workers > 1 and len(tiles) > 1 and use_processes:
+        yield from _iter_process_results(calculator, surface1, surface2, gx, gy, tiles, cell_area,
+                                         min(workers, len(tiles)), want_dz, keep_rasters)
+    else:
+        yield from _iter_local_results(calculator, surface1, surface2, gx, gy, tiles, cell_area,
+                                       min(workers, len(tiles)), want_dz, keep_rasters)
+
+
+def _iter_local_results(calculator: VolumeCalculator, surface1: Surface, surface2: Surface,
+                        gx: np.ndarray, gy: np.ndarray, tiles: Sequence[Tile], cell_area: float,
+                        workers: int, want_dz: bool, keep_rasters: bool) -> Iterator[TileResult]:
+    """Run the tiles in the calling thread, or in a thread pool when *workers* > 1."""
+    from .volume_calculator import surface_sampler
+
+    # Samplers (TIN index / interpolator) are prepared once and shared by all tiles
+    sample1 = surface_sampler(surface1)
+    sample2 = surface_sampler(surface2)
+
+    def run(tile: Tile) -> TileResult:
+        r0, r1, c0, c1 = tile
+        cut, fill, valid, dz, rasters = calculator._volume_tile(
+            sample1, sample2, gx[c0:c1], gy[r0:r1], cell_area, keep_rasters)
+        return cut, fill, valid, dz if want_dz else None, rasters
+
+    if workers <= 1:
+        for tile in tiles:
+            yield run(tile)
+        return
+
+    logger.debug(f"Running {len(tiles)} tiles on {workers} threads.")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="volume-tile") as pool:
+        yield from pool.map(run, tiles)
+
+
+def _iter_process_results(calculator: VolumeCalculator, surface1: Surface, surface2: Surface,
+                          gx: np.ndarray, gy: np.ndarray, tiles: Sequence[Tile], cell_area: float,
+                          workers: int, want_dz: bool, keep_rasters: bool) -> Iterator[TileResult]:
+    """Run the tiles in a pool of *workers* processes sharing the arrays through ``.npy`` files.
+
+    Workers are spawned, never forked: the GUI process runs other thread
+    pools, and forking a multi-threaded process can deadlock the child.
+    """
+    regions = list(getattr(calculator.project, "regions", None) or [])
+    with tempfile.TemporaryDirectory(prefix="digcalc_tiles_") as tmp:
+        specs = [_dump_surface(Path(tmp), f"s{i}", s) for i, s in enumerate((surface1, surface2))]
+        np.save(Path(tmp) / "gx.npy", np.asarray(gx, dtype=np.float64))
+        np.save(Path(tmp) / "gy.npy", np.asarray(gy, dtype=np.float64))
+
+        logger.debug(f"Running {len(tiles)} tiles on {workers} processes (shared arrays in {tmp}).")
+        chunksize = max(len(tiles) // (workers * 4), 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker,
+                                 initargs=(tmp, specs, regions, cell_area, want_dz, keep_rasters)) as pool:
+            yield from pool.map(_run_tile, tiles, chunksize=chunksize)
+
+
+# ----------------------------------------------------------------------
+# Process back-end helpers
+# ----------------------------------------------------------------------
+def _dump_surface(folder: Path, key: str, surface: Surface) -> Tuple[str, str, Optional[Tuple[float, float, float]]]:
+    """Write *surface*'s arrays to ``<key>_v.npy`` / ``<key>_f.npy``.
+
+    Raster surfaces ship only their grid (``<key>_g.npy``) plus spacing and
+    origin, so workers never see a vertex array.
+    """
+    if surface.is_raster:
+        np.save(folder / f"{key}_g.npy", surface.grid_data)
+        return key, surface.name, (surface.grid_spacing, *surface.grid_origin)
+    np.save(folder / f"{key}_v.npy", surface.vertices)
+    np.save(folder / f"{key}_f.npy", surface.faces)
+    return key, surface.name, None
+
+
+def _init_worker(folder: str, specs: List[Tuple[str, str, Optional[Tuple[float, float, float]]]], regions: list,
+                 cell_area: float, want_dz: bool, keep_rasters: bool) -> None:
+    """Memory-map the shared arrays once per worker process."""
+    from .volume_calculator import VolumeCalculator, surface_sampler
+
+    global _WORKER
+    base = Path(folder)
+    calculator = VolumeCalculator(Project(name="volume-worker", regions=regions))
+    samplers = []
+    for key, name, raster in specs:
+        if raster is not None:
+            surface = Surface(name)
+            surface.set_grid_data(np.load(base / f"{key}_g.npy", mmap_mode="r"), raster[0], raster[1:])
+        else:
+            vertices = np.load(base / f"{key}_v.npy", mmap_mode="r")
+            faces = np.load(base / f"{key}_f.npy", mmap_mode="r")
+            surface = Surface.from_arrays(name, vertices, faces)
+        samplers.append(surface_sampler(surface))
+    _WORKER = SimpleNamespace(
+        calculator=calculator,
+        samplers=samplers,
+        gx=np.load(base / "gx.npy", mmap_mode="r"),
+        gy=np.load(base / "gy.npy", mmap_mode="r"),
+        cell_area=cell_area,
+        want_dz=want_dz,
+        keep_rasters=keep_rasters,
+    )
+
+
+def _run_tile(tile: Tile) -> TileResult:
+    """Compute one tile inside a worker process."""
+    w = _WORKER
+    r0, r1, c0, c1 = tile
+    cut, fill, valid, dz, rasters = w.calculator._volume_tile(
+        w.samplers[0], w.samplers[1], np.asarray(w.gx[c0:c1]), np.asarray(w.gy[r0:r1]),
+        w.cell_area, w.keep_rasters)
+    return cut, fill, valid, dz if w.want_dz else None, rasters
@@ -0,0 +1,132 @@
+"""sparse_grid.py
+Tile-sparse rasters for grid volume calculations.
+
+A site whose surfaces cover an L-shaped or scattered footprint wastes most of
+its bounding-box raster on ``NaN`` cells.  In sparse mode the volume
+calculator only evaluates the tiles touched by both surfaces' faces and
+returns the elevation differences as a :class:`TiledGrid` – a dictionary of
+dense blocks keyed by tile – so memory and time scale with the covered area.
+
+Example
+-------
+>>> dz = calculator.calculate_grid_method(eg, fg, 1.0, sparse=True)["dz_grid"]
+>>> for r0, r1, c0, c1, block in dz.blocks():
+...     ...
+>>> dense = dz.to_dense()  # only for small grids / display
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+__all__ = ["TiledGrid", "tile_coverage"]
+
+logger = logging.getLogger(__name__)
+
+Tile = Tuple[int, int, int, int]
+
+
+def tile_coverage(gx: np.ndarray, gy: np.ndarray, tile_rows: int, tile_cols: int,
+                  boxes: np.ndarray) -> np.ndarray:
+    """Mark the tiles containing grid nodes inside any ``(x0, y0, x1, y1)`` box.
+
+    Args:
+        gx: Ascending grid X coordinates (columns).
+        gy: Ascending grid Y coordinates (rows).
+        tile_rows: Rows per tile.
+        tile_cols: Columns per tile.
+        boxes: ``(K, 4)`` array of axis-aligned boxes.
+
+    Returns:
+        np.ndarray: Boolean ``(n_tile_rows, n_tile_cols)`` coverage mask.
+
+    """
+    n_tr = -(-len(gy) // tile_rows)
+    n_tc = -(-len(gx) // tile_cols)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if len(boxes) == 0:
+        return np.zeros((n_tr, n_tc), dtype=bool)
+
+    c0 = np.searchsorted(gx, boxes[:, 0], side="left")
+    c1 = np.searchsorted(gx, boxes[:, 2], side="right") - 1
+    r0 = np.searchsorted(gy, boxes[:, 1], side="left")
+    r1 = np.searchsorted(gy, boxes[:, 3], side="right") - 1
+    hit = (c0 <= c1) & (r0 <= r1)
+    t_c0, t_c1 = c0[hit] // tile_cols, c1[hit] // tile_cols
+    t_r0, t_r1 = r0[hit] // tile_rows, r1[hit] // tile_rows
+
+    # 2D difference array: +1/-1 at box corners, prefix sums give coverage
+    diff = np.zeros((n_tr + 1, n_tc + 1), dtype=np.int64)
+    np.add.at(diff, (t_r0, t_c0), 1)
+    np.add.at(diff, (t_r0, t_c1 + 1), -1)
+    np.add.at(diff, (t_r1 + 1, t_c0), -1)
+    np.add.at(diff, (t_r1 + 1, t_c1 + 1), 1)
+    return diff.cumsum(axis=0).cumsum(axis=1)[:n_tr, :n_tc] > 0
+
+
+class TiledGrid:
+    """A 2D raster stored as dense blocks for the evaluated tiles only.
+
+    Cells outside every block read as *fill_value* (``NaN`` by default).
+    Blocks are assigned with slice syntax, mirroring a dense array, so the
+    calculator writes to either kind of output the same way::
+
+        grid[r0:r1, c0:c1] = block
+    """
+
+    def __init__(self, shape: Tuple[int, int], dtype=np.float32, fill_value: float = np.nan) -> None:
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.dtype = np.dtype(dtype)
+        self.fill_value = fill_value
+        self._blocks: Dict[Tile, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    def __setitem__(self, key: Tuple[slice, slice], block: np.ndarray) -> None:
+        rows, cols = key
+        r0, r1, _ = rows.indices(self.shape[0])
+        c0, c1, _ = cols.indices(self.shape[1])
+        block = np.asarray(block, dtype=self.dtype)
+        if block.shape != (r1 - r0, c1 - c0):
+            raise ValueError(f"Block shape {block.shape} does not match slice {(r1 - r0, c1 - c0)}.")
+        self._blocks[(r0, r1, c0, c1)] = block
+
+    def blocks(self) -> Iterator[Tuple[int, int, int, int, np.ndarray]]:
+        """Yield ``(row_start, row_stop, col_start, col_stop, block)`` in row-major order."""
+        for tile in sorted(self._blocks):
+            yield (*tile, self._blocks[tile])
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    @property
+    def size(self) -> int:
+        """Number of cells in the full (virtual) raster."""
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def stored_cells(self) -> int:
+        """Number of cells actually held in blocks."""
+        return sum(b.size for b in self._blocks.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored blocks."""
+        return sum(b.nbytes for b in self._blocks.values())
+
+    # ------------------------------------------------------------------
+    def to_dense(self) -> np.ndarray:
+        """Expand into a full ``shape`` array, filling uncovered cells."""
+        out = np.full(self.shape, self.fill_value, dtype=self.dtype)
+        for r0, r1, c0, c1, block in self.blocks():
+            out[r0:r1, c0:c1] = block
+        return out
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype, copy=False)
+
+    def __repr__(self) -> str:
+        return f"TiledGrid(shape={self.shape}, blocks={len(self)}, stored_cells={self.stored_cells})"
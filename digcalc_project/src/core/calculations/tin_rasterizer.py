@@ -0,0 +1,173 @@
+"""tin_rasterizer.py
+Rasterise a triangulated surface (TIN) onto a rectilinear grid.
+
+Instead of re-triangulating the surface points (a Qhull call that discards the
+face topology delivered by the surveyor), every existing face is visited once
+and only the grid nodes inside its bounding box are tested.  Candidate
+(face, node) pairs are generated with NumPy in bounded chunks, tested with
+barycentric coordinates and the inside nodes receive the linearly interpolated
+elevation of that face.  The work therefore grows with the number of covered
+grid nodes rather than with the number of points squared.
+
+Example
+-------
+>>> z = rasterize_tin(surface.vertices, surface.faces, gx, gy)
+>>> z.shape == (len(gy), len(gx))
+True
+
+When the same TIN is sampled tile by tile, build a :class:`TinIndex` once and
+call :meth:`TinIndex.rasterize` per tile.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+__all__ = ["TinIndex", "rasterize_tin"]
+
+logger = logging.getLogger(__name__)
+
+# Candidate (face, node) pairs evaluated per vectorised batch.  Each pair needs
+# roughly a dozen float64/int64 temporaries, so 1M pairs is ~100 MB peak.
+DEFAULT_CHUNK_CELLS = 1_000_000
+
+# Relative slack on the barycentric test so nodes lying exactly on a shared
+# edge or vertex are not lost to floating point round-off.
+_BARY_TOL = 1e-9
+
+
+class TinIndex:
+    """Per-face geometry of a TIN, prepared once and reused for many tiles.
+
+    Faces are sorted by their minimum Y so a tile only visits faces whose
+    bounding box can overlap its rows; per-tile cost is proportional to the
+    faces and grid nodes it actually covers.
+    """
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray) -> None:
+        tri = np.asarray(vertices, dtype=np.float64)[np.asarray(faces, dtype=np.intp)].reshape(-1, 3, 3)
+        x, y = tri[:, :, 0], tri[:, :, 1]
+
+        # Twice the signed area; zero for degenerate (collinear) faces
+        det = (y[:, 1] - y[:, 2]) * (x[:, 0] - x[:, 2]) + (x[:, 2] - x[:, 1]) * (y[:, 0] - y[:, 2])
+        extent = np.maximum(np.ptp(x, axis=1), np.ptp(y, axis=1)) if len(tri) else np.empty(0)
+        usable = np.abs(det) > 1e-12 * np.maximum(extent * extent, 1e-300)
+        if np.count_nonzero(~usable):
+            logger.debug(f"Skipping {np.count_nonzero(~usable)} degenerate faces in TIN index.")
+
+        y_min = y.min(axis=1) if len(tri) else np.empty(0)
+        order = np.argsort(y_min[usable], kind="stable")
+        tri, det = tri[usable][order], det[usable][order]
+        self.tri = tri
+        self.det = det
+        self.x_min = tri[:, :, 0].min(axis=1)
+        self.x_max = tri[:, :, 0].max(axis=1)
+        self.y_min = tri[:, :, 1].min(axis=1)
+        self.y_max = tri[:, :, 1].max(axis=1)
+        self.max_height = float((self.y_max - self.y_min).max()) if len(tri) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the index arrays."""
+        return sum(a.nbytes for a in (self.tri, self.det, self.x_min, self.x_max, self.y_min, self.y_max))
+
+    def __len__(self) -> int:
+        return len(self.tri)
+
+    def rasterize(self, gx: np.ndarray, gy: np.ndarray, chunk_cells: int = DEFAULT_CHUNK_CELLS) -> np.ndarray:
+        """Sample the TIN at every node of the grid spanned by *gx* × *gy*.
+
+        Args:
+            gx: 1D array of ascending grid X coordinates (columns).
+            gy: 1D array of ascending grid Y coordinates (rows).
+            chunk_cells: Upper bound on candidate (face, node) pairs evaluated
+                at once; caps peak memory for very large grids.
+
+        Returns:
+            np.ndarray: ``float64`` elevations with shape ``(len(gy), len(gx))``;
+            ``NaN`` where no face covers the node.
+
+        """
+        gx = np.asarray(gx, dtype=np.float64)
+        gy = np.asarray(gy, dtype=np.float64)
+        out = np.full((len(gy), len(gx)), np.nan, dtype=np.float64)
+        if len(self.tri) == 0 or out.size == 0:
+            return out
+
+        # Faces sorted by y_min: only those starting within max_height below
+        # the first row up to the last row can touch this grid
+        lo = int(np.searchsorted(self.y_min, gy[0] - self.max_height, side="left"))
+        hi = int(np.searchsorted(self.y_min, gy[-1], side="right"))
+        cand = np.arange(lo, hi)
+        cand = cand[(self.y_max[cand] >= gy[0]) & (self.x_max[cand] >= gx[0]) & (self.x_min[cand] <= gx[-1])]
+        if cand.size == 0:
+            return out
+
+        # Grid node index ranges covered by each face's bounding box
+        c0 = np.searchsorted(gx, self.x_min[cand], side="left")
+        c1 = np.searchsorted(gx, self.x_max[cand], side="right")
+        r0 = np.searchsorted(gy, self.y_min[cand], side="left")
+        r1 = np.searchsorted(gy, self.y_max[cand], side="right")
+        ncols = np.maximum(c1 - c0, 0)
+        counts = ncols * np.maximum(r1 - r0, 0)
+
+        active = np.flatnonzero(counts)
+        if active.size == 0:
+            return out
+
+        cum = np.cumsum(counts[active])
+        start = 0
+        while start < active.size:
+            done = cum[start - 1] if start else 0
+            stop = max(int(np.searchsorted(cum, done + chunk_cells, side="right")), start + 1)
+            sel = active[start:stop]
+            start = stop
+
+            # Expand each face into the flat list of nodes in its bounding box
+            n = counts[sel]
+            k = np.repeat(sel, n)
+            local = np.arange(int(n.sum()), dtype=np.int64) - np.repeat(np.cumsum(n) - n, n)
+            cols = c0[k] + local % ncols[k]
+            rows = r0[k] + local // ncols[k]
+            px, py = gx[cols], gy[rows]
+
+            t = cand[k]
+            xt, yt, zt, dt = self.tri[t, :, 0], self.tri[t, :, 1], self.tri[t, :, 2], self.det[t]
+            l0 = ((yt[:, 1] - yt[:, 2]) * (px - xt[:, 2]) + (xt[:, 2] - xt[:, 1]) * (py - yt[:, 2])) / dt
+            l1 = ((yt[:, 2] - yt[:, 0]) * (px - xt[:, 2]) + (xt[:, 0] - xt[:, 2]) * (py - yt[:, 2])) / dt
+            l2 = 1.0 - l0 - l1
+            inside = (l0 >= -_BARY_TOL) & (l1 >= -_BARY_TOL) & (l2 >= -_BARY_TOL)
+
+            out[rows[inside], cols[inside]] = (
+                l0[inside] * zt[inside, 0] + l1[inside] * zt[inside, 1] + l2[inside] * zt[inside, 2]
+            )
+
+        return out
+
+
+def rasterize_tin(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    gx: np.ndarray,
+    gy: np.ndarray,
+    chunk_cells: int = DEFAULT_CHUNK_CELLS,
+) -> np.ndarray:
+    """Sample a TIN at every node of the grid spanned by *gx* × *gy*.
+
+    Convenience wrapper around :class:`TinIndex` for one-off rasterisation.
+
+    Args:
+        vertices: ``(N, 3)`` array of x, y, z vertex coordinates.
+        faces: ``(M, 3)`` integer array of vertex indices per triangle.
+        gx: 1D array of ascending grid X coordinates (columns).
+        gy: 1D array of ascending grid Y coordinates (rows).
+        chunk_cells: Upper bound on candidate (face, node) pairs evaluated at once.
+
+    Returns:
+        np.ndarray: ``float64`` elevations with shape ``(len(gy), len(gx))``;
+        ``NaN`` where no face covers the node.
+
+    """
+    return TinIndex(vertices, faces).rasterize(gx, gy, chunk_cells)
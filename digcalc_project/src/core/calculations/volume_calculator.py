@@ -5,7 +5,7 @@ This module provides functionality to calculate volumes between surfaces.
 """
 
 import logging
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -15,6 +15,11 @@ from ...models.project import Project
 # Use relative import
 from ...models.surface import Surface
 from ...services.settings_service import SettingsService
+from .interpolator_cache import InterpolatorCache
+from .grid_session import GridSession, region_state, surface_signature
+from .parallel_volume import TileResult, iter_tile_results, resolve_worker_count
+from .sparse_grid import TiledGrid, tile_coverage
+from .tin_rasterizer import TinIndex
 
 # External dependencies (Ensure installed)
 try:
@@ -23,11 +28,87 @@ except ImportError:
     griddata = None
     logging.getLogger(__name__).warning("SciPy not found. Grid interpolation will not work.")
 try:
+    from shapely import contains_xy, prepare
     from shapely.errors import GEOSException
-    from shapely.geometry import Point, Polygon
+    from shapely.geometry import Polygon
 except ImportError:
-    Point, Polygon, GEOSException = None, None, None
-    logging.getLogger(__name__).warning("Shapely not found. Region-based stripping will not work.")
+    contains_xy, prepare, Polygon, GEOSException = None, None, None, None
+    logging.getLogger(__name__).warning("Shapely 2 not found. Region-based stripping will not work.")
+
+
+# Rough working memory per grid node while a tile is processed: node
+# coordinates, two sampled elevations, stripping depth, dz and masks, plus
+# temporaries of the interpolators.
+_BYTES_PER_TILE_CELL = 96
+
+# Largest tile side (in nodes) for sparse runs; smaller tiles follow an
+# irregular footprint more closely at the cost of more per-tile overhead.
+_SPARSE_TILE_SIDE = 256
+
+logger = logging.getLogger(__name__)
+
+Sampler = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def surface_sampler(surface: Surface) -> Sampler:
+    """Returns a callable ``(gx, gy) -> z`` sampling *surface* on grid nodes.
+
+    Surfaces that carry faces are rasterised directly from their own TIN so
+    the result honours the delivered breaklines and needs no Qhull call.
+    Point-only surfaces fall back to a Delaunay-based interpolation.  The
+    prepared TIN index / interpolator is cached by the surface fingerprint,
+    so building a sampler for unchanged geometry is cheap.  The returned
+    callable gives elevations with shape ``(len(gy), len(gx))``, NaN outside
+    the surface.  Grid surfaces are sampled bilinearly from their raster.
+    """
+    if surface.is_raster:
+        logger.debug(f"Sampling raster '{surface.name}' at spacing {surface.grid_spacing}.")
+        return surface.sample_grid
+    if len(surface.faces) > 0:
+        tin = InterpolatorCache().get_or_build(
+            ("tin", surface.fingerprint()),
+            lambda: TinIndex(surface.vertices, surface.faces),
+        )
+        logger.debug(f"Sampling TIN '{surface.name}' from its {len(tin)} faces.")
+        return tin.rasterize
+
+    interpolator = point_interpolator(surface)
+
+    def sample(gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        if interpolator is None:
+            return np.full((len(gy), len(gx)), np.nan)
+        grid_x_mesh, grid_y_mesh = np.meshgrid(gx, gy)
+        try:
+            return interpolator(grid_x_mesh, grid_y_mesh)
+        except Exception as e:
+            logger.error(f"Linear interpolation failed for '{surface.name}': {e}", exc_info=True)
+            return np.full((len(gy), len(gx)), np.nan)
+
+    return sample
+
+
+def point_interpolator(surface: Surface):
+    """Returns a (cached) ``LinearNDInterpolator`` over the surface points, or None."""
+    from scipy.interpolate import LinearNDInterpolator  # Import locally if needed
+
+    if not surface.points:
+        logger.warning(f"Interpolation skipped for '{surface.name}': Surface has no data points.")
+        return None
+
+    vertices = surface.vertices
+    if len(vertices) < 3:
+        logger.warning(f"Interpolation skipped for '{surface.name}': Has only {len(vertices)} points. Linear interpolation requires at least 3.")
+        return None
+
+    try:
+        # Reuse the triangulation while the surface geometry is unchanged
+        return InterpolatorCache().get_or_build(
+            ("linear", surface.fingerprint()),
+            lambda: LinearNDInterpolator(vertices[:, :2], vertices[:, 2]),
+        )
+    except Exception as e:
+        logger.error(f"Linear interpolation failed for '{surface.name}': {e}", exc_info=True)
+        return None
 
 
 class VolumeCalculator:
@@ -37,24 +118,59 @@ class VolumeCalculator:
         """Initialize the volume calculator with the project context."""
         self.logger = logging.getLogger(__name__)
         self.project = project
+        # Tiles of the last grid run, reused when only regions or parts of a surface change
+        self._session: Optional[GridSession] = None
+        self.last_recomputed_tiles = 0
 
     def calculate_grid_method(self, surface1: Surface,
                               surface2: Surface,
-                              grid_resolution: float = 1.0) -> Dict[str, Any]:
+                              grid_resolution: float = 1.0,
+                              tile_budget_mb: Optional[float] = None,
+                              return_dz_grid: bool = True,
+                              dz_memmap_path: Optional[str] = None,
+                              workers: Optional[int] = None,
+                              use_processes: Optional[bool] = None,
+                              reuse: bool = True,
+                              sparse: bool = False) -> Dict[str, Any]:
         """Calculates cut, fill, net volumes, and the difference grid between two surfaces.
 
         Args:
             surface1 (Surface): The existing terrain surface model (or first surface).
             surface2 (Surface): The proposed design surface model (or second surface).
             grid_resolution (float): The side length of the square grid cells.
+            tile_budget_mb (Optional[float]): Working-memory budget for one tile of
+                the grid. Defaults to ``SettingsService().volume_tile_budget_mb()``.
+                The grid is processed tile by tile so peak memory stays bounded
+                regardless of site size.
+            return_dz_grid (bool): Assemble and return the full ``dz_grid``. Pass
+                ``False`` when only the totals are needed.
+            dz_memmap_path (Optional[str]): If given, ``dz_grid`` is written to a
+                memory-mapped ``.npy`` file at this path instead of RAM.
+            workers (Optional[int]): Number of parallel tile workers; ``0`` uses
+                every core and ``1`` runs serially. Defaults to
+                ``SettingsService().volume_workers()``. Results match the
+                serial path.
+            use_processes (Optional[bool]): Run tiles in a process pool (surface
+                arrays shared via memory-mapped files) instead of a thread
+                pool. Defaults to ``SettingsService().volume_use_processes()``.
+            reuse (bool): Keep the sampled tiles of this run (within
+                ``SettingsService().volume_session_mb()``) and, when the next
+                run uses the same grid, recompute only the tiles touched by
+                edited regions or changed surface faces.
+            sparse (bool): Evaluate only the tiles covered by both surfaces'
+                faces and return ``dz_grid`` as a :class:`TiledGrid` of those
+                blocks (``dz_memmap_path`` is ignored). Memory and time then
+                scale with the overlapping footprint instead of the bounding box.
 
         Returns:
             Dict[str, Any]: A dictionary containing:
                 - 'cut': Total volume where surface1 > surface2 (float).
                 - 'fill': Total volume where surface2 > surface1 (float).
                 - 'net': fill - cut (float).
-                - 'dz_grid': 2D np.ndarray of elevation differences (surface2 - surface1),
+                - 'dz_grid': 2D float32 np.ndarray of elevation differences (surface2 - surface1),
                              shape (num_y_cells, num_x_cells). NaN where no data.
+                             ``None`` when *return_dz_grid* is False; a
+                             :class:`TiledGrid` when *sparse* is True.
                 - 'grid_x': 1D np.ndarray of X coordinates for grid cell centers/edges.
                 - 'grid_y': 1D np.ndarray of Y coordinates for grid cell centers/edges.
 
@@ -70,9 +186,9 @@ class VolumeCalculator:
             self.logger.error("Input objects must be Surface-like with a 'points' attribute.")
             raise TypeError("Inputs must be Surface objects.")
 
-        # Check if surfaces have data using the points dictionary
-        has_data1 = bool(surface1.points)
-        has_data2 = bool(surface2.points)
+        # Check if surfaces have data (bounds avoid materialising lazy surfaces)
+        has_data1 = surface1.get_bounds() is not None
+        has_data2 = surface2.get_bounds() is not None
 
         if not has_data1 and not has_data2:
             self.logger.error("Calculation failed: Both input surfaces are empty.")
@@ -90,31 +206,12 @@ class VolumeCalculator:
             self.logger.error(f"Error determining bounding box: {e}")
             raise
 
-        # Expand bounding box to include any project regions (for stripping calculations)
-        if self.project and hasattr(self.project, "regions") and self.project.regions:
-            try:
-                xs, ys = [], []
-                for reg in self.project.regions:
-                    if reg.polygon:
-                        for x, y in reg.polygon:
-                            xs.append(float(x))
-                            ys.append(float(y))
-                if xs and ys:
-                    min_x_r, max_x_r = min(xs), max(xs)
-                    min_y_r, max_y_r = min(ys), max(ys)
-                    min_x, min_y, max_x, max_y = bbox
-                    min_x = min(min_x, min_x_r)
-                    min_y = min(min_y, min_y_r)
-                    max_x = max(max_x, max_x_r)
-                    max_y = max(max_y, max_y_r)
-                    bbox = (min_x, min_y, max_x, max_y)
-            except Exception as _e:
-                self.logger.warning(f"Could not extend bounding box with regions: {_e}")
-
-        # 2. Create Calculation Grid Coordinates (gx, gy) and Points (grid_points_xy)
-        # Modify _create_grid to return gx, gy as well
-        gx, gy, grid_points_xy = self._create_grid(bbox, grid_resolution)
-        if grid_points_xy.shape[0] == 0:
+        # Regions are not added to the bounding box: cells outside the
+        # surfaces are NaN whatever their stripping depth.
+
+        # 2. Create Calculation Grid Axes (gx, gy); nodes are generated per tile
+        gx, gy = self._grid_axes(bbox, grid_resolution)
+        if len(gx) == 0 or len(gy) == 0:
             self.logger.warning("Calculation grid is empty. Returning zero volumes and empty grids.")
             # Return empty/default values for grid data
             return {
@@ -128,126 +225,244 @@ class VolumeCalculator:
         num_y_cells = len(gy)
         self.logger.debug(f"Grid created: {num_y_cells} rows (Y), {num_x_cells} columns (X)")
 
-        # 3. Interpolate Elevations onto Grid Points
-        self.logger.info(f"Interpolating surface '{surface1.name}' (Existing)...")
-        z1_interp = self._interpolate_surface(surface1, grid_points_xy)
-        self.logger.info(f"Interpolating surface '{surface2.name}' (Proposed)...")
-        z2_interp = self._interpolate_surface(surface2, grid_points_xy)
-
-        # --- NEW: Apply Stripping Depths to Existing Surface (z1) ---
-        self.logger.info("Applying stripping depths based on regions...")
-        stripping_depths_flat = np.full_like(z1_interp, np.nan)
-        # Iterate through grid points to determine stripping depth
-        # This might be slow for very large grids; consider optimizations if needed.
-        for i, (x, y) in enumerate(grid_points_xy):
-            if not np.isnan(z1_interp[i]): # Only calculate for valid points
-                 stripping_depths_flat[i] = self._depth_for_xy(x, y)
-
-        # Subtract stripping depth from original z1 where valid
-        z1_stripped = z1_interp - stripping_depths_flat # NaN propagates correctly
-        self.logger.info("Finished applying stripping depths.")
-        # --- END NEW ---
-
-        # 4. Calculate Elevation Differences and Create dz_grid
-        # Use the *stripped* z1 for difference calculation
-        valid_mask = ~np.isnan(z1_stripped) & ~np.isnan(z2_interp)
-        num_valid_points = np.sum(valid_mask)
+        settings = SettingsService()
+        workers = resolve_worker_count(settings.volume_workers() if workers is None else workers)
+        if use_processes is None:
+            use_processes = settings.volume_use_processes()
+        # Several tiles per worker keep the pool busy when tile costs differ
+        tiles = self._grid_tiles(num_y_cells, num_x_cells, tile_budget_mb,
+                                 min_tiles=workers * 4 if workers > 1 else 1, square=sparse)
+        if sparse:
+            tiles = self._footprint_tiles(tiles, gx, gy, surface1, surface2)
+
+        # 3. Allocate the output dz grid only when the caller wants it
+        dz_grid = None
+        if return_dz_grid:
+            if sparse:
+                dz_grid = TiledGrid((num_y_cells, num_x_cells), dtype=np.float32)
+            elif dz_memmap_path:
+                dz_grid = np.lib.format.open_memmap(dz_memmap_path, mode="w+", dtype=np.float32,
+                                                    shape=(num_y_cells, num_x_cells))
+            else:
+                dz_grid = np.empty((num_y_cells, num_x_cells), dtype=np.float32)
+
+        cell_area = grid_resolution * grid_resolution
+        session_bytes = GridSession.estimate_nbytes(sum((r1 - r0) * (c1 - c0) for r0, r1, c0, c1 in tiles),
+                                                    len(surface1.faces) + len(surface2.faces))
+        keep_session = reuse and bool(tiles) and session_bytes <= settings.volume_session_mb() * 1024 * 1024
+        session = self._session if keep_session else None
+        if session is not None and not session.matches(grid_resolution, gx, gy, tiles):
+            session = None
+        self._session = None
+        cut = fill = 0.0
+        num_valid_points = 0
+
+        if session is not None:
+            # 4a. Same grid as last run: re-sample and re-sum only the dirty tiles
+            self.last_recomputed_tiles = self._recompute_dirty_tiles(session, surface1, surface2, cell_area)
+            if dz_grid is not None:
+                for (r0, r1, c0, c1), z1, z2, strip in zip(session.tiles, session.z1, session.z2, session.strip):
+                    dz_grid[r0:r1, c0:c1] = z2 - (z1 - strip)
+            self._session = session
+        else:
+            # 4b. Walk the grid tile by tile (optionally in parallel), accumulating cut/fill
+            self.logger.info(f"Processing {len(tiles)} tile(s) on {workers} worker(s) for '{surface1.name}' -> '{surface2.name}' (stripped by regions).")
+            if keep_session:
+                session = GridSession(
+                    grid_resolution=grid_resolution, gx=gx, gy=gy, tiles=tiles,
+                    tile_rows=tiles[0][1] - tiles[0][0], tile_cols=tiles[0][3] - tiles[0][2],
+                    fingerprints=[surface1.fingerprint(), surface2.fingerprint()],
+                    signatures=[surface_signature(s) for s in (surface1, surface2)],
+                    regions=region_state(getattr(self.project, "regions", None) or []),
+                    default_depth=settings.strip_depth_default(),
+                    sums=np.zeros((len(tiles), 3)),
+                )
+            results = iter_tile_results(self, surface1, surface2, gx, gy, tiles, cell_area, workers,
+                                        use_processes=use_processes, want_dz=dz_grid is not None,
+                                        keep_rasters=keep_session)
+            for t, ((r0, r1, c0, c1), (tile_cut, tile_fill, tile_valid, tile_dz, rasters)) in enumerate(zip(tiles, results)):
+                if dz_grid is not None:
+                    dz_grid[r0:r1, c0:c1] = tile_dz
+                if session is not None:
+                    session.z1.append(rasters[0])
+                    session.z2.append(rasters[1])
+                    session.strip.append(rasters[2])
+                    session.sums[t] = tile_cut, tile_fill, tile_valid
+                else:
+                    cut += tile_cut
+                    fill += tile_fill
+                    num_valid_points += tile_valid
+            self.last_recomputed_tiles = len(tiles)
+            self._session = session
+
+        if self._session is not None:
+            # Same left-to-right summation order as the streaming path
+            cut = float(sum(self._session.sums[:, 0]))
+            fill = float(sum(self._session.sums[:, 1]))
+            num_valid_points = int(self._session.sums[:, 2].sum())
+
+        if isinstance(dz_grid, np.memmap):
+            dz_grid.flush()
 
         if num_valid_points == 0:
             self.logger.warning("No overlapping grid points with valid elevations found.")
-            return {
-                "cut": 0.0, "fill": 0.0, "net": 0.0,
-                "dz_grid": np.full((num_y_cells, num_x_cells), np.nan, dtype=np.float32),
-                "grid_x": gx,
-                "grid_y": gy,
-            }
-
-        self.logger.info(f"Calculating differences for {num_valid_points} valid grid points.")
-
-        # Calculate difference (surface2 - surface1_stripped)
-        z_diff_flat = np.full_like(z1_stripped, np.nan)
-        z_diff_flat[valid_mask] = z2_interp[valid_mask] - z1_stripped[valid_mask]
-
-        # --- Reshape the difference array into the 2D dz_grid ---
-        # Reshape needs to match the grid dimensions (num_y_cells, num_x_cells)
-        # Ensure the reshape order matches meshgrid ('C' order usually correct)
-        dz_grid = z_diff_flat.reshape(num_y_cells, num_x_cells)
-
-        # 5. Calculate Cell Volumes and Sum Cut/Fill
-        cell_area = grid_resolution * grid_resolution
-        # Use the flat, masked array for volume calculation
-        cell_volumes = z_diff_flat[valid_mask] * cell_area
 
-        fill = np.sum(cell_volumes[cell_volumes > 0])
-        cut = np.abs(np.sum(cell_volumes[cell_volumes < 0]))
         net = fill - cut
-
-        self.logger.info(f"Grid Volume Calculation Complete: Cut={cut:.3f}, Fill={fill:.3f}, Net={net:.3f}")
+        self.logger.info(f"Grid Volume Calculation Complete: Cut={cut:.3f}, Fill={fill:.3f}, Net={net:.3f} ({num_valid_points} valid grid points)")
 
         # --- Return results including grid data ---
         return {
             "cut": float(cut),
             "fill": float(fill),
             "net": float(net),
-            "dz_grid": dz_grid.astype(np.float32), # Ensure correct dtype
+            "dz_grid": dz_grid,
             "grid_x": gx.astype(np.float32),
             "grid_y": gy.astype(np.float32),
         }
 
-    # Ensure helper methods _get_combined_bounding_box, _create_grid,
-    # and _interpolate_surface exist below this method.
-    # These were defined when we first created the calculator.
+    def _volume_tile(self, sample1: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                     sample2: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                     gx: np.ndarray, gy: np.ndarray,
+                     cell_area: float, keep_rasters: bool = False) -> TileResult:
+        """Computes cut/fill for one grid tile.
+
+        Args:
+            sample1: Sampler of the existing surface (see :func:`surface_sampler`);
+                stripping depths are subtracted from it.
+            sample2: Sampler of the proposed surface.
+            gx: X coordinates of the tile's columns.
+            gy: Y coordinates of the tile's rows.
+            cell_area: Area of a single grid cell.
+            keep_rasters: Also return the ``(z1, z2, strip)`` rasters so the
+                tile can be re-summed incrementally later.
+
+        Returns:
+            Tuple of (cut, fill, number of valid nodes, dz tile of shape
+            ``(len(gy), len(gx))``, rasters or ``None``).
+
+        """
+        z1 = sample1(gx, gy)
+        z2 = sample2(gx, gy)
+        strip = self._stripping_depth_grid(gx, gy)
+        cut, fill, valid, dz = self._tile_sums(z1, z2, strip, cell_area)
+        return cut, fill, valid, dz, ((z1, z2, strip) if keep_rasters else None)
+
+    @staticmethod
+    def _tile_sums(z1: np.ndarray, z2: np.ndarray, strip: np.ndarray,
+                   cell_area: float) -> Tuple[float, float, int, np.ndarray]:
+        """Returns (cut, fill, n_valid, dz) for one tile's rasters."""
+        # Subtract stripping depth from the existing surface (NaN propagates)
+        dz = z2 - (z1 - strip)
+        valid = ~np.isnan(dz)
+        cell_volumes = dz[valid] * cell_area
+        fill = float(np.sum(cell_volumes[cell_volumes > 0]))
+        cut = float(np.abs(np.sum(cell_volumes[cell_volumes < 0])))
+        return cut, fill, int(np.count_nonzero(valid)), dz
+
+    def _recompute_dirty_tiles(self, session: GridSession, surface1: Surface, surface2: Surface,
+                               cell_area: float) -> int:
+        """Refreshes the tiles of *session* invalidated since the last run.
+
+        Surfaces are re-sampled only on tiles covered by faces that appeared
+        or disappeared; stripping depths only on tiles covered by edited
+        regions.  Untouched tiles keep their stored rasters and sums.
+
+        Returns:
+            int: Number of tiles that were recomputed.
+
+        """
+        surfaces = (surface1, surface2)
+        fingerprints = [s.fingerprint() for s in surfaces]
+        signatures = [
+            surface_signature(s) if fp != session.fingerprints[i] else session.signatures[i]
+            for i, (s, fp) in enumerate(zip(surfaces, fingerprints))
+        ]
+        regions = region_state(getattr(self.project, "regions", None) or [])
+        default_depth = SettingsService().strip_depth_default()
+
+        stale = [session.surface_dirty_tiles(i, fingerprints[i], signatures[i]) for i in range(2)]
+        stale_strip = session.region_dirty_tiles(regions, default_depth)
+        dirty = np.flatnonzero(stale[0] | stale[1] | stale_strip)
+        self.logger.info(f"Reusing grid session: recomputing {len(dirty)} of {len(session.tiles)} tile(s).")
+
+        samplers: List[Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]]] = [None, None]
+        rasters = (session.z1, session.z2)
+        for t in dirty:
+            r0, r1, c0, c1 = session.tiles[t]
+            gx, gy = session.gx[c0:c1], session.gy[r0:r1]
+            for i in range(2):
+                if stale[i][t]:
+                    if samplers[i] is None:
+                        samplers[i] = surface_sampler(surfaces[i])
+                    rasters[i][t] = samplers[i](gx, gy)
+            if stale_strip[t]:
+                session.strip[t] = self._stripping_depth_grid(gx, gy)
+            cut, fill, valid, _ = self._tile_sums(session.z1[t], session.z2[t], session.strip[t], cell_area)
+            session.sums[t] = cut, fill, valid
+
+        session.fingerprints = fingerprints
+        session.signatures = signatures
+        session.regions = regions
+        session.default_depth = default_depth
+        return len(dirty)
 
     def calculate_surface_to_elevation(self, surface: Surface,
                                       elevation: float) -> Dict[str, float]:
-        """Calculate volume between a surface and a flat plane.
+        """Calculate the exact volume between a surface and a flat plane.
         
         Args:
             surface: Surface
             elevation: Elevation of the reference plane
             
         Returns:
-            Dict with 'cut', 'fill', and 'net' volumes
+            Dict with 'cut' (surface above the plane), 'fill' (surface below
+            the plane) and 'net' (cut - fill) volumes
 
         """
         self.logger.info(f"Calculating volume between '{surface.name}' and elevation {elevation}")
 
-        # Use the surface's built-in method
-        volume = surface.calculate_volume_to_elevation(elevation)
+        # Faces crossing the plane are split at the zero-crossing line
+        return surface.calculate_volume_to_elevation(elevation)
 
-        # Positive volume means the surface is above the reference (cut)
-        # Negative volume means the surface is below the reference (fill)
-        cut_volume = max(0.0, volume)
-        fill_volume = max(0.0, -volume)
+    def calculate_tin_method(self, surface1: Surface, surface2: Surface) -> Dict[str, float]:
+        """Exact cut/fill between two surfaces by TIN-over-TIN overlay.
 
-        return {
-            "cut": cut_volume,
-            "fill": fill_volume,
-            "net": volume,
-        }
+        Independent of any grid resolution, so it serves as the accuracy
+        reference for :meth:`calculate_grid_method`. Stripping regions are not
+        applied.
+
+        Args:
+            surface1: The existing terrain surface model.
+            surface2: The proposed design surface model.
+
+        Returns:
+            Dict with 'cut' (surface1 above surface2), 'fill' (surface2 above
+            surface1) and 'net' (fill - cut) over the common footprint.
+
+        """
+        self.logger.info(f"Starting exact TIN volume calculation between '{surface1.name}' and '{surface2.name}'.")
+        result = surface1.calculate_volume_to_surface(surface2)
+        self.logger.info(f"TIN Volume Calculation Complete: Cut={result['cut']:.3f}, Fill={result['fill']:.3f}, Net={result['net']:.3f}")
+        return result
 
     # --- Helper Methods (Should already exist from previous steps) ---
     def _get_combined_bounding_box(self, surface1: Surface, surface2: Surface) -> Tuple[float, float, float, float]:
-        all_points_xy = []
-        if surface1.points:
-            all_points_xy.append(np.array([[p.x, p.y] for p in surface1.points.values()]))
-        if surface2.points:
-            all_points_xy.append(np.array([[p.x, p.y] for p in surface2.points.values()]))
+        bounds = [b for b in (surface1.get_bounds(), surface2.get_bounds()) if b is not None]
 
-        if not all_points_xy:
+        if not bounds:
             raise ValueError("Cannot determine bounding box: Both surfaces are empty.")
 
-        combined_points = np.vstack(all_points_xy)
-        min_x, min_y = np.min(combined_points, axis=0)
-        max_x, max_y = np.max(combined_points, axis=0)
+        min_x = min(b[0] for b in bounds)
+        min_y = min(b[1] for b in bounds)
+        max_x = max(b[2] for b in bounds)
+        max_y = max(b[3] for b in bounds)
 
         self.logger.debug(f"Calculated combined bounding box: ({min_x}, {min_y}) to ({max_x}, {max_y})")
         return min_x, min_y, max_x, max_y
 
-    def _create_grid(self, bbox: Tuple[float, float, float, float], resolution: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Creates grid coordinates and flattened points."""
+    def _grid_axes(self, bbox: Tuple[float, float, float, float], resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Creates the 1D grid node coordinates covering *bbox*."""
         min_x, min_y, max_x, max_y = bbox
-        # Use cell centers for coordinate arrays? Or edges? Let's use edges/arange.
         epsilon = resolution * 1e-6
         # gx corresponds to columns (X), gy corresponds to rows (Y)
         gx = np.arange(min_x, max_x + epsilon, resolution)
@@ -255,71 +470,157 @@ class VolumeCalculator:
 
         if len(gx) == 0 or len(gy) == 0:
             self.logger.warning(f"Grid dimensions are zero for bbox {bbox} and resolution {resolution}. Returning empty grid.")
-            return np.array([]), np.array([]), np.empty((0, 2))
+        else:
+            self.logger.debug(f"Created grid with {len(gy)} Y-coords, {len(gx)} X-coords. Total points: {len(gy) * len(gx)}")
+        return gx, gy
 
-        # Create meshgrid for flattened points (consistent with previous logic)
-        grid_x_mesh, grid_y_mesh = np.meshgrid(gx, gy)
-        grid_points = np.vstack([grid_x_mesh.ravel(), grid_y_mesh.ravel()]).T
-        self.logger.debug(f"Created grid with {len(gy)} Y-coords, {len(gx)} X-coords. Total points: {grid_points.shape[0]}")
-        # Return 1D coordinate arrays AND the 2D flattened points
-        return gx, gy, grid_points
+    def _grid_tiles(self, num_rows: int, num_cols: int,
+                    tile_budget_mb: Optional[float] = None,
+                    min_tiles: int = 1,
+                    square: bool = False) -> List[Tuple[int, int, int, int]]:
+        """Splits a grid into tiles that fit the working-memory budget.
 
-    def _interpolate_surface(self, surface: Surface, grid_points: np.ndarray) -> np.ndarray:
-        # ... (Implementation from previous steps, requires scipy) ...
-        from scipy.interpolate import LinearNDInterpolator  # Import locally if needed
+        Args:
+            num_rows: Number of grid rows (Y).
+            num_cols: Number of grid columns (X).
+            tile_budget_mb: Budget per tile in MB; defaults to the user setting.
+            min_tiles: Split into at least this many tiles (if the grid has
+                enough nodes), e.g. to give parallel workers enough work.
+            square: Always use square tiles (at most ``_SPARSE_TILE_SIDE``
+                nodes across) so a sparse footprint can skip empty areas.
 
-        if not surface.points:
-            self.logger.warning(f"Interpolation skipped for '{surface.name}': Surface has no data points.")
-            return np.full(grid_points.shape[0], np.nan)
+        Returns:
+            List of ``(row_start, row_stop, col_start, col_stop)`` slices in
+            row-major order.
 
-        surface_points_list = list(surface.points.values())
-        if len(surface_points_list) < 3:
-             self.logger.warning(f"Interpolation skipped for '{surface.name}': Has only {len(surface_points_list)} points. Linear interpolation requires at least 3.")
-             return np.full(grid_points.shape[0], np.nan)
+        """
+        if tile_budget_mb is None:
+            tile_budget_mb = SettingsService().volume_tile_budget_mb()
+        max_cells = max(int(tile_budget_mb * 1024 * 1024 // _BYTES_PER_TILE_CELL), 1)
+        max_cells = max(min(max_cells, -(-num_rows * num_cols // max(min_tiles, 1))), 1)
+
+        if square:
+            tile_cols = tile_rows = max(min(int(np.sqrt(max_cells)), _SPARSE_TILE_SIDE), 1)
+        elif num_cols <= max_cells:
+            # Full-width row bands keep tiles contiguous in the output grid
+            tile_cols = num_cols
+            tile_rows = max(max_cells // num_cols, 1)
+        else:
+            tile_cols = tile_rows = max(int(np.sqrt(max_cells)), 1)
+
+        return [
+            (r0, min(r0 + tile_rows, num_rows), c0, min(c0 + tile_cols, num_cols))
+            for r0 in range(0, num_rows, tile_rows)
+            for c0 in range(0, num_cols, tile_cols)
+        ]
+
+    def _footprint_tiles(self, tiles: List[Tuple[int, int, int, int]], gx: np.ndarray, gy: np.ndarray,
+                         surface1: Surface, surface2: Surface) -> List[Tuple[int, int, int, int]]:
+        """Keeps only the tiles touched by the faces of both surfaces."""
+        tile_rows, tile_cols = tiles[0][1] - tiles[0][0], tiles[0][3] - tiles[0][2]
+        covered = tile_coverage(gx, gy, tile_rows, tile_cols, self._face_boxes(surface1))
+        covered &= tile_coverage(gx, gy, tile_rows, tile_cols, self._face_boxes(surface2))
+        kept = [t for t in tiles if covered[t[0] // tile_rows, t[2] // tile_cols]]
+        self.logger.info(f"Sparse grid: {len(kept)} of {len(tiles)} tile(s) overlap both surfaces.")
+        return kept
+
+    def _face_boxes(self, surface: Surface) -> np.ndarray:
+        """Returns ``(M, 4)`` bounding boxes of the triangles *surface* is sampled from."""
+        if surface.is_raster:
+            # One box for the raster's data extent; cells without data sample as NaN
+            bounds = surface.get_bounds()
+            return np.empty((0, 4)) if bounds is None else np.array([bounds], dtype=np.float64)
+        if len(surface.faces) > 0:
+            tri = surface.vertices[surface.faces, :2]
+        else:
+            # Point-only surfaces are sampled from their Delaunay triangulation
+            interpolator = point_interpolator(surface)
+            if interpolator is None:
+                return np.empty((0, 4))
+            tri = interpolator.tri.points[interpolator.tri.simplices]
+        return np.hstack([tri.min(axis=1), tri.max(axis=1)])
+
+    # --- Stripping Depth Raster ---
+    def _stripping_depth_grid(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        """Rasterises project regions into a stripping-depth grid.
+
+        The first region containing a grid node decides its depth (the
+        region's ``strip_depth_ft`` or the global default when that is
+        ``None``).  Nodes outside every region get the global default.
 
-        try:
-            xy_coords = np.array([[p.x, p.y] for p in surface_points_list])
-            z_values = np.array([p.z for p in surface_points_list])
-            interpolator = LinearNDInterpolator(xy_coords, z_values)
-            interpolated_z = interpolator(grid_points)
-            num_valid = np.sum(~np.isnan(interpolated_z))
-            self.logger.debug(f"Interpolation for '{surface.name}' successful for {num_valid} / {grid_points.shape[0]} grid points.")
-            return interpolated_z
-        except Exception as e:
-            self.logger.error(f"Linear interpolation failed for '{surface.name}': {e}", exc_info=True)
-            return np.full(grid_points.shape[0], np.nan)
-
-    # --- NEW: Stripping Depth Helper ---
-    def _depth_for_xy(self, x: float, y: float) -> float:
-        """Determines the stripping depth for a given (x, y) coordinate based on project regions."""
-        if not self.project or not hasattr(self.project, "regions") or not Polygon:
-            # If project/regions missing or Shapely not loaded, return default
-            if not Polygon:
-                 self.logger.warning("_depth_for_xy called but Shapely is not available. Using default depth.", once=True)
-            return SettingsService().strip_depth_default()
-
-        point = Point(x, y)
-        for region in self.project.regions:
+        Args:
+            gx: 1D array of ascending grid X coordinates (columns).
+            gy: 1D array of ascending grid Y coordinates (rows).
+
+        Returns:
+            np.ndarray: Depths with shape ``(len(gy), len(gx))``.
+
+        """
+        default_depth = SettingsService().strip_depth_default()
+        regions = getattr(self.project, "regions", None) if self.project else None
+        if not regions:
+            return np.full((len(gy), len(gx)), default_depth, dtype=np.float64)
+
+        # Slot 0 holds the default for unassigned nodes (label -1)
+        depths = np.array(
+            [default_depth]
+            + [default_depth if r.strip_depth_ft is None else float(r.strip_depth_ft) for r in regions],
+            dtype=np.float64,
+        )
+        return depths[self._region_label_grid(gx, gy) + 1]
+
+    def _region_label_grid(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        """Labels every grid node with the index of the project region containing it.
+
+        Regions are tested in project order and the first region containing a
+        node wins.  Each region is only tested against the nodes inside its
+        bounding box, using Shapely's vectorised ``contains_xy``.
+
+        Args:
+            gx: 1D array of ascending grid X coordinates (columns).
+            gy: 1D array of ascending grid Y coordinates (rows).
+
+        Returns:
+            np.ndarray: ``int32`` indices into ``project.regions`` with shape
+            ``(len(gy), len(gx))``; ``-1`` where no region applies.
+
+        """
+        labels = np.full((len(gy), len(gx)), -1, dtype=np.int32)
+
+        regions = getattr(self.project, "regions", None) if self.project else None
+        if not regions:
+            return labels
+        if contains_xy is None:
+            self.logger.warning("Project regions ignored because Shapely 2 is not available.")
+            return labels
+
+        for index, region in enumerate(regions):
             if not region.polygon or len(region.polygon) < 3:
-                 continue # Skip regions without valid polygons
+                continue # Skip regions without valid polygons
 
             try:
                 poly = Polygon(region.polygon)
-                if poly.is_valid and poly.contains(point):
-                    # Point is inside this region
-                    if region.strip_depth_ft is not None:
-                         # Use region-specific depth
-                         return float(region.strip_depth_ft)
-                    # Region depth is None, use global default
-                    return SettingsService().strip_depth_default()
+                if not poly.is_valid:
+                    continue
+                min_x, min_y, max_x, max_y = poly.bounds
+                c0, c1 = np.searchsorted(gx, min_x, side="left"), np.searchsorted(gx, max_x, side="right")
+                r0, r1 = np.searchsorted(gy, min_y, side="left"), np.searchsorted(gy, max_y, side="right")
+                if c0 >= c1 or r0 >= r1:
+                    continue # Region lies outside the grid
+
+                free = labels[r0:r1, c0:c1] < 0
+                if not free.any():
+                    continue # Earlier regions already cover this block
+
+                prepare(poly)
+                block_x, block_y = np.meshgrid(gx[c0:c1], gy[r0:r1])
+                inside = contains_xy(poly, block_x, block_y) & free
+                labels[r0:r1, c0:c1][inside] = index
             except (TypeError, ValueError, GEOSException) as e:
-                # Log error if polygon creation or contains check fails
-                self.logger.error(f"Error processing region '{region.name}' (ID: {region.id}) for stripping depth at ({x}, {y}): {e}", exc_info=False, once=True)
+                self.logger.error(f"Error processing region '{region.name}' (ID: {region.id}): {e}")
                 continue # Try next region
 
-        # Point is not in any region with a defined depth, use global default
-        return SettingsService().strip_depth_default()
-    # --- END NEW ---
+        return labels
 
     # Deprecate or rename calculate_surface_to_surface if calculate_grid_method is the primary one
     def calculate_surface_to_surface(self, *args, **kwargs):
@@ -333,37 +634,140 @@ class VolumeCalculator:
              "net_volume": results["net"],
          }
 
-    def compute_slice_volumes(self, surface_ref, surface_diff, slice_thickness_ft: float):
-        """Returns list[SliceResult] from min-Z to max-Z (exclusive top slice).
-        Positive diff = fill, negative = cut.
+    def compute_slice_volumes(self, surface_ref: Surface, surface_diff: Surface,
+                              slice_thickness_ft: Optional[float] = None,
+                              band_edges: Optional[Sequence[float]] = None,
+                              grid_resolution: float = 1.0) -> List[SliceResult]:
+        """Returns cut/fill per elevation band, from min-Z to max-Z.
+
+        Both surfaces are sampled once on a common grid (tile by tile); each
+        cell contributes the part of its vertical column between the two
+        surfaces that falls inside each band.  Positive diff (``surface_diff``
+        above ``surface_ref``) is fill, negative is cut.
+
+        Args:
+            surface_ref: Reference (e.g. existing ground) surface.
+            surface_diff: Compared (e.g. design) surface.
+            slice_thickness_ft: Uniform band thickness starting at the lowest
+                elevation of either surface. Ignored when *band_edges* is given.
+            band_edges: Explicit ascending band edges, e.g. ``[90, 95, 100, 110]``.
+            grid_resolution: Side length of the sampling grid cells.
+
+        Returns:
+            list[SliceResult]: One entry per band, bottom to top.
+
+        Raises:
+            ValueError: If neither a positive thickness nor valid edges are given.
+
+        """
+        edges = self._slice_edges(surface_ref, surface_diff, slice_thickness_ft, band_edges)
+        totals = self._slice_integrals(surface_ref, surface_diff, edges, grid_resolution, by_region=False)
+        cut, fill = totals.get(-1, (np.zeros(len(edges) - 1), np.zeros(len(edges) - 1)))
+        return _slice_results(edges, cut, fill)
+
+    def compute_region_slice_volumes(self, surface_ref: Surface, surface_diff: Surface,
+                                     slice_thickness_ft: Optional[float] = None,
+                                     band_edges: Optional[Sequence[float]] = None,
+                                     grid_resolution: float = 1.0) -> Dict[Optional[str], List[SliceResult]]:
+        """Like :meth:`compute_slice_volumes`, broken down by project region.
+
+        Each grid cell is attributed to the first project region containing it
+        (the same rule used for stripping depths).
+
+        Returns:
+            Dict mapping region id to its slice list; cells outside every
+            region are reported under the ``None`` key.
+
         """
+        edges = self._slice_edges(surface_ref, surface_diff, slice_thickness_ft, band_edges)
+        totals = self._slice_integrals(surface_ref, surface_diff, edges, grid_resolution, by_region=True)
+        regions = list(getattr(self.project, "regions", None) or []) if self.project else []
+        keys: List[Optional[str]] = [None] + [r.id for r in regions]
+        empty = np.zeros(len(edges) - 1)
+        return {
+            key: _slice_results(edges, *totals.get(label, (empty, empty)))
+            for label, key in enumerate(keys, start=-1)
+        }
+
+    def _slice_edges(self, surface_ref: Surface, surface_diff: Surface,
+                     slice_thickness_ft: Optional[float],
+                     band_edges: Optional[Sequence[float]]) -> np.ndarray:
+        """Resolves the band edges for a slice calculation."""
+        if band_edges is not None:
+            edges = np.asarray(band_edges, dtype=np.float64)
+            if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+                raise ValueError("band_edges must be at least two strictly increasing elevations.")
+            return edges
+        if not slice_thickness_ft or slice_thickness_ft <= 0:
+            raise ValueError("Slice thickness must be positive.")
+
         z_min = min(surface_ref.min_z, surface_diff.min_z)
         z_max = max(surface_ref.max_z, surface_diff.max_z)
+        num_slices = max(int(np.ceil((z_max - z_min) / slice_thickness_ft - 1e-9)), 1)
+        return z_min + slice_thickness_ft * np.arange(num_slices + 1)
+
+    def _slice_integrals(self, surface_ref: Surface, surface_diff: Surface, edges: np.ndarray,
+                         grid_resolution: float, by_region: bool) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Accumulates per-band cut/fill volumes, keyed by region label.
+
+        Labels are indices into ``project.regions`` (``-1`` = no region); with
+        *by_region* False everything is reported under ``-1``.
+        """
+        if grid_resolution <= 0:
+            raise ValueError("Grid resolution must be positive.")
+        gx, gy = self._grid_axes(self._get_combined_bounding_box(surface_ref, surface_diff), grid_resolution)
+        sample_ref = surface_sampler(surface_ref)
+        sample_diff = surface_sampler(surface_diff)
+        cell_area = grid_resolution * grid_resolution
 
-        slices = []
-        z = z_min
-        while z < z_max:
-            z_top = z + slice_thickness_ft
-            cut = fill = 0.0
-            # Sort by XY so points line up
-            ref_pts = sorted(surface_ref.points.values(), key=lambda p: (p.x, p.y))
-            diff_pts = sorted(surface_diff.points.values(), key=lambda p: (p.x, p.y))
-
-            for pr, pd in zip(ref_pts, diff_pts):
-                zr = pr.z
-                zd = pd.z
-                dz = zd - zr
-                if dz > 0:    # fill
-                    slice_fill = min(dz, z_top - zr) if zr < z_top else 0
-                    if zr < z and zd > z:
-                        slice_fill -= (z - zr)
-                    fill += slice_fill
-                elif dz < 0:  # cut
-                    dz = abs(dz)
-                    slice_cut = min(dz, z_top - zd) if zd < z_top else 0
-                    if zd < z and zr > z:
-                        slice_cut -= (z - zd)
-                    cut += slice_cut
-            slices.append(SliceResult(z, z_top, cut, fill))
-            z = z_top
-        return slices
+        # Cumulative column integrals at each edge, differenced into bands at the end
+        acc: Dict[int, List[np.ndarray]] = {}
+        for r0, r1, c0, c1 in self._grid_tiles(len(gy), len(gx)):
+            z_ref = sample_ref(gx[c0:c1], gy[r0:r1])
+            z_diff = sample_diff(gx[c0:c1], gy[r0:r1])
+            valid = ~(np.isnan(z_ref) | np.isnan(z_diff))
+            if by_region:
+                labels = self._region_label_grid(gx[c0:c1], gy[r0:r1])[valid]
+            else:
+                labels = np.full(np.count_nonzero(valid), -1, dtype=np.int32)
+            z_ref, z_diff = z_ref[valid], z_diff[valid]
+            is_fill = z_diff > z_ref
+            low, high = np.minimum(z_ref, z_diff), np.maximum(z_ref, z_diff)
+
+            for label in np.unique(labels):
+                in_label = labels == label
+                sums = acc.setdefault(int(label), [np.zeros(len(edges)), np.zeros(len(edges))])
+                cut_cells = in_label & ~is_fill
+                fill_cells = in_label & is_fill
+                sums[0] += _column_integrals(low[cut_cells], high[cut_cells], edges)
+                sums[1] += _column_integrals(low[fill_cells], high[fill_cells], edges)
+
+        return {label: (np.diff(c) * cell_area, np.diff(f) * cell_area) for label, (c, f) in acc.items()}
+
+
+def _column_integrals(low: np.ndarray, high: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Returns, for every edge ``e``, the summed length of ``[low, high]`` below ``e``.
+
+    ``sum_i clip(e - low_i, 0, high_i - low_i)`` is evaluated for all edges in
+    O((n + k) log n) with sorted prefix sums instead of an n × k matrix.
+    Values are shifted to the first edge to limit cancellation.
+    """
+    if low.size == 0:
+        return np.zeros(len(edges))
+    base = edges[0]
+    e = edges - base
+    lo = np.sort(low - base)
+    hi = np.sort(high - base)
+    lo_cum = np.concatenate(([0.0], np.cumsum(lo)))
+    hi_cum = np.concatenate(([0.0], np.cumsum(hi)))
+    n_lo = np.searchsorted(lo, e, side="right")
+    n_hi = np.searchsorted(hi, e, side="right")
+    return (n_lo * e - lo_cum[n_lo]) - (n_hi * e - hi_cum[n_hi])
+
+
+def _slice_results(edges: np.ndarray, cut: np.ndarray, fill: np.ndarray) -> List[SliceResult]:
+    """Packs per-band arrays into :class:`SliceResult` objects."""
+    return [
+        SliceResult(float(edges[i]), float(edges[i + 1]), float(cut[i]), float(fill[i]))
+        for i in range(len(edges) - 1)
+    ]
@@ -3,16 +3,30 @@
 
 This module provides functionality to generate grid surfaces from
 TINs, point clouds, and other data sources.
+
+Scattered points are binned onto grid nodes in vectorised passes: each point
+goes to its nearest node and the nodes accumulate a running count, sum, min or
+max with ``np.bincount`` / ``np.minimum.at`` / ``np.maximum.at``.  Large scans
+are processed in fixed-size chunks (or consumed from an iterator of chunks),
+so memory is bounded by the grid plus one chunk.  Median aggregation keeps a
+compact ``(node, z)`` record per point and is the only mode whose memory grows
+with the number of points.
 """
 
 import logging
-from typing import List
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 # Use relative import
 from ...models.surface import Point3D, Surface
 
+Bounds = Tuple[float, float, float, float]  # x_min, y_min, x_max, y_max
+PointSource = Union[Sequence[Point3D], np.ndarray, Iterable[np.ndarray]]
+
+AGGREGATIONS = ("mean", "min", "max", "median", "count")
+DEFAULT_CHUNK_SIZE = 4_000_000
+
 
 class GridGenerator:
     """Generator for grid-based surfaces."""
@@ -21,47 +35,200 @@ class GridGenerator:
         """Initialize the grid generator."""
         self.logger = logging.getLogger(__name__)
 
-    def generate_from_points(self, points: List[Point3D],
+    def generate_from_points(self, points: PointSource,
                            grid_spacing: float,
-                           name: str) -> Surface:
+                           name: str,
+                           aggregation: str = "mean",
+                           fill_holes: bool = False,
+                           max_fill_cells: Optional[float] = None,
+                           bounds: Optional[Bounds] = None,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> Surface:
         """Generate a grid surface from a list of 3D points.
-        
+
         Args:
-            points: List of 3D points
+            points: ``Point3D`` objects, an ``(N, 3)`` array, or an iterable of
+                ``(K, 3)`` array chunks (e.g. read from a large scan file).
             grid_spacing: Desired grid spacing
             name: Name for the created surface
-            
+            aggregation: How points falling on the same node combine: one of
+                ``"mean"``, ``"min"``, ``"max"``, ``"median"`` or ``"count"``.
+            fill_holes: Fill empty nodes enclosed by data with the value of the
+                nearest filled node. Empty nodes connected to the grid edge are
+                left as ``NaN``.
+            max_fill_cells: Only fill holes within this many cells of data.
+            bounds: ``(x_min, y_min, x_max, y_max)`` of the grid. Required when
+                *points* is an iterator of chunks; otherwise the point extents.
+            chunk_size: Points binned per vectorised pass.
+
         Returns:
             Generated grid Surface
 
+        Raises:
+            ValueError: For a non-positive spacing, an unknown aggregation, no
+                points, or streamed chunks without *bounds*.
+
+        """
+        grid, origin = self.bin_points(points, grid_spacing, aggregation, bounds=bounds, chunk_size=chunk_size)
+        if fill_holes:
+            grid = fill_grid_holes(grid, max_fill_cells)
+
+        # Create and return the grid surface
+        surface = Surface(name)
+        surface.set_grid_data(grid, grid_spacing, origin)
+
+        self.logger.info(f"Generated {aggregation} grid of shape {grid.shape}")
+        return surface
+
+    def bin_points(self, points: PointSource, grid_spacing: float, aggregation: str = "mean",
+                   bounds: Optional[Bounds] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, Tuple[float, float]]:
+        """Bin scattered points onto the nodes of a regular grid.
+
+        Node ``[i, j]`` sits at ``(x0 + j * spacing, y0 + i * spacing)`` and
+        collects the points nearest to it. Nodes without points are ``NaN``
+        (``0`` for ``"count"``).
+
+        Args:
+            points: See :meth:`generate_from_points`.
+            grid_spacing: Node spacing.
+            aggregation: See :meth:`generate_from_points`.
+            bounds: See :meth:`generate_from_points`.
+            chunk_size: Points binned per vectorised pass.
+
+        Returns:
+            ``(grid, (x0, y0))`` with a float64 ``(rows, cols)`` grid.
+
         """
-        self.logger.info(f"Generating grid from {len(points)} points")
+        if grid_spacing <= 0:
+            raise ValueError("grid_spacing must be positive")
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{aggregation}'; expected one of {AGGREGATIONS}")
 
-        # Determine grid extents from point bounds
-        x_min = min(p.x for p in points)
-        x_max = max(p.x for p in points)
-        y_min = min(p.y for p in points)
-        y_max = max(p.y for p in points)
+        chunks = _iter_chunks(points, chunk_size)
+        if bounds is None:
+            if not isinstance(chunks, list):
+                raise ValueError("bounds are required when points are streamed as chunks")
+            bounds = _chunk_bounds(chunks)
+        x_min, y_min, x_max, y_max = (float(b) for b in bounds)
 
         # Calculate grid dimensions
-        cols = int((x_max - x_min) / grid_spacing) + 1
-        rows = int((y_max - y_min) / grid_spacing) + 1
+        cols = int(np.floor((x_max - x_min) / grid_spacing + 0.5)) + 1
+        rows = int(np.floor((y_max - y_min) / grid_spacing + 0.5)) + 1
+        n_cells = rows * cols
+        self.logger.info(f"Binning points onto a {rows}x{cols} grid ({aggregation}).")
 
-        # Create grid data
-        grid_data = np.full((rows, cols), np.nan)
+        counts = np.zeros(n_cells, dtype=np.int64)
+        acc = None
+        if aggregation == "mean":
+            acc = np.zeros(n_cells, dtype=np.float64)
+        elif aggregation == "min":
+            acc = np.full(n_cells, np.inf)
+        elif aggregation == "max":
+            acc = np.full(n_cells, -np.inf)
+        median_cells: List[np.ndarray] = []
+        median_z: List[np.ndarray] = []
 
-        # For the skeleton, create a simple grid with dummy values
-        for i in range(rows):
-            for j in range(cols):
-                x = x_min + j * grid_spacing
-                y = y_min + i * grid_spacing
-                # Create a dummy surface (paraboloid)
-                grid_data[i, j] = ((x - (x_min + x_max) / 2) ** 2 +
-                                   (y - (y_min + y_max) / 2) ** 2) / 100
+        total = 0
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            col = np.floor((chunk[:, 0] - x_min) / grid_spacing + 0.5).astype(np.int64)
+            row = np.floor((chunk[:, 1] - y_min) / grid_spacing + 0.5).astype(np.int64)
+            inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows) & np.isfinite(chunk[:, 2])
+            flat = row[inside] * cols + col[inside]
+            z = chunk[inside, 2]
+            total += len(flat)
 
-        # Create and return the grid surface
-        surface = Surface(name, Surface.SURFACE_TYPE_GRID)
-        surface.set_grid_data(grid_data, grid_spacing, (x_min, y_min))
+            counts += np.bincount(flat, minlength=n_cells)
+            if aggregation == "mean":
+                acc += np.bincount(flat, weights=z, minlength=n_cells)
+            elif aggregation == "min":
+                np.minimum.at(acc, flat, z)
+            elif aggregation == "max":
+                np.maximum.at(acc, flat, z)
+            elif aggregation == "median":
+                median_cells.append(flat.astype(np.int32 if n_cells < 2**31 else np.int64))
+                median_z.append(z)
 
-        self.logger.info(f"Generated grid of shape {grid_data.shape}")
-        return surface
+        if total == 0:
+            raise ValueError("No points fall inside the grid")
+        self.logger.debug(f"Binned {total} points into {np.count_nonzero(counts)} of {n_cells} nodes.")
+
+        filled = counts > 0
+        if aggregation == "count":
+            grid = counts.astype(np.float64)
+        elif aggregation == "median":
+            grid = _median_per_cell(np.concatenate(median_cells), np.concatenate(median_z), counts)
+        else:
+            grid = np.full(n_cells, np.nan)
+            grid[filled] = acc[filled] / counts[filled] if aggregation == "mean" else acc[filled]
+        return grid.reshape(rows, cols), (x_min, y_min)
+
+
+def fill_grid_holes(grid: np.ndarray, max_fill_cells: Optional[float] = None) -> np.ndarray:
+    """Fill ``NaN`` nodes enclosed by data with their nearest filled neighbour.
+
+    Args:
+        grid: 2-D elevation grid.
+        max_fill_cells: Leave holes further than this (in cells) from data.
+
+    Returns:
+        np.ndarray: A filled copy of *grid*.
+
+    """
+    from scipy import ndimage
+
+    valid = ~np.isnan(grid)
+    if valid.all() or not valid.any():
+        return grid.copy()
+    holes = ndimage.binary_fill_holes(valid) & ~valid
+    distance, (src_r, src_c) = ndimage.distance_transform_edt(~valid, return_indices=True)
+    if max_fill_cells is not None:
+        holes &= distance <= max_fill_cells
+    out = grid.copy()
+    out[holes] = grid[src_r[holes], src_c[holes]]
+    return out
+
+
+def _iter_chunks(points: PointSource, chunk_size: int):
+    """Normalise *points* into float64 ``(K, 3)`` chunks.
+
+    Returns a list for in-memory inputs (so bounds can be computed in a first
+    pass) and a generator for streamed chunk iterables.
+    """
+    if isinstance(points, np.ndarray):
+        xyz = points.reshape(-1, 3)
+        return [np.asarray(xyz[i:i + chunk_size], dtype=np.float64) for i in range(0, len(xyz), chunk_size)]
+    if isinstance(points, Sequence):
+        if len(points) and all(isinstance(c, np.ndarray) and c.ndim == 2 for c in points):
+            # A list of array chunks, possibly of different lengths
+            return [chunk for c in points for chunk in _iter_chunks(c, chunk_size)]
+        if len(points) and isinstance(points[0], Point3D):
+            xyz = np.fromiter((c for p in points for c in (p.x, p.y, p.z)), dtype=np.float64,
+                              count=3 * len(points)).reshape(-1, 3)
+        else:
+            xyz = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        return [xyz[i:i + chunk_size] for i in range(0, len(xyz), chunk_size)]
+    return (np.asarray(chunk, dtype=np.float64).reshape(-1, 3) for chunk in points)
+
+
+def _chunk_bounds(chunks: List[np.ndarray]) -> Bounds:
+    if not any(len(c) for c in chunks):
+        raise ValueError("No points to grid")
+    lo = np.min([c[:, :2].min(axis=0) for c in chunks if len(c)], axis=0)
+    hi = np.max([c[:, :2].max(axis=0) for c in chunks if len(c)], axis=0)
+    return float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])
+
+
+def _median_per_cell(cells: np.ndarray, z: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median z per cell from unsorted ``(cell, z)`` records."""
+    order = np.lexsort((z, cells))
+    z_sorted = z[order]
+    filled = np.flatnonzero(counts)
+    n = counts[filled]
+    start = np.concatenate(([0], np.cumsum(n)[:-1]))
+    lo = z_sorted[start + (n - 1) // 2]
+    hi = z_sorted[start + n // 2]
+    grid = np.full(len(counts), np.nan)
+    grid[filled] = (lo + hi) / 2.0
+    return grid
@@ -0,0 +1,518 @@
+"""incremental_tin.py
+A Delaunay TIN that can be edited vertex by vertex.
+
+Traced contour layers change a few vertices at a time (a polyline is added,
+removed or one of its vertices is dragged) but rebuilding the surface used
+to run a full Delaunay triangulation of every vertex in the layer.
+:class:`IncrementalTin` keeps the triangulation together with triangle
+adjacency and applies edits locally:
+
+* **insert** – Bowyer–Watson: the triangles whose circumcircle contains the
+  new vertex form a cavity that is re-fanned around it;
+* **delete** – the star of the vertex is removed and its link polygon is
+  re-triangulated by Delaunay ear clipping;
+* **move** – a delete followed by an insert.
+
+Each edit therefore touches only the neighbourhood of the vertex.  Edits that
+change the convex hull (a vertex outside the hull, or removal of a hull
+vertex) or that hit a numerically degenerate configuration fall back to a
+full re-triangulation, so the result is always a valid Delaunay TIN.
+
+Several vertices may share an XY location (contours of different elevation
+meeting at a point); only the earliest of them is triangulated and the others
+are kept as unreferenced vertices, matching
+:meth:`SurfaceBuilder.build_from_polylines`.
+
+Example
+-------
+>>> tin = IncrementalTin()
+>>> tin.update(points_xyz, revision=3)     # full build the first time
+>>> tin.update(edited_points_xyz, revision=4)  # local edits afterwards
+>>> surface = Surface.from_arrays("Layer", tin.vertices, tin.faces)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import Delaunay, QhullError
+
+__all__ = ["IncrementalTin", "first_occurrences"]
+
+logger = logging.getLogger(__name__)
+
+# Updates that change more than this share of the vertices (and more than
+# _MIN_FULL_CHANGES vertices) are cheaper as one full triangulation.
+_FULL_REBUILD_FRACTION = 0.05
+_MIN_FULL_CHANGES = 256
+
+
+def first_occurrences(rows: np.ndarray) -> np.ndarray:
+    """Indices of the first occurrence of each distinct row, in lexicographic row order."""
+    if len(rows) == 0:
+        return np.empty(0, dtype=np.intp)
+    # lexsort is stable, so the earliest duplicate leads each run of equal rows
+    order = np.lexsort(rows.T[::-1])
+    sorted_rows = rows[order]
+    starts = np.empty(len(rows), dtype=bool)
+    starts[0] = True
+    np.any(sorted_rows[1:] != sorted_rows[:-1], axis=1, out=starts[1:])
+    return order[starts]
+
+
+def _row_keys(rows: np.ndarray) -> np.ndarray:
+    """64-bit hash of each ``(x, y, z)`` row's exact float bits (SplitMix64 mixing)."""
+    bits = np.ascontiguousarray(rows, dtype=np.float64).view(np.uint64).reshape(-1, 3)
+    h = np.zeros(len(rows), dtype=np.uint64)
+    for col in bits.T:
+        h = h ^ col
+        h = h ^ (h >> np.uint64(30))
+        h = h * np.uint64(0xBF58476D1CE4E5B9)
+        h = h ^ (h >> np.uint64(27))
+        h = h * np.uint64(0x94D049BB133111EB)
+        h = h ^ (h >> np.uint64(31))
+    return h
+
+
+def _orient(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    """Twice the signed area of (a, b, c); positive when counter-clockwise."""
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _in_circle(ax: float, ay: float, bx: float, by: float, cx: float, cy: float,
+               px: float, py: float) -> float:
+    """Positive when p lies inside the circumcircle of the CCW triangle (a, b, c)."""
+    adx, ady = ax - px, ay - py
+    bdx, bdy = bx - px, by - py
+    cdx, cdy = cx - px, cy - py
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+class IncrementalTin:
+    """Delaunay triangulation supporting local vertex insertion, deletion and moves.
+
+    Attributes:
+        revision: Layer revision the triangulation currently reflects
+            (``None`` until the first :meth:`update`).
+        full_rebuilds: Number of full triangulations performed so far.
+        local_edits: Number of vertex edits applied locally so far.
+        lock: Held by callers while updating and exporting, so a background
+            rebuild and a synchronous one never interleave on the same TIN.
+
+    """
+
+    def __init__(self) -> None:
+        self.revision: Optional[int] = None
+        self.full_rebuilds = 0
+        self.local_edits = 0
+        self.lock = threading.RLock()
+        self._load(np.empty((0, 3)))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        """Number of (live) vertices."""
+        return self._n_alive
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """``(N, 3)`` coordinates of the live vertices, in insertion order."""
+        return self._export()[0]
+
+    @property
+    def faces(self) -> np.ndarray:
+        """``(M, 3)`` int32 CCW faces indexing :pyattr:`vertices`."""
+        return self._export()[1]
+
+    def rebuild(self, xyz: np.ndarray, revision: Optional[int] = None) -> None:
+        """Replace every vertex with *xyz* and triangulate from scratch.
+
+        Raises:
+            QhullError: If the points cannot be triangulated (e.g. collinear).
+
+        """
+        self._load(np.asarray(xyz, dtype=np.float64).reshape(-1, 3))
+        self._triangulate_all()
+        self.revision = revision
+
+    def update(self, xyz: np.ndarray, revision: Optional[int] = None) -> bool:
+        """Make the vertex set equal to the rows of *xyz* with as few edits as possible.
+
+        Rows present before and after keep their triangles; removed rows are
+        deleted and new rows inserted locally.  Large changes are applied as
+        one full triangulation instead.
+
+        Args:
+            xyz: ``(N, 3)`` array of distinct vertex rows.
+            revision: Layer revision the new vertex set corresponds to.
+
+        Returns:
+            bool: ``True`` if the update was applied locally, ``False`` if the
+            TIN was (re)triangulated from scratch.
+
+        Raises:
+            QhullError: If a full triangulation is needed and fails.
+
+        """
+        xyz = np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+        alive = np.flatnonzero(self._alive[: self._nv])
+        # Rows are matched by a 64-bit hash of their exact coordinates
+        old_keys, new_keys = _row_keys(self._xyz[alive]), _row_keys(xyz)
+        removed = alive[~np.isin(old_keys, new_keys)]
+        added = xyz[~np.isin(new_keys, old_keys)]
+        changes = len(removed) + len(added)
+
+        if self._n_tri_alive == 0 or changes > max(_MIN_FULL_CHANGES, _FULL_REBUILD_FRACTION * len(xyz)):
+            logger.debug(f"Full TIN rebuild for {len(xyz)} vertices ({changes} changed).")
+            self.rebuild(xyz, revision)
+            return False
+
+        # Once one edit needs a full triangulation the rest are only recorded
+        local = True
+        for vid in removed.tolist():
+            local = local and self._delete_local(vid)
+            self._drop_vertex(vid)
+        for x, y, z in added.tolist():
+            vid = self._add_vertex(x, y, z)
+            local = local and self._insert_local(vid)
+        if not local:
+            self._triangulate_all()
+        else:
+            self.local_edits += changes
+        self.revision = revision
+        logger.debug(f"TIN update: {len(removed)} removed, {len(added)} added ({'local' if local else 'full'}).")
+        return local
+
+    def insert(self, x: float, y: float, z: float) -> int:
+        """Insert a vertex, re-triangulating locally where possible.
+
+        Returns:
+            int: Id of the new vertex.
+
+        """
+        vid = self._add_vertex(x, y, z)
+        if self._insert_local(vid):
+            self.local_edits += 1
+        else:
+            self._triangulate_all()
+        return vid
+
+    def delete(self, vid: int) -> bool:
+        """Remove vertex *vid*, re-triangulating locally where possible.
+
+        Returns:
+            bool: ``True`` if the deletion was applied locally.
+
+        """
+        ok = self._delete_local(vid)
+        self._drop_vertex(vid)
+        if ok:
+            self.local_edits += 1
+        else:
+            self._triangulate_all()
+        return ok
+
+    def move(self, vid: int, x: float, y: float, z: float) -> int:
+        """Move vertex *vid* to a new position; returns the vertex's new id."""
+        self.delete(vid)
+        return self.insert(x, y, z)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _load(self, xyz: np.ndarray) -> None:
+        """Reset storage to the given vertices without any triangles."""
+        n = len(xyz)
+        self._xyz = np.array(xyz, dtype=np.float64).reshape(-1, 3)
+        self._alive = np.ones(n, dtype=bool)
+        self._nv = n
+        self._n_alive = n
+        self._vtri = np.full(n, -1, dtype=np.int64)
+        self._tri = np.empty((0, 3), dtype=np.int64)
+        self._nbr = np.empty((0, 3), dtype=np.int64)
+        self._tri_alive = np.empty(0, dtype=bool)
+        self._nt = 0
+        self._n_tri_alive = 0
+        self._free: List[int] = []
+        self._hint = 0
+        self._cache: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # XY location -> vertex ids there, earliest (triangulated) first
+        self._at_xy: Dict[Tuple[float, float], List[int]] = {}
+        for vid, (x, y) in enumerate(self._xyz[:, :2].tolist()):
+            self._at_xy.setdefault((x, y), []).append(vid)
+
+    def _add_vertex(self, x: float, y: float, z: float) -> int:
+        if self._nv == len(self._xyz):
+            cap = max(2 * self._nv, 16)
+            self._xyz = np.resize(self._xyz, (cap, 3))
+            self._alive = np.concatenate([self._alive, np.zeros(cap - len(self._alive), dtype=bool)])
+            self._vtri = np.concatenate([self._vtri, np.full(cap - len(self._vtri), -1, dtype=np.int64)])
+        vid = self._nv
+        self._xyz[vid] = (x, y, z)
+        self._alive[vid] = True
+        self._vtri[vid] = -1
+        self._nv += 1
+        self._n_alive += 1
+        self._at_xy.setdefault((float(x), float(y)), []).append(vid)
+        self._cache = None
+        return vid
+
+    def _drop_vertex(self, vid: int) -> None:
+        key = (float(self._xyz[vid, 0]), float(self._xyz[vid, 1]))
+        ids = self._at_xy.get(key, [])
+        if vid in ids:
+            ids.remove(vid)
+            if not ids:
+                del self._at_xy[key]
+        self._alive[vid] = False
+        self._vtri[vid] = -1
+        self._n_alive -= 1
+        self._cache = None
+
+    def _alloc_tri(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._nt == len(self._tri):
+            cap = max(2 * self._nt, 16)
+            self._tri = np.resize(self._tri, (cap, 3))
+            self._nbr = np.resize(self._nbr, (cap, 3))
+            self._tri_alive = np.concatenate([self._tri_alive, np.zeros(cap - len(self._tri_alive), dtype=bool)])
+        t = self._nt
+        self._nt += 1
+        return t
+
+    def _triangulate_all(self) -> None:
+        """Delaunay-triangulate every live vertex from scratch."""
+        self.full_rebuilds += 1
+        self._cache = None
+        alive = np.flatnonzero(self._alive[: self._nv])
+        self._vtri[: self._nv] = -1
+        xy = self._xyz[alive, :2]
+        owners = alive[np.sort(first_occurrences(xy))] if len(xy) else alive
+        if len(owners) < 3:
+            simplices = np.empty((0, 3), dtype=np.int64)
+            neighbors = np.empty((0, 3), dtype=np.int64)
+        else:
+            tri = Delaunay(self._xyz[owners, :2])
+            simplices = owners[tri.simplices]
+            neighbors = tri.neighbors.astype(np.int64)
+            # Orient every face counter-clockwise (swap columns 1/2 with their neighbours)
+            p = self._xyz[simplices, :2]
+            cw = ((p[:, 1, 0] - p[:, 0, 0]) * (p[:, 2, 1] - p[:, 0, 1])
+                  - (p[:, 1, 1] - p[:, 0, 1]) * (p[:, 2, 0] - p[:, 0, 0])) < 0
+            simplices[cw] = simplices[cw][:, [0, 2, 1]]
+            neighbors[cw] = neighbors[cw][:, [0, 2, 1]]
+
+        m = len(simplices)
+        self._tri = np.array(simplices, dtype=np.int64).reshape(-1, 3)
+        self._nbr = np.array(neighbors, dtype=np.int64).reshape(-1, 3)
+        self._tri_alive = np.ones(m, dtype=bool)
+        self._nt = m
+        self._n_tri_alive = m
+        self._free = []
+        self._hint = 0
+        self._vtri[self._tri.ravel()] = np.repeat(np.arange(m), 3)
+
+    def _export(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._cache is None:
+            alive = self._alive[: self._nv]
+            remap = np.cumsum(alive) - 1
+            faces = self._tri[: self._nt][self._tri_alive[: self._nt]]
+            self._cache = (self._xyz[: self._nv][alive].copy(), remap[faces].astype(np.int32))
+        return self._cache
+
+    # ------------------------------------------------------------------
+    # Local edits
+    # ------------------------------------------------------------------
+    def _coords(self, vid: int) -> Tuple[float, float]:
+        return float(self._xyz[vid, 0]), float(self._xyz[vid, 1])
+
+    def _locate(self, px: float, py: float) -> Tuple[int, bool]:
+        """Find a triangle containing (px, py) by walking from the last edit.
+
+        Returns:
+            ``(triangle, inside_hull)``; the triangle is meaningless when the
+            point lies outside the convex hull.
+
+        """
+        t = self._hint if self._hint < self._nt and self._tri_alive[self._hint] else \
+            int(np.flatnonzero(self._tri_alive[: self._nt])[0])
+        limit = 4 * int(np.sqrt(self._n_tri_alive)) + 64
+        start = 0
+        for _ in range(limit):
+            v = self._tri[t].tolist()
+            for k in range(3):
+                i = (start + k) % 3
+                ax, ay = self._coords(v[(i + 1) % 3])
+                bx, by = self._coords(v[(i + 2) % 3])
+                if _orient(ax, ay, bx, by, px, py) < 0:
+                    n = int(self._nbr[t, i])
+                    if n < 0:
+                        return t, False
+                    t = n
+                    break
+            else:
+                return t, True
+            start = (start + 1) % 3  # vary the edge order to avoid cycling
+        return self._locate_brute(px, py)
+
+    def _locate_brute(self, px: float, py: float) -> Tuple[int, bool]:
+        ids = np.flatnonzero(self._tri_alive[: self._nt])
+        p = self._xyz[self._tri[ids], :2]
+        d = []
+        for i in range(3):
+            a, b = p[:, (i + 1) % 3], p[:, (i + 2) % 3]
+            d.append((b[:, 0] - a[:, 0]) * (py - a[:, 1]) - (b[:, 1] - a[:, 1]) * (px - a[:, 0]))
+        inside = np.flatnonzero((d[0] >= 0) & (d[1] >= 0) & (d[2] >= 0))
+        return (int(ids[inside[0]]), True) if len(inside) else (-1, False)
+
+    def _insert_local(self, vid: int) -> bool:
+        """Bowyer–Watson insertion of an already stored vertex; False if not possible."""
+        if self._n_tri_alive == 0:
+            return False
+        px, py = self._coords(vid)
+        if self._at_xy[(px, py)][0] != vid:
+            return True  # another vertex already owns this XY location
+
+        t0, inside = self._locate(px, py)
+        if not inside:
+            return False
+
+        # Grow the cavity: triangles whose circumcircle contains p
+        cavity = {t0}
+        stack = [t0]
+        while stack:
+            t = stack.pop()
+            for n in self._nbr[t].tolist():
+                if n < 0 or n in cavity:
+                    continue
+                a, b, c = self._tri[n].tolist()
+                if _in_circle(*self._coords(a), *self._coords(b), *self._coords(c), px, py) > 0:
+                    cavity.add(n)
+                    stack.append(n)
+
+        # Boundary edges (a -> b, CCW) with the triangle outside each one
+        boundary = []
+        for t in cavity:
+            v = self._tri[t].tolist()
+            nb = self._nbr[t].tolist()
+            for i in range(3):
+                if nb[i] not in cavity:
+                    a, b = v[(i + 1) % 3], v[(i + 2) % 3]
+                    if _orient(*self._coords(a), *self._coords(b), px, py) <= 0:
+                        return False  # cavity not star-shaped from p (degenerate)
+                    boundary.append((a, b, nb[i], t))
+
+        self._replace(cavity, [(a, b, vid) for a, b, _, _ in boundary],
+                      {(a, b): (outer, old) for a, b, outer, old in boundary})
+        return True
+
+    def _delete_local(self, vid: int) -> bool:
+        """Remove a vertex's star and re-triangulate its link; False if not possible."""
+        key = self._coords(vid)
+        owners = self._at_xy.get(key, [])
+        if not owners or owners[0] != vid:
+            return True  # untriangulated duplicate: nothing to re-triangulate
+        t0 = int(self._vtri[vid])
+        if t0 < 0:
+            return self._n_tri_alive == 0
+
+        # Walk around the vertex collecting its star and CCW link polygon
+        star, link, outer = [], [], []
+        t = t0
+        while True:
+            v = self._tri[t].tolist()
+            i = v.index(vid)
+            star.append(t)
+            link.append(v[(i + 1) % 3])
+            outer.append(int(self._nbr[t, i]))
+            t = int(self._nbr[t, (i + 1) % 3])
+            if t < 0:
+                return False  # hull vertex
+            if t == t0:
+                break
+            if len(star) > self._n_tri_alive:
+                return False
+
+        # Delaunay ear clipping of the link polygon
+        pts = {u: self._coords(u) for u in link}
+        poly = list(link)
+        new: List[Tuple[int, int, int]] = []
+        while len(poly) > 3:
+            for j in range(len(poly)):
+                a, b, c = poly[j - 1], poly[j], poly[(j + 1) % len(poly)]
+                if _orient(*pts[a], *pts[b], *pts[c]) <= 0:
+                    continue
+                if any(_in_circle(*pts[a], *pts[b], *pts[c], *pts[q]) > 0
+                       for q in poly if q not in (a, b, c)):
+                    continue
+                new.append((a, b, c))
+                del poly[j]
+                break
+            else:
+                return False
+        if _orient(*pts[poly[0]], *pts[poly[1]], *pts[poly[2]]) <= 0:
+            return False
+        new.append(tuple(poly))
+
+        # Link edges border the triangles outside the star
+        n = len(link)
+        self._replace(set(star), new, {(link[j], link[(j + 1) % n]): (outer[j], star[j]) for j in range(n)})
+
+        # A duplicate vertex at the same XY takes over the location
+        owners.remove(vid)
+        if owners:
+            return self._insert_local(owners[0])
+        return True
+
+    def _replace(self, old: set, triangles: List[Tuple[int, int, int]],
+                 boundary: Dict[Tuple[int, int], Tuple[int, int]]) -> None:
+        """Swap the triangles *old* for *triangles*, re-linking all adjacency.
+
+        Args:
+            old: Ids of the triangles being removed.
+            triangles: New CCW vertex triples filling the same region.
+            boundary: Maps each directed edge on the region's border to
+                ``(outer triangle or -1, old triangle that bordered it)``.
+
+        """
+        for t in old:
+            self._tri_alive[t] = False
+            self._free.append(t)
+        self._n_tri_alive -= len(old)
+
+        edges: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        created = []
+        for a, b, c in triangles:
+            t = self._alloc_tri()
+            self._tri[t] = (a, b, c)
+            self._tri_alive[t] = True
+            created.append(t)
+            # Edge opposite vertex i runs from vertex i+1 to vertex i+2
+            for i, edge in enumerate(((b, c), (c, a), (a, b))):
+                edges[edge] = (t, i)
+        self._n_tri_alive += len(created)
+
+        for (u, w), (t, i) in edges.items():
+            twin = edges.get((w, u))
+            if twin is not None:
+                self._nbr[t, i] = twin[0]
+                continue
+            outer, old_t = boundary[(u, w)]
+            self._nbr[t, i] = outer
+            if outer >= 0:
+                row = self._nbr[outer].tolist()
+                self._nbr[outer, row.index(old_t)] = t
+
+        for t in created:
+            for u in self._tri[t].tolist():
+                self._vtri[u] = t
+        if created:
+            self._hint = created[0]
+        self._cache = None
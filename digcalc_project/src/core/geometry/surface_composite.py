@@ -0,0 +1,221 @@
+"""surface_composite.py
+Cell-wise composites of two surfaces on a shared raster.
+
+Both inputs are sampled onto one regular grid – raster surfaces bilinearly
+from their own grid, TINs by rasterising their faces, point-only surfaces
+through their Delaunay interpolation – and the composite is a single NumPy
+operation over the two arrays (``np.fmin`` for the *Lowest* surface).  The
+result is a raster-backed :class:`~digcalc_project.src.models.surface.Surface`,
+so no per-point objects are created.  Inputs may be TINs or grids of any
+spacing; they do not need to share nodes.
+
+Example
+-------
+>>> lowest = composite_surfaces(design, existing, "min", name="Lowest")
+>>> depth = composite_surfaces(design, existing, "difference", spacing=0.5)
+>>> pad = clip_surface(lowest, [(0, 0), (50, 0), (50, 40), (0, 40)])
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...models.surface import Surface
+
+__all__ = [
+    "OPERATIONS",
+    "CELLS_PER_VERTEX",
+    "DEFAULT_MAX_CELLS",
+    "composite_surfaces",
+    "clip_surface",
+    "shared_grid",
+    "sample_surface",
+]
+
+logger = logging.getLogger(__name__)
+
+Bounds = Tuple[float, float, float, float]  # x_min, y_min, x_max, y_max
+
+# Cell-wise operations.  min/max ignore a missing side (NaN) and keep the
+# other surface; difference (first - second) is only defined where both exist.
+OPERATIONS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "min": np.fmin,
+    "max": np.fmax,
+    "difference": np.subtract,
+}
+
+# Without a raster input or explicit spacing the grid gets about this many
+# cells per TIN vertex (enough to follow the facets), up to DEFAULT_MAX_CELLS.
+CELLS_PER_VERTEX = 16
+DEFAULT_MAX_CELLS = 1_000_000
+
+
+def composite_surfaces(first: Surface, second: Surface, operation: str = "min",
+                       name: Optional[str] = None, spacing: Optional[float] = None,
+                       bounds: Optional[Bounds] = None) -> Surface:
+    """Combine two surfaces cell by cell on a shared grid.
+
+    Args:
+        first: First operand.
+        second: Second operand (subtracted for ``"difference"``).
+        operation: One of ``"min"``, ``"max"`` or ``"difference"``.
+        name: Name of the result; defaults to ``"<operation>(<first>, <second>)"``.
+        spacing: Grid spacing; see :func:`shared_grid`.
+        bounds: Grid extent; defaults to the union of both surfaces' bounds
+            (their intersection for ``"difference"``).
+
+    Returns:
+        Surface: Raster-backed surface, ``NaN`` where the operation has no value.
+
+    Raises:
+        ValueError: For an unknown operation or surfaces without data.
+
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown composite operation '{operation}'; expected one of {tuple(OPERATIONS)}")
+    gx, gy = shared_grid((first, second), spacing, bounds, union=operation != "difference")
+    z = OPERATIONS[operation](sample_surface(first, gx, gy), sample_surface(second, gx, gy))
+
+    result = Surface(name or f"{operation}({first.name}, {second.name})")
+    result.set_grid_data(z, _spacing_of(gx, gy, spacing), (gx[0], gy[0]))
+    logger.debug(f"Composited '{first.name}' {operation} '{second.name}' on a {len(gy)}x{len(gx)} grid.")
+    return result
+
+
+def clip_surface(surface: Surface, polygon: Sequence[Tuple[float, float]], name: Optional[str] = None,
+                 spacing: Optional[float] = None) -> Surface:
+    """Cut *surface* to the inside of *polygon*.
+
+    Args:
+        surface: Surface to clip.
+        polygon: ``(x, y)`` vertices of the clip polygon (at least three).
+        name: Name of the result; defaults to ``"<surface> (clipped)"``.
+        spacing: Grid spacing; see :func:`shared_grid`.
+
+    Returns:
+        Surface: Raster-backed surface, ``NaN`` outside the polygon.
+
+    Raises:
+        ValueError: For a degenerate polygon or one missing the surface.
+        ImportError: If Shapely 2 is not installed.
+
+    """
+    from shapely import contains_xy, prepare
+    from shapely.geometry import Polygon
+
+    poly = Polygon(polygon)
+    if len(polygon) < 3 or not poly.is_valid or poly.area <= 0:
+        raise ValueError("Clip polygon must be a valid polygon with at least three vertices.")
+    surface_bounds = surface.get_bounds()
+    if surface_bounds is None:
+        raise ValueError(f"Surface '{surface.name}' has no data to clip.")
+    bounds = _intersect_bounds([surface_bounds, poly.bounds])
+    if bounds is None:
+        raise ValueError(f"Clip polygon does not overlap surface '{surface.name}'.")
+
+    gx, gy = shared_grid((surface,), spacing, bounds)
+    z = sample_surface(surface, gx, gy)
+    prepare(poly)
+    xx, yy = np.meshgrid(gx, gy)
+    z[~contains_xy(poly, xx, yy)] = np.nan
+
+    result = Surface(name or f"{surface.name} (clipped)")
+    result.set_grid_data(z, _spacing_of(gx, gy, spacing), (gx[0], gy[0]))
+    return result
+
+
+def shared_grid(surfaces: Sequence[Surface], spacing: Optional[float] = None,
+                bounds: Optional[Bounds] = None, union: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Node coordinates of a grid covering *surfaces*.
+
+    Without an explicit *spacing* the finest ``grid_spacing`` among the
+    inputs is used, or – for TIN-only inputs – a spacing giving about
+    :data:`CELLS_PER_VERTEX` cells per vertex, at most
+    :data:`DEFAULT_MAX_CELLS` in total.  The grid is snapped to the
+    lattice of a raster input of the same spacing so its nodes are sampled
+    exactly.
+
+    Args:
+        surfaces: Surfaces the grid must cover.
+        spacing: Node spacing.
+        bounds: Extent to cover instead of the surfaces' bounds.
+        union: Cover the union of the surfaces' bounds (``False``: intersection).
+
+    Returns:
+        Tuple of ascending ``gx`` (columns) and ``gy`` (rows) coordinates.
+
+    Raises:
+        ValueError: If there is nothing to cover or *spacing* is not positive.
+
+    """
+    if bounds is None:
+        boxes = [b for b in (s.get_bounds() for s in surfaces) if b is not None]
+        if not boxes:
+            raise ValueError("Surfaces have no data to composite.")
+        bounds = _union_bounds(boxes) if union else _intersect_bounds(boxes)
+        if bounds is None:
+            raise ValueError("Surfaces do not overlap.")
+    x_min, y_min, x_max, y_max = (float(b) for b in bounds)
+
+    rasters = [s for s in surfaces if s.grid_spacing]
+    if spacing is None:
+        if rasters:
+            spacing = min(s.grid_spacing for s in rasters)
+        else:
+            area = (x_max - x_min) * (y_max - y_min)
+            cells = min(CELLS_PER_VERTEX * sum(len(s.vertices) for s in surfaces), DEFAULT_MAX_CELLS)
+            spacing = math.sqrt(area / max(cells, 1)) if area > 0 else 1.0
+    if spacing <= 0:
+        raise ValueError("spacing must be positive")
+
+    lattice = next((s.grid_origin for s in rasters if s.is_raster and s.grid_spacing == spacing), None)
+    if lattice is not None:
+        x_min = lattice[0] + math.floor((x_min - lattice[0]) / spacing + 1e-9) * spacing
+        y_min = lattice[1] + math.floor((y_min - lattice[1]) / spacing + 1e-9) * spacing
+    cols = int(math.floor((x_max - x_min) / spacing + 1e-9)) + 1
+    rows = int(math.floor((y_max - y_min) / spacing + 1e-9)) + 1
+    if x_min + (cols - 1) * spacing < x_max - 1e-9 * spacing:
+        cols += 1
+    if y_min + (rows - 1) * spacing < y_max - 1e-9 * spacing:
+        rows += 1
+    return x_min + np.arange(cols) * spacing, y_min + np.arange(rows) * spacing
+
+
+def sample_surface(surface: Surface, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    """Elevations of *surface* at the nodes of ``gx`` × ``gy``.
+
+    Uses the same samplers (and interpolator cache) as the grid volume
+    calculation.
+
+    Returns:
+        np.ndarray: ``(len(gy), len(gx))`` elevations, ``NaN`` off the surface.
+
+    """
+    from ..calculations.volume_calculator import surface_sampler
+
+    sampler = surface_sampler(surface)
+    return np.asarray(sampler(np.asarray(gx, dtype=np.float64), np.asarray(gy, dtype=np.float64)),
+                      dtype=np.float64)
+
+
+def _spacing_of(gx: np.ndarray, gy: np.ndarray, spacing: Optional[float]) -> float:
+    if len(gx) > 1:
+        return float(gx[1] - gx[0])
+    if len(gy) > 1:
+        return float(gy[1] - gy[0])
+    return float(spacing or 1.0)
+
+
+def _union_bounds(boxes: Sequence[Bounds]) -> Bounds:
+    arr = np.asarray(boxes, dtype=np.float64)
+    return float(arr[:, 0].min()), float(arr[:, 1].min()), float(arr[:, 2].max()), float(arr[:, 3].max())
+
+
+def _intersect_bounds(boxes: Sequence[Bounds]) -> Optional[Bounds]:
+    arr = np.asarray(boxes, dtype=np.float64)
+    box = (float(arr[:, 0].max()), float(arr[:, 1].max()), float(arr[:, 2].min()), float(arr[:, 3].min()))
+    return box if box[0] <= box[2] and box[1] <= box[3] else None
@@ -0,0 +1,355 @@
+"""surface_expression.py
+Lazy surface algebra evaluated tile by tile.
+
+An expression such as ``minimum(design, existing)``, ``existing - 0.5``,
+``clip(design, boundary)`` or ``offset(pad, 0.5)`` is a small tree over
+existing surfaces.  Building it costs nothing; elevations are only computed
+for the grid nodes a consumer asks for (a volume tile, a view, a profile),
+and each evaluated tile is kept in the process-wide
+:class:`~digcalc_project.src.core.calculations.interpolator_cache.InterpolatorCache`
+under the expression's content key, so repeated sampling is free and the
+cache budget bounds the memory it can use.
+
+:class:`ExpressionSurface` exposes an expression as a raster-backed
+:class:`~digcalc_project.src.models.surface.Surface`, so it can sit in
+``project.surfaces`` and be passed to the volume calculator like any other
+surface.  Its full raster (and vertex array) is only produced if something
+asks for ``grid_data``, ``vertices`` or ``points``.
+
+Expressions refer to their input surfaces rather than copying them and
+record the inputs' fingerprints when they are built; build a new expression
+after editing an input in place.
+
+Example
+-------
+>>> lowest = ExpressionSurface("Lowest", minimum(design, existing))
+>>> stripped = as_expression(existing) - 0.5
+>>> calc.calculate_grid_method(stripped.to_surface("Stripped"), lowest)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ...models.surface import Surface
+from .surface_composite import OPERATIONS, _intersect_bounds, _union_bounds, sample_surface, shared_grid
+
+__all__ = [
+    "SurfaceExpression",
+    "SurfaceTerm",
+    "Combine",
+    "Offset",
+    "Clip",
+    "ExpressionSurface",
+    "as_expression",
+    "minimum",
+    "maximum",
+    "offset",
+    "clip",
+]
+
+logger = logging.getLogger(__name__)
+
+Bounds = Tuple[float, float, float, float]  # x_min, y_min, x_max, y_max
+Operand = Union["SurfaceExpression", Surface]
+
+
+class SurfaceExpression(ABC):
+    """Base class of lazily evaluated surface expressions."""
+
+    def __init__(self) -> None:
+        self._key: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+    def sample(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        """Elevations at the nodes of ``gx`` × ``gy``, cached per tile.
+
+        Returns:
+            np.ndarray: Read-only ``(len(gy), len(gx))`` array, ``NaN`` where
+            the expression has no value.
+
+        """
+        from ..calculations.interpolator_cache import InterpolatorCache
+
+        gx = np.ascontiguousarray(gx, dtype=np.float64)
+        gy = np.ascontiguousarray(gy, dtype=np.float64)
+        tile = hashlib.blake2b(gx.tobytes() + b"|" + gy.tobytes(), digest_size=16).hexdigest()
+        cache = InterpolatorCache()
+        key = ("expr", self.key, tile)
+        z = cache.get(key)
+        if z is None:
+            z = np.asarray(self._evaluate(gx, gy), dtype=np.float64)
+            z.flags.writeable = False
+            cache.put(key, z, nbytes=z.nbytes)
+        return z
+
+    @abstractmethod
+    def _evaluate(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        """Compute the elevations at the nodes of ``gx`` × ``gy`` (uncached)."""
+
+    # ------------------------------------------------------------------
+    # Structure
+    # ------------------------------------------------------------------
+    @property
+    def key(self) -> str:
+        """Content hash of the expression and the geometry of its inputs."""
+        if self._key is None:
+            self._key = hashlib.blake2b(self._describe().encode(), digest_size=16).hexdigest()
+        return self._key
+
+    @abstractmethod
+    def _describe(self) -> str:
+        """Canonical text of the expression, hashed into :attr:`key`."""
+
+    @abstractmethod
+    def bounds(self) -> Optional[Bounds]:
+        """Extent the expression can have values in (``None`` if empty)."""
+
+    @abstractmethod
+    def surfaces(self) -> Tuple[Surface, ...]:
+        """Input surfaces of the expression."""
+
+    def spacing(self) -> Optional[float]:
+        """Finest grid spacing among the inputs, if any input is a grid."""
+        spacings = [s.grid_spacing for s in self.surfaces() if s.grid_spacing]
+        return min(spacings) if spacings else None
+
+    def to_surface(self, name: str, spacing: Optional[float] = None) -> "ExpressionSurface":
+        """Wrap the expression as a lazily evaluated :class:`ExpressionSurface`."""
+        return ExpressionSurface(name, self, spacing)
+
+    # ------------------------------------------------------------------
+    # Operators
+    # ------------------------------------------------------------------
+    def __add__(self, other: Union[float, Operand]) -> "SurfaceExpression":
+        if isinstance(other, (int, float)):
+            return Offset(self, float(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Union[float, Operand]) -> "SurfaceExpression":
+        if isinstance(other, (int, float)):
+            return Offset(self, -float(other))
+        if isinstance(other, (SurfaceExpression, Surface)):
+            return Combine("difference", self, other)
+        return NotImplemented
+
+
+class SurfaceTerm(SurfaceExpression):
+    """Leaf expression: an existing surface."""
+
+    def __init__(self, surface: Surface) -> None:
+        super().__init__()
+        self.surface = surface
+
+    def _evaluate(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        return sample_surface(self.surface, gx, gy)
+
+    def sample(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        # The surface samplers are cached already; tiles of a bare surface are not
+        return self._evaluate(gx, gy)
+
+    def _describe(self) -> str:
+        return f"surface:{self.surface.fingerprint()}"
+
+    def bounds(self) -> Optional[Bounds]:
+        return self.surface.get_bounds()
+
+    def surfaces(self) -> Tuple[Surface, ...]:
+        return (self.surface,)
+
+
+class Combine(SurfaceExpression):
+    """Cell-wise ``min``, ``max`` or ``difference`` of two expressions.
+
+    ``min``/``max`` keep the other operand where one is missing and cover the
+    union of both extents; ``difference`` needs both.
+    """
+
+    def __init__(self, operation: str, first: Operand, second: Operand) -> None:
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown composite operation '{operation}'; expected one of {tuple(OPERATIONS)}")
+        super().__init__()
+        self.operation = operation
+        self.first, self.second = as_expression(first), as_expression(second)
+
+    def _evaluate(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        return OPERATIONS[self.operation](self.first.sample(gx, gy), self.second.sample(gx, gy))
+
+    def _describe(self) -> str:
+        return f"{self.operation}({self.first.key},{self.second.key})"
+
+    def bounds(self) -> Optional[Bounds]:
+        boxes = [b for b in (self.first.bounds(), self.second.bounds()) if b is not None]
+        if self.operation == "difference":
+            return _intersect_bounds(boxes) if len(boxes) == 2 else None
+        return _union_bounds(boxes) if boxes else None
+
+    def surfaces(self) -> Tuple[Surface, ...]:
+        return self.first.surfaces() + self.second.surfaces()
+
+
+class Offset(SurfaceExpression):
+    """An expression raised (or lowered, for negative *dz*) by a constant."""
+
+    def __init__(self, operand: Operand, dz: float) -> None:
+        super().__init__()
+        self.operand, self.dz = as_expression(operand), float(dz)
+
+    def _evaluate(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        return self.operand.sample(gx, gy) + self.dz
+
+    def _describe(self) -> str:
+        return f"offset({self.operand.key},{self.dz!r})"
+
+    def bounds(self) -> Optional[Bounds]:
+        return self.operand.bounds()
+
+    def surfaces(self) -> Tuple[Surface, ...]:
+        return self.operand.surfaces()
+
+
+class Clip(SurfaceExpression):
+    """An expression restricted to the inside of a polygon."""
+
+    def __init__(self, operand: Operand, polygon: Sequence[Tuple[float, float]]) -> None:
+        from shapely import prepare
+        from shapely.geometry import Polygon
+
+        poly = Polygon(polygon)
+        if len(polygon) < 3 or not poly.is_valid or poly.area <= 0:
+            raise ValueError("Clip polygon must be a valid polygon with at least three vertices.")
+        super().__init__()
+        prepare(poly)
+        self.operand, self.polygon = as_expression(operand), poly
+
+    def _evaluate(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        from shapely import contains_xy
+
+        z = np.array(self.operand.sample(gx, gy), dtype=np.float64)
+        xx, yy = np.meshgrid(gx, gy)
+        z[~contains_xy(self.polygon, xx, yy)] = np.nan
+        return z
+
+    def _describe(self) -> str:
+        return f"clip({self.operand.key},{self.polygon.wkb_hex})"
+
+    def bounds(self) -> Optional[Bounds]:
+        inner = self.operand.bounds()
+        return None if inner is None else _intersect_bounds([inner, self.polygon.bounds])
+
+    def surfaces(self) -> Tuple[Surface, ...]:
+        return self.operand.surfaces()
+
+
+def as_expression(value: Operand) -> SurfaceExpression:
+    """Return *value* as an expression, wrapping plain surfaces."""
+    if isinstance(value, SurfaceExpression):
+        return value
+    if isinstance(value, Surface):
+        return SurfaceTerm(value)
+    raise TypeError(f"Cannot use {type(value).__name__} in a surface expression.")
+
+
+def minimum(first: Operand, second: Operand) -> SurfaceExpression:
+    """Lower of two surfaces at each node."""
+    return Combine("min", first, second)
+
+
+def maximum(first: Operand, second: Operand) -> SurfaceExpression:
+    """Higher of two surfaces at each node."""
+    return Combine("max", first, second)
+
+
+def offset(operand: Operand, dz: float) -> SurfaceExpression:
+    """*operand* shifted vertically by *dz*."""
+    return Offset(operand, dz)
+
+
+def clip(operand: Operand, polygon: Sequence[Tuple[float, float]]) -> SurfaceExpression:
+    """*operand* restricted to the inside of *polygon*."""
+    return Clip(operand, polygon)
+
+
+class ExpressionSurface(Surface):
+    """A :class:`Surface` whose raster is a lazily evaluated expression.
+
+    Volume calculations sample the expression directly, one tile at a time.
+    Bounds and the fingerprint come from the expression, so neither forces an
+    evaluation.  Replacing the geometry (``set_arrays``, ``add_point``...)
+    turns it into an ordinary surface.
+    """
+
+    def __init__(self, name: str, expression: Operand, spacing: Optional[float] = None) -> None:
+        """Initialize the surface.
+
+        Args:
+            name: Name of the surface.
+            expression: Expression (or plain surface) defining the elevations.
+            spacing: Node spacing of the raster; defaults to the finest input
+                grid, or a spacing derived from the inputs' vertex counts.
+
+        Raises:
+            ValueError: If the expression has no extent.
+
+        """
+        super().__init__(name)
+        self.expression = as_expression(expression)
+        bounds = self.expression.bounds()
+        if bounds is None:
+            raise ValueError(f"Expression for surface '{name}' has no extent.")
+        gx, gy = shared_grid(self.expression.surfaces(), spacing or self.expression.spacing(), bounds)
+        self.grid_spacing = float(gx[1] - gx[0]) if len(gx) > 1 else float(spacing or 1.0)
+        self.grid_origin = (float(gx[0]), float(gy[0]))
+        self._axes = (gx, gy)
+        self._raster: Optional[np.ndarray] = None
+        self._raster_backed = True
+        self._grid_pending = True
+
+    @property
+    def grid_data(self) -> Optional[np.ndarray]:
+        """The evaluated raster (computed on first access, read-only)."""
+        if self._raster is None and self._raster_backed:
+            logger.debug(f"Evaluating expression surface '{self.name}' on a "
+                         f"{len(self._axes[1])}x{len(self._axes[0])} grid.")
+            # Share the cached array rather than holding a second copy of it
+            self._raster = self.expression.sample(*self._axes)
+        return self._raster
+
+    @grid_data.setter
+    def grid_data(self, value: Optional[np.ndarray]) -> None:
+        self._raster = value
+
+    @property
+    def is_raster(self) -> bool:
+        return self._raster_backed
+
+    @property
+    def is_evaluated(self) -> bool:
+        """True once the full raster has been computed."""
+        return self._raster is not None
+
+    def sample_grid(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        """Evaluate the expression at the nodes of ``gx`` × ``gy``."""
+        if self._raster_backed and self._raster is None:
+            return self.expression.sample(gx, gy)
+        return super().sample_grid(gx, gy)
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        if self._raster_backed and self._raster is None:
+            return self.expression.bounds()
+        return super().get_bounds()
+
+    def fingerprint(self) -> str:
+        if self._raster_backed:
+            return f"expr:{self.expression.key}"
+        return super().fingerprint()
+
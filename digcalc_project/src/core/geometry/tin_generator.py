@@ -53,7 +53,7 @@ class TINGenerator:
         if not HAS_SCIPY:
             raise RuntimeError("SciPy library is required for TIN generation but is not installed.")
 
-        surface = Surface(name, Surface.SURFACE_TYPE_TIN)
+        surface = Surface(name)
 
         # Add points to the surface (ensures unique points by ID in the surface dict)
         # We use a temp dict to handle potential duplicates in the input list
@@ -2,13 +2,16 @@
 """CSV parser for the DigCalc application.
 
 This module provides functionality to import point cloud data from CSV files
-and convert it to DigCalc Surface models.
+and convert it to DigCalc Surface models.  Files are read in fixed-size
+blocks that are parsed straight into float arrays, so multi-million-row
+exports import without one Python object per point.
 """
 
 import csv
+import warnings
 from io import StringIO
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 
@@ -17,6 +20,11 @@ from digcalc_project.src.models.surface import Point3D, Surface
 # Use absolute import
 from .file_parser import FileParser, FileParserError
 
+# Approximate size of the line blocks parsed in one vectorised pass
+CHUNK_BYTES = 8 * 1024 * 1024
+# Line numbers of skipped rows kept for the import summary
+MAX_BAD_ROW_SAMPLES = 5
+
 
 class CSVParser(FileParser):
     """Parser for CSV files containing point data.
@@ -30,6 +38,9 @@ class CSVParser(FileParser):
         """Initialize the CSV parser."""
         super().__init__()
         self._points = []
+        self._xyz = np.empty((0, 3), dtype=np.float64)
+        self.bad_rows = 0
+        self.bad_row_lines: List[int] = []
         self._headers = []
         self._column_map = {}  # Maps 'x', 'y', 'z' to column indices
 
@@ -52,6 +63,10 @@ class CSVParser(FileParser):
     def parse(self, file_path: str, options: Optional[Dict] = None) -> Optional[Surface]:
         """Parse the CSV file and create a Surface object.
 
+        Points are read in blocks of about :data:`CHUNK_BYTES` (see
+        :meth:`iter_chunks`) straight into float arrays; the surface is
+        built from the concatenated array without per-point objects.
+
         Args:
             file_path (str): Path to the CSV file.
             options (Optional[Dict]): Dictionary with parsing options like 
@@ -62,9 +77,57 @@ class CSVParser(FileParser):
 
         """
         self.logger.info(f"Parsing CSV file: '{file_path}' with options: {options}")
-        self._file_path = file_path
+        try:
+            chunks = list(self.iter_chunks(file_path, options))
+        except FileParserError:
+            raise
+        except Exception as e:
+            raise FileParserError(f"An unexpected error occurred parsing CSV '{file_path}': {e}")
+        return self.build_surface(file_path, chunks)
+
+    def build_surface(self, file_path: str, chunks: List[np.ndarray]) -> Optional[Surface]:
+        """Concatenate the chunks of :meth:`iter_chunks` into a point surface.
+
+        The points are kept for :meth:`get_point_array` and :meth:`get_points`.
+        """
+        self._xyz = np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.float64)
         self._points = []
+
+        if not len(self._xyz):
+            self.logger.warning(f"No valid points found in CSV file '{file_path}'.")
+            return None
+
+        self.logger.info(f"Successfully parsed {len(self._xyz)} points from CSV.")
+        # Use filename as default name
+        return Surface.from_arrays(Path(file_path).stem, self._xyz)
+
+    def iter_chunks(self, file_path: str, options: Optional[Dict] = None) -> Iterator[np.ndarray]:
+        """Yield the points of a CSV file as ``(K, 3)`` float64 arrays.
+
+        Each block of lines is parsed in one vectorised ``np.loadtxt`` call;
+        only blocks containing malformed rows fall back to row-by-row parsing.
+        Rows that are short, non-numeric or non-finite are skipped and
+        counted in :pyattr:`bad_rows` (the first few line numbers are kept in
+        :pyattr:`bad_row_lines`), with one summary warning at the end.
+        Peak memory is one block plus whatever the caller keeps, so the
+        chunks can be streamed into e.g. ``GridGenerator.bin_points``.
+
+        Args:
+            file_path: Path to the CSV file.
+            options: See :meth:`parse`.
+
+        Yields:
+            np.ndarray: Non-empty ``(K, 3)`` arrays of x, y, z.
+
+        Raises:
+            FileParserError: If the file is missing or the requested columns
+                are not in the header.
+
+        """
         options = options or {} # Ensure options is a dict
+        self._file_path = file_path
+        self.bad_rows = 0
+        self.bad_row_lines = []
 
         # Determine parameters from options or use defaults/auto-detection
         delimiter = options.get("delimiter", ",")
@@ -74,76 +137,98 @@ class CSVParser(FileParser):
         z_col_name = options.get("z_col")
 
         try:
-            with open(file_path, encoding="utf-8-sig") as f:
-                # Read header row if needed to determine column indices
-                header = None
-                if x_col_name or y_col_name or z_col_name: # If specific columns are requested
-                    for _ in range(skip_rows):
-                        f.readline()
-                    reader = csv.reader(StringIO(f.readline()), delimiter=delimiter)
-                    header = next(reader)
-                    self.logger.debug(f"CSV Header found: {header}")
-
-                    x_col = header.index(x_col_name) if x_col_name in header else None
-                    y_col = header.index(y_col_name) if y_col_name in header else None
-                    z_col = header.index(z_col_name) if z_col_name in header else None
-
-                    if x_col is None or y_col is None or z_col is None:
-                        missing = [name for name, idx in [("X", x_col), ("Y", y_col), ("Z", z_col)] if idx is None]
-                        raise FileParserError(f"Required columns not found in header: {missing}")
-                    self.logger.info(f"Using columns - X: {x_col}, Y: {y_col}, Z: {z_col}")
-                else:
-                     # Basic auto-detect: Assume first three columns are X, Y, Z
-                     x_col, y_col, z_col = 0, 1, 2
-                     self.logger.info(f"No columns specified, assuming X={x_col}, Y={y_col}, Z={z_col}")
-                     # Skip rows if no header was read
-                     for _ in range(skip_rows):
-                         f.readline()
-
-                # Read data rows
-                reader = csv.reader(f, delimiter=delimiter)
-                line_num = skip_rows + (1 if header else 0) # Adjust starting line number
-                for row in reader:
-                    line_num += 1
-                    if len(row) <= max(x_col, y_col, z_col): # Basic check for row length
-                        self.logger.warning(f"Skipping short row {line_num}: {row}")
-                        continue
-                    try:
-                        x = float(row[x_col])
-                        y = float(row[y_col])
-                        z = float(row[z_col])
-                        self._points.append(Point3D(x, y, z))
-                    except (ValueError, IndexError) as e:
-                        self.logger.warning(f"Skipping invalid data in row {line_num}: {row}. Error: {e}")
-                        continue
-
-            if not self._points:
-                self.logger.warning(f"No valid points found in CSV file '{file_path}'.")
-                return None
-
-            self.logger.info(f"Successfully parsed {len(self._points)} points from CSV.")
-
-            # Create and return the Surface object directly
-            surface_name = Path(file_path).stem # Use filename as default name
-            surface = Surface(name=surface_name)
-            for point in self._points:
-                 surface.add_point(point)
-            # Optionally trigger TIN generation here if points > 2?
-            # if len(surface.points) > 2:
-            #     surface.generate_tin() # Assuming such a method exists
-            return surface
-
+            f = self.open_tracked(file_path, encoding="utf-8-sig")
         except FileNotFoundError:
             raise FileParserError(f"CSV file not found: '{file_path}'")
-        except ValueError as ve:
-            raise FileParserError(f"Invalid numeric data found in CSV '{file_path}': {ve}")
-        except IndexError as ie:
-             # This might occur if a specific column index is invalid for a row
-             raise FileParserError(f"Column index error while parsing CSV '{file_path}'. Check column configuration and data consistency. Error: {ie}")
-        except FileParserError as fpe: # Re-raise specific parser errors
-             raise fpe
-        except Exception as e:
-            raise FileParserError(f"An unexpected error occurred parsing CSV '{file_path}': {e}")
+        with f:
+            for _ in range(skip_rows):
+                f.readline()
+            line_num = skip_rows
+            # Read header row if needed to determine column indices
+            if x_col_name or y_col_name or z_col_name: # If specific columns are requested
+                header = next(csv.reader(StringIO(f.readline()), delimiter=delimiter), [])
+                line_num += 1
+                self._headers = header
+                self.logger.debug(f"CSV Header found: {header}")
+
+                x_col = header.index(x_col_name) if x_col_name in header else None
+                y_col = header.index(y_col_name) if y_col_name in header else None
+                z_col = header.index(z_col_name) if z_col_name in header else None
+
+                if x_col is None or y_col is None or z_col is None:
+                    missing = [name for name, idx in [("X", x_col), ("Y", y_col), ("Z", z_col)] if idx is None]
+                    raise FileParserError(f"Required columns not found in header: {missing}")
+                self.logger.info(f"Using columns - X: {x_col}, Y: {y_col}, Z: {z_col}")
+            else:
+                # Basic auto-detect: Assume first three columns are X, Y, Z
+                x_col, y_col, z_col = 0, 1, 2
+                self.logger.info(f"No columns specified, assuming X={x_col}, Y={y_col}, Z={z_col}")
+
+            columns = (x_col, y_col, z_col)
+            total = 0
+            while True:
+                lines = f.readlines(CHUNK_BYTES)
+                if not lines:
+                    break
+                xyz = self._parse_block(lines, columns, delimiter, line_num)
+                line_num += len(lines)
+                total += len(xyz)
+                if len(xyz):
+                    yield xyz
+
+        if self.bad_rows:
+            self.logger.warning(
+                f"Skipped {self.bad_rows} invalid row(s) in '{file_path}' "
+                f"(first at line(s) {', '.join(map(str, self.bad_row_lines))}).")
+        self.logger.debug(f"Read {total} points from {line_num} lines of '{file_path}'.")
+
+    def _parse_block(self, lines: List[str], columns: Tuple[int, int, int], delimiter: str,
+                     first_line: int) -> np.ndarray:
+        """Parse one block of lines into an ``(K, 3)`` array, counting bad rows."""
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)  # "input contained no data"
+                xyz = np.loadtxt(lines, dtype=np.float64, delimiter=delimiter, usecols=columns,
+                                 comments=None, quotechar='"', ndmin=2)
+        except ValueError:
+            return self._parse_rows(lines, columns, delimiter, first_line)
+        finite = np.isfinite(xyz).all(axis=1)
+        if not finite.all():
+            # Blank lines are skipped by loadtxt, so map back through the non-blank lines
+            data_lines = [first_line + i + 1 for i, line in enumerate(lines) if line.strip()]
+            self._record_bad_rows([data_lines[i] for i in np.flatnonzero(~finite)])
+            xyz = xyz[finite]
+        return xyz
+
+    def _parse_rows(self, lines: List[str], columns: Tuple[int, int, int], delimiter: str,
+                    first_line: int) -> np.ndarray:
+        """Row-by-row fallback for a block that contains malformed rows."""
+        out = np.empty((len(lines), 3), dtype=np.float64)
+        n = 0
+        bad = []
+        width = max(columns) + 1
+        for i, row in enumerate(csv.reader(lines, delimiter=delimiter)):
+            if not row or (len(row) == 1 and not row[0].strip()):
+                continue  # blank line
+            try:
+                if len(row) < width:
+                    raise ValueError("short row")
+                out[n] = [float(row[c]) for c in columns]
+            except ValueError:
+                bad.append(first_line + i + 1)
+                continue
+            if np.isfinite(out[n]).all():
+                n += 1
+            else:
+                bad.append(first_line + i + 1)
+        self._record_bad_rows(bad)
+        return out[:n].copy()
+
+    def _record_bad_rows(self, line_numbers: List[int]) -> None:
+        self.bad_rows += len(line_numbers)
+        room = MAX_BAD_ROW_SAMPLES - len(self.bad_row_lines)
+        if room > 0:
+            self.bad_row_lines.extend(line_numbers[:room])
 
     def get_headers(self) -> List[str]:
         """Returns the detected or synthesized headers."""
@@ -200,28 +285,42 @@ class CSVParser(FileParser):
             bool: True if data is valid, False otherwise
 
         """
-        if not self._points:
+        if not len(self._xyz):
             self.log_error("No valid points found in CSV file")
             return False
 
         # Check for any NaN or Inf values
-        for point in self._points:
-            if (np.isnan(point.x) or np.isnan(point.y) or np.isnan(point.z) or
-                np.isinf(point.x) or np.isinf(point.y) or np.isinf(point.z)):
-                self.log_error(f"Invalid coordinate values found: {point}")
-                return False
+        if not np.isfinite(self._xyz).all():
+            self.log_error("Invalid coordinate values found in CSV points")
+            return False
 
         return True
 
     def get_points(self) -> List[Point3D]:
         """Get points from the parsed data.
-        
+
+        The ``Point3D`` objects are created on first call; prefer
+        :meth:`get_point_array` for large files.
+
         Returns:
             List of Point3D objects
 
         """
+        if not self._points and len(self._xyz):
+            self._points = [Point3D(x, y, z) for x, y, z in self._xyz.tolist()]
         return self._points
 
+    def get_point_array(self) -> np.ndarray:
+        """Get the parsed points as an ``(N, 3)`` float64 array."""
+        return self._xyz
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """Get the (xmin, ymin, xmax, ymax) bounds of the parsed points."""
+        if not len(self._xyz):
+            return None
+        lo, hi = self._xyz[:, :2].min(axis=0), self._xyz[:, :2].max(axis=0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
     def get_contours(self) -> Dict[float, List[List[Point3D]]]:
         """Get contour lines from the parsed data.
         
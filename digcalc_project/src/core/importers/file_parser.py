@@ -2,13 +2,19 @@
 """File parser interface for the DigCalc application.
 
 This module defines the abstract base class for all file parsers
-that import data into the DigCalc application.
+that import data into the DigCalc application.  Parsers that implement the
+:meth:`FileParser.iter_chunks` hook can be run as cancellable background
+imports with progress (see :mod:`.import_job`).
 """
 
+import io
 import logging
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import IO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 # Use absolute import assuming 'digcalc_project' is the top-level package
 from digcalc_project.src.models.surface import Point3D, Surface
@@ -18,6 +24,24 @@ class FileParserError(Exception):
     """Exception raised for errors during file parsing."""
 
 
+class _CountingFileIO(io.FileIO):
+    """Raw binary file that counts the bytes read from disk."""
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path, "rb")
+        self.bytes_read = 0
+
+    def readinto(self, buffer) -> Optional[int]:
+        n = super().readinto(buffer)
+        if n:
+            self.bytes_read += n
+        return n
+
+    def readall(self) -> bytes:
+        data = super().readall()
+        self.bytes_read += len(data)
+        return data
+
 
 class FileParser(ABC):
     """Abstract base class for file parsers.
@@ -32,6 +56,7 @@ class FileParser(ABC):
         self._file_path = None
         self._data = None
         self._last_error = None  # Track the last error message
+        self._tracked_file: Optional[_CountingFileIO] = None
 
     @abstractmethod
     def parse(self, file_path: str, options: Optional[Dict] = None) -> Optional[Surface]:
@@ -73,6 +98,100 @@ class FileParser(ABC):
 
         """
 
+    # ------------------------------------------------------------------
+    # Chunked parsing (background imports)
+    # ------------------------------------------------------------------
+    def iter_chunks(self, file_path: str, options: Optional[Dict] = None) -> Iterator[np.ndarray]:
+        """Yield the parsed data in blocks, reading the file incrementally.
+
+        This is the hook used by :class:`~.import_job.ImportJob`: the job
+        checks for cancellation and reports progress between chunks, so a
+        chunk should cover a bounded amount of input.  Files should be opened
+        with :meth:`open_tracked` so :pyattr:`bytes_read` advances as they
+        are read.  By default the chunks are ``(K, 3)`` point arrays that
+        :meth:`build_surface` concatenates; parsers yielding other kinds of
+        chunks override :meth:`build_surface` and :meth:`chunk_rows` too.
+
+        Parsers that do not implement the hook are imported through
+        :meth:`parse` in one step (no progress, cancellation only before
+        and after).
+
+        Args:
+            file_path: Path to the file to parse.
+            options: Parser-specific options, as for :meth:`parse`.
+
+        Yields:
+            np.ndarray: ``(K, 3)`` arrays of x, y, z.
+
+        Raises:
+            NotImplementedError: If the parser has no chunked reader.
+            FileParserError: If the file cannot be parsed.
+
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support chunked parsing")
+
+    @property
+    def supports_chunks(self) -> bool:
+        """True if the parser implements :meth:`iter_chunks`."""
+        return type(self).iter_chunks is not FileParser.iter_chunks
+
+    def chunk_rows(self, chunk) -> int:
+        """Number of rows (points, faces, ...) in one chunk, for progress reports."""
+        return len(chunk)
+
+    def build_surface(self, file_path: str, chunks: Sequence[np.ndarray]) -> Optional[Surface]:
+        """Build the surface from the chunks yielded by :meth:`iter_chunks`.
+
+        Args:
+            file_path: Path of the parsed file; its stem names the surface.
+            chunks: Everything :meth:`iter_chunks` yielded, in order.
+
+        Returns:
+            Point surface of the concatenated chunks, or None if there are no points.
+
+        """
+        if not chunks:
+            self.logger.warning(f"No valid points found in '{file_path}'.")
+            return None
+        xyz = np.concatenate(chunks) if len(chunks) > 1 else np.asarray(chunks[0], dtype=np.float64)
+        return Surface.from_arrays(Path(file_path).stem, xyz)
+
+    def expected_bytes(self, file_path: str, options: Optional[Dict] = None) -> int:
+        """Number of bytes :meth:`iter_chunks` will read, for progress reports.
+
+        Defaults to the file size; parsers that read only part of the file
+        report that part.
+        """
+        return os.path.getsize(file_path)
+
+    def open_tracked(self, file_path: str, encoding: Optional[str] = None,
+                     buffer_size: int = 1024 * 1024) -> IO:
+        """Open *file_path* for reading and track the bytes read in :pyattr:`bytes_read`.
+
+        Args:
+            file_path: File to open.
+            encoding: Text encoding; ``None`` opens the file in binary mode.
+            buffer_size: Size of the read buffer.
+
+        Returns:
+            Buffered binary reader, or a text wrapper with universal newlines.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+
+        """
+        raw = _CountingFileIO(file_path)
+        self._tracked_file = raw
+        buffered = io.BufferedReader(raw, buffer_size=buffer_size)
+        if encoding is None:
+            return buffered
+        return io.TextIOWrapper(buffered, encoding=encoding)
+
+    @property
+    def bytes_read(self) -> int:
+        """Bytes read so far from the file last opened with :meth:`open_tracked`."""
+        return self._tracked_file.bytes_read if self._tracked_file is not None else 0
+
     def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
         """Get the bounds of the parsed data.
         
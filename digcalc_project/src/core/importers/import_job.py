@@ -0,0 +1,176 @@
+"""import_job.py
+Run a :class:`~.file_parser.FileParser` as a cancellable, observable job.
+
+An :class:`ImportJob` drives a parser's :meth:`~.file_parser.FileParser.iter_chunks`
+hook: after every chunk it checks whether the job was cancelled and reports
+an :class:`ImportProgress` (bytes read from disk out of the parser's
+:meth:`~.file_parser.FileParser.expected_bytes`, rows parsed), then hands
+the chunks to :meth:`~.file_parser.FileParser.build_surface`.  Parsers
+without a chunked reader are run through ``parse()`` in one step.
+
+The job itself is Qt-free and can run on any thread; the GUI runs it through
+:class:`~digcalc_project.src.ui.import_manager.ImportJobManager`.
+
+Example
+-------
+>>> job = ImportJob(CSVParser(), "survey.csv", {"delimiter": ","})
+>>> surface = job.run(lambda p: print(f"{p.fraction:.0%} ({p.rows} rows)"))
+>>> job.cancel()   # from another thread; run() raises ImportCancelled
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ...models.surface import Surface
+from .file_parser import FileParser, FileParserError
+
+__all__ = ["ImportProgress", "ImportCancelled", "ImportJob", "PROGRESS_INTERVAL"]
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two progress reports of one job
+PROGRESS_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    """Snapshot of an import's progress."""
+
+    bytes_read: int
+    total_bytes: int
+    rows: int
+
+    @property
+    def fraction(self) -> float:
+        """Share of the file read so far, in ``[0, 1]``."""
+        if self.total_bytes <= 0:
+            return 0.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+
+class ImportCancelled(Exception):
+    """Raised by :meth:`ImportJob.run` when the job was cancelled."""
+
+
+class ImportJob:
+    """Parse one file into a :class:`Surface`, with progress and cancellation.
+
+    Args:
+        parser: Parser for the file.
+        file_path: File to import.
+        options: Parser-specific options.
+        surface_name: Name for the imported surface (default: the parser's).
+        progress_interval: Minimum seconds between progress reports.
+
+    """
+
+    def __init__(self, parser: FileParser, file_path: str, options: Optional[Dict] = None,
+                 surface_name: Optional[str] = None, progress_interval: float = PROGRESS_INTERVAL):
+        self.parser = parser
+        self.file_path = str(file_path)
+        self.options = options or {}
+        self.surface_name = surface_name
+        self.progress_interval = progress_interval
+        self.progress = ImportProgress(0, 0, 0)
+        self._cancel_event = threading.Event()
+
+    @property
+    def name(self) -> str:
+        """Surface name if given, else the file name (for status messages)."""
+        return self.surface_name or os.path.basename(self.file_path)
+
+    def cancel(self) -> None:
+        """Ask the job to stop; it does so before the next chunk is parsed."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once :meth:`cancel` was called."""
+        return self._cancel_event.is_set()
+
+    def run(self, on_progress: Optional[Callable[[ImportProgress], None]] = None) -> Optional[Surface]:
+        """Parse the file, blocking until it is done.
+
+        Args:
+            on_progress: Called (on the calling thread) with an
+                :class:`ImportProgress` at most every ``progress_interval``
+                seconds and once at the end.
+
+        Returns:
+            The imported surface, or None if the file held no data.
+
+        Raises:
+            ImportCancelled: If the job was cancelled.
+            FileParserError: If parsing failed.
+
+        """
+        try:
+            total = self.parser.expected_bytes(self.file_path, self.options)
+        except OSError:
+            total = 0
+        self._check_cancelled()
+
+        if self.parser.supports_chunks:
+            surface = self._run_chunked(total, on_progress)
+        else:
+            logger.debug(f"{type(self.parser).__name__} has no chunked reader; parsing '{self.file_path}' in one step.")
+            try:
+                surface = self.parser.parse(self.file_path, self.options)
+            except FileParserError:
+                raise
+            except Exception as e:
+                raise FileParserError(f"Unexpected error importing '{self.file_path}': {e}") from e
+            self._check_cancelled()
+            rows = len(surface.vertices) if surface is not None else 0
+            self._report(ImportProgress(total, total, rows), on_progress)
+
+        if surface is not None and self.surface_name:
+            surface.name = self.surface_name
+        return surface
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _run_chunked(self, total: int,
+                     on_progress: Optional[Callable[[ImportProgress], None]]) -> Optional[Surface]:
+        parser = self.parser
+        chunks: List = []
+        rows = 0
+        last_report = time.monotonic()
+        stream = parser.iter_chunks(self.file_path, self.options)
+        try:
+            for chunk in stream:
+                self._check_cancelled()
+                chunks.append(chunk)
+                rows += parser.chunk_rows(chunk)
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    done = min(parser.bytes_read, total) if total else parser.bytes_read
+                    self._report(ImportProgress(done, total, rows), on_progress)
+        except (FileParserError, ImportCancelled):
+            raise
+        except Exception as e:
+            raise FileParserError(f"Unexpected error importing '{self.file_path}': {e}") from e
+        finally:
+            stream.close()  # closes the file if we stopped early
+
+        self._check_cancelled()
+        self._report(ImportProgress(total or parser.bytes_read, total, rows), on_progress)
+        return parser.build_surface(self.file_path, chunks)
+
+    def _report(self, progress: ImportProgress,
+                on_progress: Optional[Callable[[ImportProgress], None]]) -> None:
+        self.progress = progress
+        if on_progress is not None:
+            on_progress(progress)
+
+    def _check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            raise ImportCancelled(f"Import of '{self.file_path}' was cancelled.")
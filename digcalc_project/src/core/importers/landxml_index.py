@@ -0,0 +1,251 @@
+"""landxml_index.py
+Byte-offset index of the surfaces in a LandXML file.
+
+:func:`build_index` makes one pass over the file with expat, recording the
+name, point and face counts and the byte range of every ``<Surface>``
+without decoding any coordinates.  :func:`surface_index` keeps the result in
+the process-wide :class:`~digcalc_project.src.core.calculations.interpolator_cache.InterpolatorCache`
+under the file's fingerprint (path, size and modification time), so listing
+the surfaces of a file again is instant and an edited file is re-indexed;
+:func:`cached_surface_index` reads that cache without ever parsing.
+:func:`open_surface` then serves a single surface's byte range, wrapped in
+the document's root element, as a small well-formed LandXML document.
+
+Example
+-------
+>>> index = surface_index("site.xml")
+>>> [(s.name, s.n_points) for s in index.surfaces]
+[('EG', 812340), ('FG', 40211)]
+>>> with open("site.xml", "rb") as f:
+...     doc = open_surface(f, index, index.get("FG"))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import xml.parsers.expat
+from dataclasses import dataclass
+from typing import IO, List, Optional, Tuple
+
+from .file_parser import FileParserError
+
+__all__ = [
+    "SurfaceIndexEntry",
+    "LandXMLIndex",
+    "file_fingerprint",
+    "build_index",
+    "surface_index",
+    "cached_surface_index",
+    "open_surface",
+]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SurfaceIndexEntry:
+    """Location and size of one ``<Surface>`` element.
+
+    Attributes:
+        name: Surface name (``Surface_<n>`` if the element has none).
+        n_points: Number of ``<P>`` elements in the surface.
+        n_faces: Number of ``<F>`` elements in the surface.
+        start: Byte offset of the ``<Surface`` start tag.
+        end: Byte offset of its end tag (equal to *start* for an empty ``<Surface/>``).
+        tag: Qualified tag name as written in the file.
+    """
+
+    name: str
+    n_points: int
+    n_faces: int
+    start: int
+    end: int
+    tag: str = "Surface"
+
+    @property
+    def nbytes(self) -> int:
+        """Length of the surface's byte range."""
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class LandXMLIndex:
+    """Surfaces of one LandXML file and what is needed to read them on their own."""
+
+    fingerprint: str
+    surfaces: Tuple[SurfaceIndexEntry, ...]
+    root_tag: str
+    namespaces: Tuple[Tuple[str, str], ...] = ()
+    encoding: Optional[str] = None
+    n_cgpoints: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Rough in-memory size, for the cache budget."""
+        return 256 * (len(self.surfaces) + 1)
+
+    def names(self) -> List[str]:
+        """Surface names in document order."""
+        return [s.name for s in self.surfaces]
+
+    def get(self, name: str) -> Optional[SurfaceIndexEntry]:
+        """Entry of the surface called *name*, or None."""
+        return next((s for s in self.surfaces if s.name == name), None)
+
+
+def file_fingerprint(file_path: str) -> str:
+    """Identity of a file's current contents: its absolute path, size and modification time.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    """
+    st = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def build_index(file_path: str) -> LandXMLIndex:
+    """Index the surfaces of *file_path* in one pass, without decoding coordinates.
+
+    Raises:
+        FileParserError: If the file is missing, not well-formed or not LandXML.
+
+    """
+    try:
+        fingerprint = file_fingerprint(file_path)
+    except FileNotFoundError:
+        raise FileParserError(f"LandXML file not found: '{file_path}'")
+
+    parser = xml.parsers.expat.ParserCreate()
+    surfaces: List[SurfaceIndexEntry] = []
+    root: dict = {}
+    current: dict = {}
+    counts = {"P": 0, "F": 0, "CgPoint": 0}
+
+    def on_xml_decl(version, encoding, standalone):
+        root["encoding"] = encoding
+
+    def on_start(tag, attrs):
+        local = tag.rpartition(":")[2]
+        if not root.get("tag"):
+            if local != "LandXML":
+                raise FileParserError("Not a valid LandXML file.")
+            root["tag"] = tag
+            root["namespaces"] = tuple((k, v) for k, v in attrs.items() if k == "xmlns" or k.startswith("xmlns:"))
+        elif local in counts:
+            counts[local] += 1
+        elif local == "Surface" and not current:
+            current.update(name=attrs.get("name") or f"Surface_{len(surfaces) + 1}", tag=tag,
+                           start=parser.CurrentByteIndex, P=counts["P"], F=counts["F"])
+
+    def on_end(tag):
+        if current and tag == current["tag"]:
+            surfaces.append(SurfaceIndexEntry(current["name"], counts["P"] - current["P"],
+                                              counts["F"] - current["F"], current["start"],
+                                              max(parser.CurrentByteIndex, current["start"]), tag))
+            current.clear()
+
+    parser.XmlDeclHandler = on_xml_decl
+    parser.StartElementHandler = on_start
+    parser.EndElementHandler = on_end
+    with open(file_path, "rb") as f:
+        try:
+            parser.ParseFile(f)
+        except xml.parsers.expat.ExpatError as e:
+            raise FileParserError(f"Invalid XML structure: {e}")
+    if not root.get("tag"):
+        raise FileParserError("Not a valid LandXML file.")
+
+    index = LandXMLIndex(fingerprint, tuple(surfaces), root["tag"], root["namespaces"],
+                         root.get("encoding"), counts["CgPoint"])
+    logger.debug(f"Indexed {len(surfaces)} surface(s) in '{file_path}': {index.names()}")
+    return index
+
+
+def surface_index(file_path: str) -> LandXMLIndex:
+    """Cached :func:`build_index`, keyed by the file's fingerprint."""
+    from ..calculations.interpolator_cache import InterpolatorCache
+
+    try:
+        key = ("landxml-index", file_fingerprint(file_path))
+    except FileNotFoundError:
+        raise FileParserError(f"LandXML file not found: '{file_path}'")
+    return InterpolatorCache().get_or_build(key, lambda: build_index(file_path))
+
+
+def cached_surface_index(file_path: str) -> Optional[LandXMLIndex]:
+    """The index :func:`surface_index` has already built for the file's current contents, or None.
+
+    Never parses the file, so it is safe to call from the GUI thread.
+    """
+    from ..calculations.interpolator_cache import InterpolatorCache
+
+    try:
+        key = ("landxml-index", file_fingerprint(file_path))
+    except FileNotFoundError:
+        return None
+    return InterpolatorCache().get(key)
+
+
+def open_surface(f: IO[bytes], index: LandXMLIndex, entry: SurfaceIndexEntry,
+                 buffer_size: int = 1024 * 1024) -> IO[bytes]:
+    """Serve one surface of an open LandXML file as a document of its own.
+
+    Only the surface's byte range is read from *f*; it is wrapped in the
+    file's XML declaration and root element (with its namespace
+    declarations) so it parses like the original file.  *entry* must not be
+    an empty ``<Surface/>`` element.
+
+    Args:
+        f: Seekable binary file the index was built from.
+        index: Index of that file.
+        entry: Surface to serve.
+        buffer_size: Size of the read buffer.
+
+    Returns:
+        Buffered binary reader over the synthetic document.
+
+    """
+    encoding = index.encoding or "utf-8"
+    attrs = "".join(f' {k}="{_escape(v)}"' for k, v in index.namespaces)
+    head = f'<?xml version="1.0" encoding="{encoding}"?>\n<{index.root_tag}{attrs}>'
+    tail = f"</{entry.tag}></{index.root_tag}>"
+    raw = getattr(f, "raw", f)  # read the range unbuffered so nothing past it is touched
+    raw.seek(entry.start)
+    return io.BufferedReader(_SliceReader(head.encode(encoding), raw, entry.nbytes, tail.encode(encoding)),
+                             buffer_size=buffer_size)
+
+
+def _escape(value: str) -> str:
+    return value.replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;")
+
+
+class _SliceReader(io.RawIOBase):
+    """Raw stream of *head*, then *length* bytes of *f*, then *tail*."""
+
+    def __init__(self, head: bytes, f: IO[bytes], length: int, tail: bytes):
+        super().__init__()
+        self._head = io.BytesIO(head)
+        self._tail = io.BytesIO(tail)
+        self._f = f
+        self._left = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        n = self._head.readinto(view)
+        if n:
+            return n
+        if self._left > 0:
+            n = self._f.readinto(view[:min(len(view), self._left)])
+            if n:
+                self._left -= n
+                return n
+            self._left = 0
+        return self._tail.readinto(view)
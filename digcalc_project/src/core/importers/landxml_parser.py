@@ -2,18 +2,71 @@
 """LandXML parser for the DigCalc application.
 
 This module provides functionality to import surface data from LandXML files
-and convert it to DigCalc Surface models.
+and convert it to DigCalc Surface models.  Files are streamed with
+``iterparse``: every element is dropped from the tree as soon as it has been
+read, and ``<Pnts>``/``<Faces>`` are decoded in blocks straight into
+coordinate and index arrays, so peak memory stays close to the size of the
+resulting surface even for multi-gigabyte exports.
+
+A surface located through the file's index is not walked element by
+element at all: its byte range is scanned in blocks with regular
+expressions and each block of ``<P>``/``<F>`` texts is converted with one
+``np.loadtxt`` call.  Blocks the expressions cannot account for (comments,
+CDATA, entities, unusual attributes) hand the rest of the surface to
+``iterparse``.
 """
 
-import uuid
+import functools
+import re
+import warnings
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from digcalc_project.src.models.surface import Point3D, Surface, Triangle
+import numpy as np
+
+from digcalc_project.src.models.surface import Point3D, Surface
 
 # Use absolute import
 from .file_parser import FileParser, FileParserError
+from .landxml_index import (
+    LandXMLIndex,
+    SurfaceIndexEntry,
+    cached_surface_index,
+    open_surface,
+    surface_index,
+)
+
+# Number of <P>/<F>/<CgPoint> elements decoded into one chunk
+CHUNK_ROWS = 100_000
+# Bytes of a surface's range scanned per block
+SCAN_BYTES = 4 * 1024 * 1024
+# Row elements and the kind of chunk they are decoded into
+_ROW_TAGS = {"P": "points", "F": "faces", "CgPoint": "cgpoints"}
+
+
+# Row texts as found by iterparse (str) or by the byte scanner (bytes)
+_Text = Union[str, bytes]
+_POWERS_OF_TEN = 10 ** np.arange(1, 19, dtype=np.int64)
+_BLANKS = {str: (" ", "\t", "\r", "\n"), bytes: (b" ", b"\t", b"\r", b"\n")}
+# Tags the byte scanner leaves to iterparse: markup declarations, PIs and other spellings of <P>/<F>
+_UNSUPPORTED_TAG = re.compile(rb"<(?:[!?]|(?:[\w.-]+:)?[PF][\s/>])")
+
+
+class LandXMLChunk(NamedTuple):
+    """Block of rows yielded by :meth:`LandXMLParser.iter_chunks`.
+
+    Attributes:
+        kind: ``"points"`` or ``"faces"`` of a surface, or ``"cgpoints"``.
+        surface: Name of the surface the rows belong to (None for CgPoints).
+        values: ``(K, 3)`` x, y, z coordinates, or point ids of face corners.
+        ids: ``(K,)`` point ids for point chunks, else None.
+    """
+
+    kind: str
+    surface: Optional[str]
+    values: np.ndarray
+    ids: Optional[np.ndarray] = None
 
 
 class LandXMLParser(FileParser):
@@ -28,12 +81,14 @@ class LandXMLParser(FileParser):
     def __init__(self):
         """Initialize the LandXML parser."""
         super().__init__()
-        self._root = None
-        self._ns = {}  # XML namespaces
+        self._xyz = np.empty((0, 3), dtype=np.float64)
+        self._point_ids = np.empty(0, dtype=str)
+        self._faces = np.empty((0, 3), dtype=np.int32)
         self._points = []
-        self._triangles = []
         self._contours = {}
         self._surfaces = []
+        self._encoding = "utf-8"
+        self.selected_surface_name = None
 
         # Save reference to TINGenerator class
         # This allows mocking in tests
@@ -53,103 +108,27 @@ class LandXMLParser(FileParser):
 
     def parse(self, file_path: str, options: Optional[Dict] = None) -> Optional[Surface]:
         """Parse the given LandXML file and extract surface data.
-        
+
+        The file is streamed by :meth:`iter_chunks` and the surface is
+        assembled from the resulting arrays by :meth:`build_surface`.
+
         Args:
             file_path: Path to the LandXML file
-            options: Optional dictionary of parser-specific options (e.g., surface_name_to_load)
-            
+            options: Optional dictionary of parser-specific options; ``surface_name``
+                selects the surface to load (default: the first one).
+
         Returns:
             Surface object or None if parsing failed.
 
+        Raises:
+            FileParserError: If the file is not valid LandXML, holds no
+                surface or CgPoints, or lacks the requested surface.
+
         """
         self.logger.info(f"Parsing LandXML file: '{file_path}' with options: {options}")
-        self._file_path = file_path
-        self._points = {} # Use dict for point lookup by ID
-        self._triangles = []
-        self._surfaces = [] # List of available surface names
-        self.selected_surface_name = options.get("surface_name") if options else None # Specific surface to load
-
         try:
-            # Parse XML
-            tree = ET.parse(file_path)
-            self._root = tree.getroot()
-
-            # Extract namespace if present
-            self._ns = self._get_namespace(self._root)
-
-            # Check if this is a valid LandXML file
-            if not self._is_landxml():
-                raise FileParserError("Not a valid LandXML file.")
-
-            # Find all available surface definitions
-            available_surfaces = self._find_available_surfaces()
-            self._surfaces = list(available_surfaces.keys())
-
-            if not available_surfaces:
-                self.logger.warning("No <Surface> elements found. Looking for <CgPoints>.")
-                # If no surfaces, try parsing point groups
-                cg_points = self._parse_point_groups()
-                if not cg_points:
-                    raise FileParserError("No surfaces or CgPoints found in LandXML file.")
-                # Create a surface from CgPoints
-                self.logger.info(f"Creating surface from {len(cg_points)} CgPoints.")
-                surface_name = Path(file_path).stem + "_Points"
-                surface = Surface(name=surface_name)
-                for point in cg_points.values():
-                    surface.add_point(point)
-                # Optionally generate TIN if enough points? Requires TINGenerator
-                # if len(surface.points) > 2:
-                #     try: surface.generate_tin() # Assuming method exists
-                #     except Exception as tin_e: self.logger.warning(f"Failed to auto-generate TIN for CgPoints: {tin_e}")
-                return surface
-
-            # Determine which surface to load
-            target_surface_name = None
-            if self.selected_surface_name and self.selected_surface_name in available_surfaces:
-                target_surface_name = self.selected_surface_name
-            elif available_surfaces:
-                target_surface_name = next(iter(available_surfaces)) # Default to first found
-                self.logger.info(f"No specific surface selected, loading the first one found: '{target_surface_name}'")
-            else:
-                 raise FileParserError("No surfaces available to load.")
-
-            target_surface_elem = available_surfaces[target_surface_name]
-
-            # Parse the selected surface definition
-            surface_definition = self._parse_surface_definition(target_surface_elem)
-            if not surface_definition or not surface_definition.get("points"):
-                 raise FileParserError(f"Failed to parse definition for surface '{target_surface_name}'.")
-
-            # Create the Surface object
-            surface = Surface(name=target_surface_name)
-            point_map = surface_definition.get("points", {})
-            triangle_data = surface_definition.get("faces", [])
-
-            for point in point_map.values():
-                surface.add_point(point)
-
-            # Add triangles, linking points
-            for face_indices in triangle_data:
-                 try:
-                      p1 = point_map.get(face_indices[0])
-                      p2 = point_map.get(face_indices[1])
-                      p3 = point_map.get(face_indices[2])
-                      if p1 and p2 and p3:
-                           # Only add triangle if all points were found
-                           surface.add_triangle(Triangle(p1, p2, p3))
-                      else:
-                           missing_ids = [idx for idx, p in zip(face_indices, [p1, p2, p3]) if p is None]
-                           self.logger.warning(f"Skipping face referencing missing point IDs: {missing_ids}")
-                 except IndexError:
-                     self.logger.warning(f"Skipping invalid face data: {face_indices}")
-
-            self.logger.info(f"Successfully created surface '{surface.name}' with {len(surface.points)} points and {len(surface.triangles)} triangles.")
-            return surface
-
-        except ET.ParseError as pe:
-            raise FileParserError(f"Invalid XML structure: {pe}")
-        except FileNotFoundError:
-            raise FileParserError(f"LandXML file not found: '{file_path}'")
+            chunks = list(self.iter_chunks(file_path, options))
+            return self.build_surface(file_path, chunks)
         except FileParserError as fpe:
             self.log_error(str(fpe))
             raise # Re-raise our specific errors
@@ -157,6 +136,94 @@ class LandXMLParser(FileParser):
             self.log_error(f"An unexpected error occurred parsing LandXML '{file_path}': {e}", e)
             raise FileParserError(f"Unexpected LandXML parsing error: {e}")
 
+    def iter_chunks(self, file_path: str, options: Optional[Dict] = None) -> Iterator[LandXMLChunk]:
+        """Stream the points and faces of one surface as :class:`LandXMLChunk` blocks.
+
+        Only the byte range of the selected surface (``surface_name``
+        option, else the first ``<Surface>``) is read, located through the
+        file's cached surface index (see :meth:`get_surface_index`) and
+        scanned in blocks of :data:`SCAN_BYTES`; a file without surfaces is
+        read whole for its ``<CgPoints>`` with ``iterparse``.  Either way
+        memory does not grow with the file.
+
+        Args:
+            file_path: Path to the LandXML file.
+            options: See :meth:`parse`.
+
+        Yields:
+            LandXMLChunk: Blocks of at most :data:`CHUNK_ROWS` rows.
+
+        Raises:
+            FileParserError: If the file is missing, not well-formed or not
+                LandXML, or lacks the requested surface.
+
+        """
+        options = options or {}
+        self._file_path = file_path
+        index = self.get_surface_index(file_path)
+        self._surfaces = index.names()
+        self._encoding = index.encoding or "utf-8"
+        self.selected_surface_name = options.get("surface_name")
+        entry = self._selected_entry(index, self.selected_surface_name)
+
+        try:
+            f = self.open_tracked(file_path)
+        except FileNotFoundError:
+            raise FileParserError(f"LandXML file not found: '{file_path}'")
+        with f:
+            if entry is not None:
+                self.logger.info(f"Loading surface '{entry.name}' ({entry.n_points} points, "
+                                 f"{entry.n_faces} faces, bytes {entry.start}-{entry.end}).")
+                chunks = self._scan(f, index, entry)
+            else:
+                chunks = self._stream(f)  # no surfaces: read the CgPoints of the whole file
+            try:
+                yield from chunks
+            except ET.ParseError as pe:
+                raise FileParserError(f"Invalid XML structure: {pe}")
+
+    def expected_bytes(self, file_path: str, options: Optional[Dict] = None) -> int:
+        """Size of the selected surface's byte range (the whole file if it has no surfaces)."""
+        entry = self._selected_entry(self.get_surface_index(file_path), (options or {}).get("surface_name"))
+        return entry.nbytes if entry is not None else super().expected_bytes(file_path, options)
+
+    def build_surface(self, file_path: str, chunks: Sequence[LandXMLChunk]) -> Optional[Surface]:
+        """Assemble the surface from the chunks of :meth:`iter_chunks`.
+
+        Face corners are mapped from LandXML point ids to vertex indices with
+        one sorted lookup; faces referencing unknown points are skipped.  A
+        file without surfaces becomes a point surface of its CgPoints.
+
+        Raises:
+            FileParserError: If the surface has no points, or the file has
+                neither surfaces nor CgPoints.
+
+        """
+        points = [c for c in chunks if c.kind == "points"]
+        if not points and self._surfaces:
+            target = self.selected_surface_name or self._surfaces[0]
+            raise FileParserError(f"Failed to parse definition for surface '{target}'.")
+        if not points:
+            cg_points = [c for c in chunks if c.kind == "cgpoints"]
+            if not cg_points:
+                raise FileParserError("No surfaces or CgPoints found in LandXML file.")
+            self._set_points(cg_points)
+            self._faces = np.empty((0, 3), dtype=np.int32)
+            self.logger.info(f"Creating surface from {len(self._xyz)} CgPoints.")
+            return Surface.from_arrays(Path(file_path).stem + "_Points", self._xyz)
+
+        name = points[0].surface
+        self._set_points(points)
+        self._faces = self._face_indices([c.values for c in chunks if c.kind == "faces"])
+        surface = Surface.from_arrays(name, self._xyz, self._faces)
+        self.logger.info(f"Successfully created surface '{name}' with {len(self._xyz)} points "
+                         f"and {len(self._faces)} triangles.")
+        return surface
+
+    def chunk_rows(self, chunk: LandXMLChunk) -> int:
+        """Number of points or faces in *chunk*."""
+        return len(chunk.values)
+
     def validate(self) -> bool:
         """Validate the parsed data.
         
@@ -164,7 +231,7 @@ class LandXMLParser(FileParser):
             bool: True if data is valid, False otherwise
 
         """
-        if not self._points:
+        if not len(self._xyz):
             self.log_error("No valid points found in LandXML file")
             return False
 
@@ -172,13 +239,30 @@ class LandXMLParser(FileParser):
 
     def get_points(self) -> List[Point3D]:
         """Get points from the parsed data.
-        
+
+        The ``Point3D`` objects are created on first use; prefer
+        :meth:`get_point_array` for large files.
+
         Returns:
-            List of Point3D objects
+            List of Point3D objects carrying their LandXML ids
 
         """
+        if not self._points and len(self._xyz):
+            self._points = [Point3D(x, y, z, point_id=str(pid))
+                            for (x, y, z), pid in zip(self._xyz.tolist(), self._point_ids.tolist())]
         return self._points
 
+    def get_point_array(self) -> np.ndarray:
+        """``(N, 3)`` x, y, z array of the parsed points."""
+        return self._xyz
+
+    def get_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """Get the bounds of the parsed points as (xmin, ymin, xmax, ymax)."""
+        if not len(self._xyz):
+            return None
+        lo, hi = self._xyz[:, :2].min(axis=0), self._xyz[:, :2].max(axis=0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
     def get_contours(self) -> Dict[float, List[List[Point3D]]]:
         """Get contour lines from the parsed data.
         
@@ -188,134 +272,375 @@ class LandXMLParser(FileParser):
         """
         return self._contours
 
-    def get_available_surfaces(self) -> List[str]:
+    def get_available_surfaces(self, file_path: Optional[str] = None) -> List[str]:
         """Get the names of surfaces defined in the LandXML file.
-        
-        Returns:
-            List of surface names
 
-        """
-        return self._surfaces
+        Args:
+            file_path: File to list; defaults to the last parsed file.  The
+                names come from the file's cached surface index, so no parse
+                is needed.
 
-    def _is_landxml(self) -> bool:
-        """Check if the parsed file is a valid LandXML file.
-        
         Returns:
-            bool: True if valid, False otherwise
+            List of surface names
 
         """
-        if self._root is None:
-            return False
+        file_path = file_path or self._file_path
+        if file_path is None:
+            return self._surfaces
+        return self.get_surface_index(file_path).names()
 
-        # Check root tag
-        if "LandXML" not in self._root.tag:
-            return False
+    def get_surface_index(self, file_path: str) -> LandXMLIndex:
+        """Names, point/face counts and byte ranges of the file's surfaces.
 
-        return True
+        Built in one pass on first use and cached under the file's
+        fingerprint, so it is rebuilt only when the file changes.
 
-    def _get_namespace(self, element: ET.Element) -> Dict:
-        ns = {}
-        if "}" in element.tag:
-            ns_uri = element.tag.split("}")[0].strip("{")
-            ns = {"ns": ns_uri}
-            self.logger.debug(f"Found XML namespace: {ns_uri}")
-        return ns
-
-    def _find_available_surfaces(self) -> Dict[str, ET.Element]:
-        """Finds all <Surface> elements and returns a dict mapping name to element."""
-        surfaces = {}
-        xpath = ".//ns:Surfaces/ns:Surface" if self._ns else ".//Surfaces/Surface"
-        try:
-            surface_elements = self._root.findall(xpath, self._ns)
-            for i, surface_elem in enumerate(surface_elements):
-                name = surface_elem.get("name", f"Surface_{i+1}")
-                surfaces[name] = surface_elem
-            self.logger.debug(f"Found available surfaces: {list(surfaces.keys())}")
-        except Exception as e:
-             self.logger.error(f"Error finding surface elements: {e}")
-        return surfaces
-
-    def _parse_surface_definition(self, surface_elem: ET.Element) -> Optional[Dict]:
-        """Parses the <Definition> of a <Surface> element for points and faces."""
-        xpath_def = "ns:Definition" if self._ns else "Definition"
-        definition = surface_elem.find(xpath_def, self._ns)
-        if definition is None:
-             self.logger.warning(f"Surface '{surface_elem.get('name')}' has no <Definition> element.")
-             return None
-
-        points = self._parse_pnts(definition)
-        faces = self._parse_faces(definition)
-
-        if not points:
-             self.logger.warning(f"Surface '{surface_elem.get('name')}' definition has no points.")
-             return None # A surface needs points
+        Raises:
+            FileParserError: If the file is missing, not well-formed or not LandXML.
 
-        return {"points": points, "faces": faces}
-
-    def _parse_pnts(self, definition_elem: ET.Element) -> Dict[str, Point3D]:
-        """Parses <Pnts> within a <Definition> element."""
-        points = {}
-        xpath_pnts = "ns:Pnts/ns:P" if self._ns else "Pnts/P"
-        point_elements = definition_elem.findall(xpath_pnts, self._ns)
-        for point_elem in point_elements:
-            try:
-                point_id = point_elem.get("id")
-                if point_id is None:
-                    self.logger.warning(f"Skipping point without ID: {ET.tostring(point_elem, encoding='unicode')}")
+        """
+        return surface_index(file_path)
+
+    def cached_surface_index(self, file_path: str) -> Optional[LandXMLIndex]:
+        """The file's surface index if it is already cached, else None (never parses)."""
+        return cached_surface_index(file_path)
+
+    @staticmethod
+    def _selected_entry(index: LandXMLIndex, wanted: Optional[str]) -> Optional[SurfaceIndexEntry]:
+        """Index entry of the surface to load, or None if the file has no surfaces."""
+        entry = index.get(wanted) if wanted else (index.surfaces[0] if index.surfaces else None)
+        if wanted and entry is None:
+            raise FileParserError(f"Surface '{wanted}' not found in LandXML file (available: {index.names()}).")
+        if entry is not None and not entry.n_points:
+            raise FileParserError(f"Failed to parse definition for surface '{entry.name}'.")
+        return entry
+
+    def _scan(self, f, index: LandXMLIndex, entry: SurfaceIndexEntry) -> Iterator[LandXMLChunk]:
+        """Decode a surface's byte range in blocks, finding ``<P>``/``<F>`` with regular expressions.
+
+        A block is decoded only if every ``<`` in it belongs to a plain
+        ``<P id="...">``/``<F>`` element or to a tag that is neither of them
+        nor a comment, CDATA section or processing instruction.  The first
+        block that fails this check hands the rest of the surface to
+        :meth:`_stream`.
+        """
+        patterns = _scan_patterns(entry.tag[:-len("Surface")], self._encoding)
+        done = {"points": 0, "faces": 0}  # elements decoded so far
+        if patterns is not None:
+            raw = getattr(f, "raw", f)  # read the range unbuffered so nothing past it is touched
+            raw.seek(entry.start)
+            buffer = bytearray(SCAN_BYTES)
+            left, data = entry.nbytes, b""
+            while True:
+                n = raw.readinto(memoryview(buffer)[:min(SCAN_BYTES, left)]) if left else 0
+                left = left - n if n else 0
+                data += buffer[:n]
+                # Stop before the last "<" so that no element is cut in two
+                end = data.rfind(b"<") if left else len(data)
+                if end < 0:
                     continue
+                rows = _scan_block(patterns, data, end)
+                if rows is None:
+                    break
+                ids, texts, faces = rows
+                for i in range(0, len(ids), CHUNK_ROWS):
+                    yield from self._flush("points", entry.name, texts[i:i + CHUNK_ROWS], ids[i:i + CHUNK_ROWS])
+                for i in range(0, len(faces), CHUNK_ROWS):
+                    yield from self._flush("faces", entry.name, faces[i:i + CHUNK_ROWS], [])
+                done["points"] += len(ids)
+                done["faces"] += len(faces)
+                if not left:
+                    return
+                data = data[end:]
+            self.logger.info(f"Surface '{entry.name}' needs the full XML reader after "
+                             f"{done['points']} points and {done['faces']} faces.")
+        yield from self._stream(open_surface(f, index, entry), entry.name, skip=done)
+
+    def _stream(self, f, surface_name: Optional[str] = None,
+                skip: Optional[Dict[str, int]] = None) -> Iterator[LandXMLChunk]:
+        """Walk the document with ``iterparse``, dropping each element after its end tag.
+
+        The first ``<Surface>`` (named *surface_name* if given) and any
+        ``<CgPoints>`` are decoded, except for the first ``skip[kind]`` rows
+        of each kind.
+        """
+        skip = dict(skip or {})
+        path: List[ET.Element] = []
+        surface = None        # name of the <Surface> being read
+        loading = False       # whether that surface is the one to load
+        seen = 0
+        kind = None           # kind of the rows in the pending block
+        texts: List[str] = []
+        ids: List[Optional[str]] = []
+
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            tag = elem.tag.rpartition("}")[2]
+            if event == "start":
+                if not path and tag != "LandXML":
+                    raise FileParserError("Not a valid LandXML file.")
+                path.append(elem)
+                if tag == "Surface":
+                    seen += 1
+                    loading = seen == 1
+                    surface = (surface_name if loading else None) or elem.get("name") or f"Surface_{seen}"
+                continue
+
+            path.pop()
+            row = _ROW_TAGS.get(tag)
+            if row is not None and (loading or row == "cgpoints") and skip.get(row):
+                skip[row] -= 1  # already decoded by _scan
+            elif row is not None and (loading or row == "cgpoints"):
+                if row != kind and texts:
+                    yield from self._flush(kind, surface, texts, ids)
+                    texts, ids = [], []
+                kind = row
+                texts.append(elem.text or "")
+                if row != "faces":
+                    ids.append(elem.get("id") if row == "points" else elem.get("name") or elem.get("oID"))
+            if texts and (len(texts) >= CHUNK_ROWS or row is None):
+                yield from self._flush(kind, surface, texts, ids)
+                texts, ids = [], []
+            if tag == "Surface":
+                surface, loading = None, False
+            if path:
+                path[-1].remove(elem)  # nothing is kept once an element has ended
+
+    def _flush(self, kind: str, surface: Optional[str], texts: List[str],
+               ids: List[Optional[str]]) -> Iterator[LandXMLChunk]:
+        if kind == "faces":
+            chunk = self._decode_faces(surface, texts)
+        else:
+            chunk = self._decode_points(kind, surface if kind == "points" else None, texts, ids)
+        if chunk is not None:
+            yield chunk
+
+    def _decode_points(self, kind: str, surface: Optional[str], texts: Sequence[_Text],
+                       ids: Sequence[Optional[_Text]]) -> Optional[LandXMLChunk]:
+        """Convert the texts of a block of <P> or <CgPoint> elements to coordinates.
+
+        The block is converted in one ``np.loadtxt`` call; if a row is
+        malformed (or a point lacks its id) the rows are converted one by one
+        and the bad ones skipped.
+        """
+        xyz = None if kind == "points" and None in ids else _bulk_floats(texts)
+        if xyz is not None:
+            # LandXML order is Y X Z (Northing Easting Elevation)
+            return LandXMLChunk(kind, surface, xyz[:, [1, 0, 2]], self._bulk_ids(ids))
+
+        texts, ids = self._str(texts), self._str(ids)
+        xyz = np.empty((len(texts), 3), dtype=np.float64)
+        keep = []
+        for i, (text, point_id) in enumerate(zip(texts, ids)):
+            if point_id is None and kind == "points":
+                self.logger.warning(f"Skipping point without ID: '{text}'")
+                continue
+            coords = text.split()
+            try:
+                if len(coords) < 3:
+                    raise ValueError("fewer than three coordinates")
+                north, east, elev = map(float, coords[:3])
+            except ValueError as e:
+                self.logger.warning(f"Error parsing point '{point_id}': {e}. Data: '{text}'")
+                continue
+            xyz[i] = (east, north, elev)
+            keep.append(i)
+        if not keep:
+            return None
+        point_ids = _compact_ids(np.array([ids[i] or "" for i in keep], dtype=str))
+        return LandXMLChunk(kind, surface, xyz[keep], point_ids)
+
+    def _decode_faces(self, surface: Optional[str], texts: Sequence[_Text]) -> Optional[LandXMLChunk]:
+        """Split the texts of a block of <F> elements into point-id triples.
+
+        Corners are the ids of points in <Pnts>; integer ids are converted in
+        one ``np.loadtxt`` call, anything else row by row.
+        """
+        corners = _bulk_ints(texts, ndmin=2)
+        if corners is not None and corners.shape[1] >= 3:
+            return LandXMLChunk("faces", surface, _narrow(corners[:, :3]))
 
-                coords = point_elem.text.strip().split()
-                if len(coords) >= 3:
-                    # LandXML order is typically Y X Z (Northing Easting Elevation)
-                    y, x, z = map(float, coords[:3])
-                    points[point_id] = Point3D(x, y, z, point_id=point_id)
-                else:
-                    self.logger.warning(f"Skipping point '{point_id}' with invalid coordinate data: {coords}")
-            except (ValueError, TypeError) as e:
-                self.logger.warning(f"Error parsing point '{point_elem.get('id', 'N/A')}: {e}. Data: '{point_elem.text}'")
-        self.logger.debug(f"Parsed {len(points)} points from <Pnts>.")
-        return points
-
-    def _parse_faces(self, definition_elem: ET.Element) -> List[Tuple[str, str, str]]:
-        """Parses <Faces> within a <Definition> element."""
         faces = []
-        xpath_faces = "ns:Faces/ns:F" if self._ns else "Faces/F"
-        face_elements = definition_elem.findall(xpath_faces, self._ns)
-        for face_elem in face_elements:
-            try:
-                # Indices are 1-based IDs referring to points in <Pnts>
-                indices = face_elem.text.strip().split()
-                if len(indices) >= 3:
-                    # Assuming the IDs match the point IDs from <Pnts>
-                    # Store as string IDs
-                    p1_id, p2_id, p3_id = indices[0], indices[1], indices[2]
-                    faces.append((p1_id, p2_id, p3_id))
-                else:
-                    self.logger.warning(f"Skipping face with invalid index data: {indices}")
-            except (ValueError, TypeError) as e:
-                self.logger.warning(f"Error parsing face: {e}. Data: '{face_elem.text}'")
-        self.logger.debug(f"Parsed {len(faces)} faces from <Faces>.")
-        return faces
-
-    def _parse_point_groups(self) -> Dict[str, Point3D]:
-        """Parses <CgPoints> elements."""
-        points = {}
-        xpath_cg = ".//ns:CgPoints/ns:CgPoint" if self._ns else ".//CgPoints/CgPoint"
-        point_elements = self._root.findall(xpath_cg, self._ns)
-        for point_elem in point_elements:
-            try:
-                point_id = point_elem.get("name") or point_elem.get("oID") # Use name or oID as ID
-                if point_id is None:
-                     point_id = str(uuid.uuid4()) # Generate if missing
-
-                coords = point_elem.text.strip().split()
-                if len(coords) >= 3:
-                    # Order Y X Z (Northing Easting Elevation)
-                    y, x, z = map(float, coords[:3])
-                    points[point_id] = Point3D(x, y, z, point_id=point_id)
-                else:
-                    self.logger.warning(f"Skipping CgPoint '{point_id}' with invalid coordinate data: {coords}")
-            except (ValueError, TypeError) as e:
-                self.logger.warning(f"Error parsing CgPoint '{point_elem.get('name', 'N/A')}: {e}. Data: '{point_elem.text}'")
-        self.logger.debug(f"Parsed {len(points)} points from <CgPoints>.")
-        return points
+        for text in self._str(texts):
+            indices = text.split()
+            if len(indices) >= 3:
+                faces.append(indices[:3])
+            else:
+                self.logger.warning(f"Skipping face with invalid index data: {indices}")
+        if not faces:
+            return None
+        return LandXMLChunk("faces", surface, _compact_ids(np.array(faces, dtype=str)))
+
+    def _bulk_ids(self, ids: Sequence[Optional[_Text]]) -> np.ndarray:
+        """Point ids of a block as integers when they all are, else as strings."""
+        numeric = _bulk_ints(ids, ndmin=1) if None not in ids else None
+        if numeric is not None and numeric.ndim == 1:
+            return _narrow(numeric)
+        return np.array([i or "" for i in self._str(ids)], dtype=str)
+
+    def _str(self, values: Sequence[Optional[_Text]]) -> List[Optional[str]]:
+        """*values* as text, decoding the bytes found by :meth:`_scan`."""
+        return [v.decode(self._encoding) if isinstance(v, bytes) else v for v in values]
+
+    def _set_points(self, chunks: Sequence[LandXMLChunk]) -> None:
+        self._xyz = np.concatenate([c.values for c in chunks])
+        self._point_ids = _concat_ids([c.ids for c in chunks])
+        self._points = []
+
+    def _face_indices(self, blocks: Sequence[np.ndarray]) -> np.ndarray:
+        """Map face corner point ids to vertex indices, block by block.
+
+        Consecutive integer ids (the usual export) are offset directly;
+        anything else goes through one sorted lookup of the point ids.
+        """
+        faces = np.empty((sum(len(b) for b in blocks), 3), dtype=np.int32)
+        if not len(faces):
+            return faces
+        ids = self._point_ids
+        if not all(b.dtype.kind == ids.dtype.kind for b in blocks):  # numeric on one side only
+            ids = self._point_ids = ids.astype(str)
+            blocks = [b.astype(str) for b in blocks]
+        consecutive = ids.dtype.kind == "i" and np.array_equal(ids, np.arange(ids[0], ids[0] + len(ids)))
+        if not consecutive:
+            order = np.argsort(ids, kind="stable")
+            sorted_ids = ids[order]
+
+        n = skipped = 0
+        missing = []
+        for block in blocks:
+            if consecutive:
+                index = block - ids[0]
+                found = ((index >= 0) & (index < len(ids))).all(axis=1)
+            else:
+                pos = np.searchsorted(sorted_ids, block).clip(0, len(ids) - 1)
+                found = (sorted_ids[pos] == block).all(axis=1)
+                index = order[pos]
+            k = int(found.sum())
+            faces[n:n + k] = index[found]
+            n += k
+            if k < len(block):
+                skipped += len(block) - k
+                missing.extend(block[~found][:5 - len(missing)].tolist())
+        if skipped:
+            self.logger.warning(f"Skipping {skipped} face(s) referencing missing point IDs (e.g. {missing}).")
+        return faces[:n]
+
+
+def _compact_ids(ids: np.ndarray) -> np.ndarray:
+    """Store point ids as integers when they all are (the usual case), else as strings."""
+    try:
+        numeric = ids.astype(np.int64)
+    except (ValueError, OverflowError):
+        return ids
+    # Keep the strings if the integers would not round-trip (e.g. "007")
+    if not np.array_equal(numeric.astype(str), ids):
+        return ids
+    return _narrow(numeric)
+
+
+def _narrow(numeric: np.ndarray) -> np.ndarray:
+    """*numeric* as int32 if it fits, else unchanged."""
+    if numeric.size and np.iinfo(np.int32).min <= numeric.min() and numeric.max() <= np.iinfo(np.int32).max:
+        return numeric.astype(np.int32)
+    return numeric
+
+
+def _bulk_floats(texts: Sequence[_Text]) -> Optional[np.ndarray]:
+    """``(K, 3)`` leading numbers of K texts in one ``np.loadtxt`` call, or None if a row is malformed."""
+    if not texts:
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # "input contained no data"
+            values = np.loadtxt(texts, dtype=np.float64, ndmin=2)
+    except ValueError:
+        return None
+    if len(values) != len(texts) or values.shape[1] < 3:  # blank rows are dropped by loadtxt
+        return None
+    return values[:, :3]
+
+
+def _bulk_ints(texts: Sequence[_Text], ndmin: int) -> Optional[np.ndarray]:
+    """Integers of *texts* (one row each) in one ``np.loadtxt`` call.
+
+    Returns None unless every row holds the same number of integers, all
+    written canonically: "007" must not turn into the id "7".
+    """
+    if not texts:
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            values = np.loadtxt(texts, dtype=np.int64, ndmin=ndmin)
+    except (ValueError, OverflowError):
+        return None
+    if len(values) != len(texts):
+        return None
+    # The texts are as long as the integers' canonical forms only if they are those forms
+    digits = int((np.searchsorted(_POWERS_OF_TEN, np.abs(values), side="right") + 1 + (values < 0)).sum())
+    if digits + (values.size - len(values)) == sum(map(len, texts)):  # single-spaced rows
+        return values
+    joined = (b" " if isinstance(texts[0], bytes) else " ").join(texts)
+    if digits != len(joined) - sum(joined.count(c) for c in _BLANKS[type(joined)]):
+        return None
+    return values
+
+
+class _ScanPatterns(NamedTuple):
+    """Regular expressions used by :meth:`LandXMLParser._scan` for one tag prefix."""
+
+    point_ids: "re.Pattern[bytes]"    # id of <P id="...">
+    point_texts: "re.Pattern[bytes]"  # text of the same elements
+    faces: "re.Pattern[bytes]"        # text of <F ...>
+    other: "re.Pattern[bytes]"        # any other tag, except </P> and </F>
+    closes: Tuple[bytes, bytes]       # </P>, </F>
+
+
+@functools.lru_cache(maxsize=16)
+def _scan_patterns(prefix: str, encoding: str) -> Optional[_ScanPatterns]:
+    """Patterns for elements written as ``<{prefix}P>``, or None if *encoding* is not ASCII-compatible."""
+    probe = '<>/="\' &!?:.-_09azAZ'
+    try:
+        if probe.encode(encoding) != probe.encode("ascii"):
+            return None
+        p = prefix.encode(encoding)
+    except (LookupError, UnicodeError):
+        return None
+    e = re.escape(p)
+    return _ScanPatterns(
+        point_ids=re.compile(rb'<' + e + rb'P id="([^"]*)">'),
+        point_texts=re.compile(rb'<' + e + rb'P id="[^"]*">([^<]*)'),
+        faces=re.compile(rb'<' + e + rb'F(?:\s(?:[^>"\']|"[^"]*"|\'[^\']*\')*)?(?<!/)>([^<]*)'),
+        other=re.compile(rb'<(?!' + e + rb'P id="|' + e + rb'F[\s>]|/' + e + rb'[PF]>)[^>]*>?'),
+        closes=(b"</" + p + b"P>", b"</" + p + b"F>"),
+    )
+
+
+def _scan_block(patterns: _ScanPatterns, data: bytes, end: int) -> Optional[Tuple[list, list, list]]:
+    """Ids and texts of the <P> and texts of the <F> elements in *data[:end]*.
+
+    *end* is the position of a ``<`` (or the end of *data*), so every
+    element starting before it has its text complete.
+
+    Returns None if *data[:end]* holds anything the patterns could misread:
+    a ``<`` that is not part of a matched element or a harmless tag, a
+    comment, CDATA section or processing instruction, some other spelling of
+    <P>/<F>, or an entity reference outside the other tags.
+    """
+    ids = patterns.point_ids.findall(data, 0, end)
+    faces = patterns.faces.findall(data, 0, end)
+    other = patterns.other.findall(data, 0, end)
+    closes = sum(data.count(c, 0, end) for c in patterns.closes)
+    if data.count(b"<", 0, end) != len(ids) + len(faces) + len(other) + closes:
+        return None
+    if any(_UNSUPPORTED_TAG.match(tag) for tag in other):
+        return None
+    if data.count(b"&", 0, end) != sum(tag.count(b"&") for tag in other):
+        return None
+    return ids, patterns.point_texts.findall(data, 0, end), faces
+
+
+def _concat_ids(blocks: Sequence[np.ndarray]) -> np.ndarray:
+    """Concatenate id blocks, falling back to strings if any block is not numeric."""
+    if all(b.dtype.kind == "i" for b in blocks):
+        return np.concatenate(blocks)
+    return np.concatenate([b.astype(str) for b in blocks])
@@ -0,0 +1,215 @@
+"""artifact_graph.py
+Dependency graph of derived project artifacts with revision-based invalidation.
+
+Every derived result of a project – a layer's surface, the *Lowest*
+composite, a cut/fill grid, a slice table, a mass-haul curve, a report – is a
+node that names the nodes it is computed from.  Each node carries a content
+*revision* that increases only when its value actually changes.  A node
+remembers the revisions of its inputs from its last computation and is stale
+when any of them moved; stale nodes are recomputed lazily, the next time
+their value is requested, and nothing else is touched.  Editing one traced
+layer therefore only invalidates the artifacts downstream of that layer.
+
+Nodes whose value lives outside the graph (traced polylines, surfaces
+installed by the background rebuild, regions) are given a cheap *probe*
+returning a token of that external state; a changed token makes the node
+stale just like a changed input.  An optional *fingerprint* of the computed
+value enables early cut-off: when a recomputation yields identical content,
+the revision is kept and dependants stay valid.
+
+Example
+-------
+>>> graph = ArtifactGraph()
+>>> graph.define("layer:EG", lambda: polylines, probe=lambda: revs["EG"])
+>>> graph.define("surface:EG", build_surface, inputs=["layer:EG"])
+>>> graph.get("surface:EG")       # computed on first request
+>>> revs["EG"] += 1
+>>> graph.is_stale("surface:EG")  # True, recomputed on the next get()
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+__all__ = ["ArtifactGraph", "ArtifactNode", "ArtifactCycleError"]
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class ArtifactCycleError(RuntimeError):
+    """Raised when artifact inputs form a cycle."""
+
+
+@dataclass
+class ArtifactNode:
+    """One derived artifact and the bookkeeping needed to decide staleness."""
+
+    key: str
+    compute: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    probe: Optional[Callable[[], Hashable]] = None
+    fingerprint: Optional[Callable[[Any], Hashable]] = None
+    value: Any = None
+    revision: int = 0
+    seen: Dict[str, int] = field(default_factory=dict)  # input revisions used by `value`
+    token: Any = _UNSET  # probe token recorded with `value`
+    digest: Any = _UNSET  # fingerprint of `value`
+
+    @property
+    def computed(self) -> bool:
+        return self.token is not _UNSET
+
+
+class ArtifactGraph:
+    """Lazily evaluated artifacts keyed by name.
+
+    Keys are plain strings; :class:`~digcalc_project.src.models.project.Project`
+    uses ``"<kind>:<name>"`` keys such as ``"layer:Contours"`` or
+    ``"surface:Existing Surface"``.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, ArtifactNode] = {}
+
+    # ------------------------------------------------------------------
+    # Definition
+    # ------------------------------------------------------------------
+    def define(self, key: str, compute: Callable[..., Any], inputs: Sequence[str] = (),
+               probe: Optional[Callable[[], Hashable]] = None,
+               fingerprint: Optional[Callable[[Any], Hashable]] = None) -> ArtifactNode:
+        """Register (or re-register) the artifact *key*.
+
+        Re-defining a node with the same inputs keeps its cached value and
+        revision, so callers may define nodes idempotently before each use.
+
+        Args:
+            key: Artifact name.
+            compute: Called with the values of *inputs*, in order.
+            inputs: Keys of the artifacts this one is computed from.
+            probe: Returns a token of external state the value depends on.
+            fingerprint: Returns a content hash of a computed value; equal
+                hashes keep the revision unchanged (early cut-off).
+
+        Returns:
+            ArtifactNode: The registered node.
+
+        """
+        inputs = tuple(inputs)
+        node = self._nodes.get(key)
+        if node is not None and node.inputs == inputs:
+            node.compute, node.probe, node.fingerprint = compute, probe, fingerprint
+            return node
+        revision = node.revision if node is not None else 0
+        node = ArtifactNode(key, compute, inputs, probe, fingerprint, revision=revision)
+        self._nodes[key] = node
+        return node
+
+    def discard(self, key: str) -> None:
+        """Forget *key* and its cached value (dependants become stale)."""
+        if self._nodes.pop(key, None) is not None:
+            logger.debug(f"Discarded artifact '{key}'.")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._nodes
+
+    def keys(self) -> List[str]:
+        return list(self._nodes)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def revision(self, key: str) -> int:
+        """Content revision of *key* as of its last computation."""
+        return self._nodes[key].revision
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Cached value of *key* without recomputing it (may be stale)."""
+        node = self._nodes.get(key)
+        return node.value if node is not None and node.computed else default
+
+    def is_stale(self, key: str) -> bool:
+        """True if *key* would be recomputed by :meth:`get`."""
+        return self._is_stale(key, set())
+
+    def stale(self) -> List[str]:
+        """Keys of all stale artifacts."""
+        return [key for key in self._nodes if self.is_stale(key)]
+
+    def downstream(self, key: str) -> Set[str]:
+        """Keys of every artifact computed (directly or transitively) from *key*."""
+        dependants: Dict[str, List[str]] = {}
+        for node in self._nodes.values():
+            for name in node.inputs:
+                dependants.setdefault(name, []).append(node.key)
+        found: Set[str] = set()
+        todo = [key]
+        while todo:
+            for child in dependants.get(todo.pop(), ()):
+                if child not in found:
+                    found.add(child)
+                    todo.append(child)
+        return found
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Any:
+        """Value of *key*, recomputing it and any stale inputs first."""
+        return self._refresh(key, set()).value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value computed outside the graph for the current inputs.
+
+        Inputs are brought up to date first so the recorded revisions match
+        the state *value* was computed from.
+        """
+        node = self._nodes[key]
+        for name in node.inputs:
+            self._refresh(name, {key})
+        self._store(node, value)
+
+    def _refresh(self, key: str, visiting: Set[str]) -> ArtifactNode:
+        if key in visiting:
+            raise ArtifactCycleError(f"Artifact '{key}' depends on itself.")
+        node = self._nodes.get(key)
+        if node is None:
+            raise KeyError(f"Unknown artifact '{key}'.")
+        visiting = visiting | {key}
+        inputs = [self._refresh(name, visiting) for name in node.inputs]
+        if node.computed and not self._changed(node, inputs):
+            return node
+        logger.debug(f"Recomputing artifact '{key}'.")
+        self._store(node, node.compute(*(i.value for i in inputs)))
+        return node
+
+    def _store(self, node: ArtifactNode, value: Any) -> None:
+        digest = node.fingerprint(value) if node.fingerprint is not None and value is not None else _UNSET
+        if not (node.computed and digest is not _UNSET and digest == node.digest):
+            node.revision += 1
+        node.value = value
+        node.digest = digest
+        node.seen = {name: self._nodes[name].revision for name in node.inputs}
+        node.token = node.probe() if node.probe is not None else None
+
+    def _changed(self, node: ArtifactNode, inputs: Sequence[ArtifactNode]) -> bool:
+        if any(node.seen.get(i.key) != i.revision for i in inputs):
+            return True
+        return node.probe is not None and node.probe() != node.token
+
+    def _is_stale(self, key: str, visiting: Set[str]) -> bool:
+        if key in visiting:
+            raise ArtifactCycleError(f"Artifact '{key}' depends on itself.")
+        node = self._nodes[key]
+        if not node.computed:
+            return True
+        visiting = visiting | {key}
+        for name in node.inputs:
+            if name not in self._nodes or self._is_stale(name, visiting):
+                return True
+            if node.seen.get(name) != self._nodes[name].revision:
+                return True
+        return node.probe is not None and node.probe() != node.token
@@ -128,18 +128,14 @@ class VolumeCalculation:
         if self.reference_elevation is None:
             raise ValueError("Reference elevation not set")
 
-        volume = self.base_surface.calculate_volume_to_elevation(self.reference_elevation)
-
-        # Positive volume means the surface is above the reference (cut)
-        # Negative volume means the surface is below the reference (fill)
-        cut_volume = max(0.0, volume)
-        fill_volume = max(0.0, -volume)
+        # Surface above the reference is cut, below it is fill (split per face)
+        volumes = self.base_surface.calculate_volume_to_elevation(self.reference_elevation)
 
         self.results = {
             "total_area": self._calculate_area(),
-            "cut_volume": cut_volume,
-            "fill_volume": fill_volume,
-            "net_volume": volume,
+            "cut_volume": volumes["cut"],
+            "fill_volume": volumes["fill"],
+            "net_volume": volumes["net"],
             "reference_elevation": self.reference_elevation,
         }
 
@@ -173,11 +169,10 @@ class VolumeCalculation:
     def _calculate_tin_differencing(self) -> None:
         """Calculate volume using TIN differencing.
         
-        This method performs triangle-based volumetric calculations.
+        This method performs triangle-based volumetric calculations; the
+        surface-to-surface volume is already an exact TIN overlay.
         """
-        # This would be implemented in a real application
-        self.logger.warning("TIN differencing calculation not implemented")
-        self._calculate_surface_to_surface()  # Fallback
+        self._calculate_surface_to_surface()
 
     def _calculate_area(self) -> float:
         """Calculate the area of the calculation region.
@@ -192,13 +187,12 @@ class VolumeCalculation:
             height = ymax - ymin
             return width * height
         # Use surface bounds
-        surface = self.base_surface
-        if None in (surface.x_min, surface.x_max, surface.y_min, surface.y_max):
+        bounds = self.base_surface.get_bounds()
+        if bounds is None:
             return 0.0
 
-        width = surface.x_max - surface.x_min
-        height = surface.y_max - surface.y_min
-        return width * height
+        xmin, ymin, xmax, ymax = bounds
+        return (xmax - xmin) * (ymax - ymin)
 
     def generate_report(self) -> Dict[str, Any]:
         """Generate a detailed report of the calculation.
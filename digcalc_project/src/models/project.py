@@ -15,8 +15,9 @@ import os
 from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, TypedDict, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict, TYPE_CHECKING
 
+from .artifact_graph import ArtifactGraph
 from .calculation import VolumeCalculation
 from .project_scale import ProjectScale  # NEW Pydantic model
 from .region import Region
@@ -83,6 +84,12 @@ class Project:
     # Dictionary to track revisions of layers (used for surface staleness)
     layer_revisions: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
     # --- END NEW ---
+    # Per-layer IncrementalTin kept between surface rebuilds (not saved); lets a
+    # layer edit re-triangulate only the vertices that changed.
+    layer_tins: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    # Derived results (surfaces, Lowest, dz grids, slices, mass-haul, reports)
+    # with revision-based invalidation; rebuilt lazily, not saved.
+    artifacts: ArtifactGraph = field(default_factory=ArtifactGraph, repr=False, compare=False)
 
     # --- NEW: List of *Layer* objects ------------------------------------------------
     # Stores a flat list of Layer instances used by the project.  Layer objects
@@ -509,6 +516,167 @@ class Project:
             logger.exception(f"Load failed: Unexpected error reading project file '{filename}': {e}")
             return None
 
+    # ------------------------------------------------------------------
+    # Derived artifacts
+    # ------------------------------------------------------------------
+    # Each helper (re)defines a node of ``self.artifacts`` and returns its key;
+    # ``project.artifacts.get(key)`` then computes it, or returns the cached
+    # value when nothing upstream changed.  Nodes chain as
+    # layer -> surface -> Lowest -> dz grid -> slice table / mass-haul -> report.
+
+    LOWEST_SURFACE = "Lowest"
+
+    def layer_artifact(self, layer_name: str) -> str:
+        """Key of the traced polylines of *layer_name*, versioned by ``layer_revisions``."""
+        key = f"layer:{layer_name}"
+        self.artifacts.define(
+            key,
+            lambda: self.traced_polylines.get(layer_name, []),
+            probe=lambda: self.layer_revisions.get(layer_name, 0),
+        )
+        return key
+
+    def surface_artifact(self, surface_name: str) -> str:
+        """Key of the surface *surface_name* as currently installed in the project.
+
+        Surfaces traced from a layer depend on that layer, so editing it marks
+        their dependants stale.  The graph never rebuilds a surface itself: the
+        controller (directly or through its rebuild scheduler) replaces it and
+        the new one is picked up through its id.  Until then the installed
+        surface is returned as is.
+        """
+        if surface_name == self.LOWEST_SURFACE:
+            return self.lowest_artifact()
+        key = f"surface:{surface_name}"
+        surface = self.surfaces.get(surface_name)
+        layer = surface.source_layer_name if surface is not None else None
+        inputs = [self.layer_artifact(layer)] if layer else []
+        self.artifacts.define(
+            key,
+            lambda *_: self.surfaces.get(surface_name),
+            inputs=inputs,
+            probe=lambda: getattr(self.surfaces.get(surface_name), "id", None),
+            fingerprint=lambda surface: surface.fingerprint(),
+        )
+        return key
+
+    def lowest_artifact(self) -> str:
+        """Key of the *Lowest* composite of the design and existing surfaces.
+
+        The composite is a lazy ``minimum(design, existing)`` expression; its
+        elevations are only evaluated where a consumer samples it.  It is not
+        added to ``self.surfaces`` here; the controller installs it.
+        """
+        from ..core.geometry.surface_expression import ExpressionSurface, minimum
+
+        def compute(design: Optional[Surface], existing: Optional[Surface]) -> Optional[Surface]:
+            if design is None or existing is None:
+                return None
+            lowest = ExpressionSurface(self.LOWEST_SURFACE, minimum(design, existing))
+            lowest.metadata["color"] = "yellow"
+            return lowest
+
+        key = "lowest"
+        self.artifacts.define(
+            key,
+            compute,
+            inputs=[self.surface_artifact("Design Surface"), self.surface_artifact("Existing Surface")],
+            fingerprint=lambda surface: surface.fingerprint(),
+        )
+        return key
+
+    def regions_artifact(self) -> str:
+        """Key of the regions and default stripping depth used by volumes."""
+        from ..core.calculations.grid_session import region_state
+        from ..services.settings_service import SettingsService
+
+        key = "regions"
+        self.artifacts.define(
+            key,
+            lambda: list(self.regions),
+            probe=lambda: (region_state(self.regions), SettingsService().strip_depth_default()),
+        )
+        return key
+
+    def volume_artifact(self, existing_name: str, proposed_name: str, grid_resolution: float) -> str:
+        """Key of the grid volume (cut/fill totals and dz grid) between two surfaces.
+
+        The value is the dict returned by
+        :meth:`VolumeCalculator.calculate_grid_method`.
+        """
+        def compute(existing: Optional[Surface], proposed: Optional[Surface], _regions) -> Optional[Dict[str, Any]]:
+            if existing is None or proposed is None:
+                return None
+            return self._volume_calculator().calculate_grid_method(existing, proposed, grid_resolution)
+
+        key = f"dz_grid:{existing_name}|{proposed_name}|{grid_resolution:g}"
+        self.artifacts.define(
+            key,
+            compute,
+            inputs=[self.surface_artifact(existing_name), self.surface_artifact(proposed_name), self.regions_artifact()],
+        )
+        return key
+
+    def slice_artifact(self, existing_name: str, proposed_name: str, grid_resolution: float,
+                       slice_thickness_ft: Optional[float] = None) -> str:
+        """Key of the elevation slice table between two surfaces."""
+        volume_key = self.volume_artifact(existing_name, proposed_name, grid_resolution)
+        existing_key, proposed_key = self.surface_artifact(existing_name), self.surface_artifact(proposed_name)
+
+        def compute(volume: Optional[Dict[str, Any]]) -> Optional[list]:
+            existing, proposed = self.artifacts.peek(existing_key), self.artifacts.peek(proposed_key)
+            if volume is None or existing is None or proposed is None:
+                return None
+            return self._volume_calculator().compute_slice_volumes(
+                existing, proposed, slice_thickness_ft, grid_resolution=grid_resolution)
+
+        key = f"slices:{existing_name}|{proposed_name}|{grid_resolution:g}|{slice_thickness_ft}"
+        self.artifacts.define(key, compute, inputs=[volume_key])
+        return key
+
+    def mass_haul_artifact(self, reference_name: str, difference_name: str,
+                           alignment: Sequence[Tuple[float, float]],
+                           station_interval: float, free_haul_ft: float) -> str:
+        """Key of the mass-haul stations along *alignment* between two surfaces."""
+        from ..core.calculations.mass_haul import build_mass_haul
+
+        points = tuple((float(x), float(y)) for x, y in alignment)
+
+        def compute(reference: Optional[Surface], difference: Optional[Surface]):
+            if reference is None or difference is None:
+                return None
+            from shapely.geometry import LineString
+
+            return build_mass_haul(reference, difference, LineString(points), station_interval, free_haul_ft)
+
+        key = f"mass_haul:{reference_name}|{difference_name}|{station_interval:g}|{free_haul_ft:g}|{hash(points):x}"
+        self.artifacts.define(
+            key,
+            compute,
+            inputs=[self.surface_artifact(reference_name), self.surface_artifact(difference_name)],
+        )
+        return key
+
+    def report_artifact(self, *keys: str) -> str:
+        """Key of the report data assembled from the artifacts *keys*.
+
+        The value maps each key to its current value, so a report is rebuilt
+        only when one of its sections changed.
+        """
+        key = "report:" + "|".join(keys)
+        self.artifacts.define(key, lambda *values: dict(zip(keys, values)), inputs=keys)
+        return key
+
+    def _volume_calculator(self):
+        """Calculator shared by this project's volume artifacts (keeps its grid session)."""
+        calculator = getattr(self, "_artifact_calculator", None)
+        if calculator is None:
+            from ..core.calculations.volume_calculator import VolumeCalculator
+
+            calculator = VolumeCalculator(self)
+            self._artifact_calculator = calculator
+        return calculator
+
     def __repr__(self) -> str:
         """Returns a string representation of the Project."""
         modified_status = "*" if self.is_dirty else ""
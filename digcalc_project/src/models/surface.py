@@ -5,8 +5,13 @@ This module defines the core data models for representing 3D surfaces
 including points, triangles, and surfaces.
 """
 
+import hashlib
+import itertools
 import logging
+import secrets
+import threading
 import uuid
+from collections.abc import ItemsView, Iterator, Mapping, MutableMapping, Sequence, ValuesView
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -16,15 +21,21 @@ logger = logging.getLogger(__name__)
 
 class Point3D:
     """Represents a 3D point with x, y, z coordinates.
-    
+
+    Points are slotted (no per-instance ``__dict__``) and only receive an id
+    when :pyattr:`id` is first read, so building millions of points for a
+    triangulation costs little more than the coordinates themselves.
+
     Attributes:
         x: X coordinate (East)
         y: Y coordinate (North)
         z: Z coordinate (Elevation)
-        id: Unique identifier for the point
+        id: Unique identifier for the point (compact, generated on first use)
 
     """
 
+    __slots__ = ("x", "y", "z", "_id")
+
     def __init__(self, x: float, y: float, z: float, point_id: Optional[str] = None):
         """Initialize a 3D point.
         
@@ -38,7 +49,18 @@ class Point3D:
         self.x = float(x)
         self.y = float(y)
         self.z = float(z)
-        self.id = point_id or str(uuid.uuid4())
+        self._id = point_id or None
+
+    @property
+    def id(self) -> str:
+        """Unique identifier, generated lazily on first access."""
+        if self._id is None:
+            self._id = _new_id()
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = value
 
     def __str__(self) -> str:
         """String representation of the point."""
@@ -87,10 +109,12 @@ class Triangle:
     
     Attributes:
         p1, p2, p3: The three points defining the triangle
-        id: Unique identifier for the triangle
+        id: Unique identifier for the triangle (compact, generated on first use)
 
     """
 
+    __slots__ = ("p1", "p2", "p3", "_id")
+
     logger = logging.getLogger(__name__) # Add logger instance
 
     def __init__(self, p1: Point3D, p2: Point3D, p3: Point3D, triangle_id: Optional[str] = None):
@@ -104,7 +128,18 @@ class Triangle:
         self.p1 = p1
         self.p2 = p2
         self.p3 = p3
-        self.id = triangle_id or str(uuid.uuid4())
+        self._id = triangle_id or None
+
+    @property
+    def id(self) -> str:
+        """Unique identifier, generated lazily on first access."""
+        if self._id is None:
+            self._id = _new_id()
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = value
 
     def __str__(self) -> str:
         """String representation of the triangle."""
@@ -119,12 +154,8 @@ class Triangle:
         if not isinstance(other, Triangle):
             return False
 
-        # Get sets of points from both triangles
-        self_points = {self.p1, self.p2, self.p3}
-        other_points = {other.p1, other.p2, other.p3}
-
-        # Check if they have the same set of points
-        return self_points == other_points
+        # Same corner points (by id) in any order
+        return sorted((self.p1.id, self.p2.id, self.p3.id)) == sorted((other.p1.id, other.p2.id, other.p3.id))
 
     def __hash__(self) -> int:
         """Hash for triangle (based on ID)."""
@@ -191,13 +222,160 @@ class Triangle:
         return cls(p1, p2, p3, data.get("id"))
 
 
+class _PointValues(ValuesView):
+    """Iterate a surface's vertices as :class:`Point3D` objects, row by row."""
+
+    def __iter__(self) -> Iterator[Point3D]:
+        surface = self._mapping._surface
+        ids = surface._ensure_point_ids()
+        for pid, (x, y, z) in zip(ids, surface.vertices.tolist()):
+            yield Point3D(x, y, z, point_id=pid)
+
+
+class _PointItems(ItemsView):
+    """Iterate ``(point_id, Point3D)`` pairs without per-key lookups."""
+
+    def __iter__(self) -> Iterator[Tuple[str, Point3D]]:
+        surface = self._mapping._surface
+        ids = surface._ensure_point_ids()
+        for pid, (x, y, z) in zip(ids, surface.vertices.tolist()):
+            yield pid, Point3D(x, y, z, point_id=pid)
+
+
+class _TriangleValues(ValuesView):
+    """Iterate a surface's faces as :class:`Triangle` objects.
+
+    Vertices are materialised once so triangles sharing a vertex also share
+    the same :class:`Point3D` instance.
+    """
+
+    def __iter__(self) -> Iterator[Triangle]:
+        surface = self._mapping._surface
+        points = list(surface.points.values())
+        tids = surface._ensure_triangle_ids()
+        for tid, (a, b, c) in zip(tids, surface.faces.tolist()):
+            yield Triangle(points[a], points[b], points[c], triangle_id=tid)
+
+
+class _TriangleItems(ItemsView):
+    """Iterate ``(triangle_id, Triangle)`` pairs sharing materialised vertices."""
+
+    def __iter__(self) -> Iterator[Tuple[str, Triangle]]:
+        for tri in _TriangleValues(self._mapping):
+            yield tri.id, tri
+
+
+class PointsView(MutableMapping):
+    """Dict-style ``{point_id: Point3D}`` view over a surface's vertex array.
+
+    :class:`Point3D` objects are built on access; the ``(N, 3)`` array owned
+    by the :class:`Surface` stays the single source of truth.  Assigning or
+    deleting through the view writes straight back into that array.
+    """
+
+    __slots__ = ("_surface",)
+
+    def __init__(self, surface: "Surface"):
+        self._surface = surface
+
+    def __len__(self) -> int:
+        return self._surface._point_count()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._surface._ensure_point_ids())
+
+    def __contains__(self, point_id: object) -> bool:
+        return point_id in self._surface._point_lookup()
+
+    def __getitem__(self, point_id: str) -> Point3D:
+        idx = self._surface._point_lookup()[point_id]
+        x, y, z = self._surface.vertices[idx].tolist()
+        return Point3D(x, y, z, point_id=point_id)
+
+    def __setitem__(self, point_id: str, point: Point3D) -> None:
+        self._surface._put_point(point_id, point)
+
+    def __delitem__(self, point_id: str) -> None:
+        idx = self._surface._point_lookup()[point_id]
+        self._surface._remove_points(np.array([idx]))
+
+    def clear(self) -> None:
+        self._surface.set_arrays(np.empty((0, 3), dtype=np.float64))
+
+    def values(self) -> _PointValues:
+        return _PointValues(self)
+
+    def items(self) -> _PointItems:
+        return _PointItems(self)
+
+    def __repr__(self) -> str:
+        return f"PointsView({len(self)} points)"
+
+
+class TrianglesView(MutableMapping):
+    """Dict-style ``{triangle_id: Triangle}`` view over a surface's face array.
+
+    Adding a :class:`Triangle` whose vertices are not yet on the surface adds
+    them first, mirroring :meth:`Surface.add_triangle`.
+    """
+
+    __slots__ = ("_surface",)
+
+    def __init__(self, surface: "Surface"):
+        self._surface = surface
+
+    def __len__(self) -> int:
+        return self._surface._n_faces
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._surface._ensure_triangle_ids())
+
+    def __contains__(self, triangle_id: object) -> bool:
+        return triangle_id in self._surface._triangle_lookup()
+
+    def __getitem__(self, triangle_id: str) -> Triangle:
+        row = self._surface._triangle_lookup()[triangle_id]
+        a, b, c = self._surface.faces[row].tolist()
+        points = self._surface.points
+        ids = self._surface._ensure_point_ids()
+        return Triangle(points[ids[a]], points[ids[b]], points[ids[c]], triangle_id=triangle_id)
+
+    def __setitem__(self, triangle_id: str, triangle: Triangle) -> None:
+        self._surface._put_triangle(triangle_id, triangle)
+
+    def __delitem__(self, triangle_id: str) -> None:
+        row = self._surface._triangle_lookup()[triangle_id]
+        self._surface._remove_faces(np.array([row]))
+
+    def clear(self) -> None:
+        self._surface._set_faces(np.empty((0, 3), dtype=np.int32))
+
+    def values(self) -> _TriangleValues:
+        return _TriangleValues(self)
+
+    def items(self) -> _TriangleItems:
+        return _TriangleItems(self)
+
+    def __repr__(self) -> str:
+        return f"TrianglesView({len(self)} triangles)"
+
+
 class Surface:
     """Represents a 3D surface composed of points and triangles.
-    
+
+    Geometry is stored column-wise: :pyattr:`vertices` is an ``(N, 3)``
+    ``float64`` array and :pyattr:`faces` an ``(M, 3)`` ``int32`` array of
+    vertex indices.  The historical dict-style :pyattr:`points` and
+    :pyattr:`triangles` attributes are lazy views over those arrays, so
+    existing callers keep working while numeric code reads the arrays
+    without copying.
+
     Attributes:
         name: Name of the surface
-        points: Dictionary of points in the surface
-        triangles: Dictionary of triangles in the surface
+        points: Dict-style view of the surface points keyed by point id
+        triangles: Dict-style view of the surface triangles keyed by triangle id
+        vertices: ``(N, 3)`` array of x, y, z coordinates
+        faces: ``(M, 3)`` array of indices into :pyattr:`vertices`
         metadata: Additional metadata about the surface
         source_layer_name: Optional source layer name
         source_layer_revision: Optional source layer revision
@@ -212,8 +390,8 @@ class Surface:
     def __init__(
         self,
         name: str,
-        points: Optional[Dict[str, Point3D]] = None,
-        triangles: Optional[Dict[str, Triangle]] = None,
+        points: Optional[Mapping[str, Point3D]] = None,
+        triangles: Optional[Mapping[str, Triangle]] = None,
         source_layer_name: Optional[str] = None,
         source_layer_revision: Optional[int] = None,
     ):
@@ -228,17 +406,266 @@ class Surface:
 
         """
         self.name = name
-        self.points: Dict[str, Point3D] = points if points is not None else {}
-        self.triangles: Dict[str, Triangle] = triangles if triangles is not None else {}
+        self._reset_storage()
+        if points:
+            self.points = points
+        if triangles:
+            self.triangles = triangles
         self.id = str(uuid.uuid4())
         self.metadata: Dict[str, Any] = {}
+        # Legacy uuid -> compact id, filled when an old project is loaded
+        self.legacy_id_map: Dict[str, str] = {}
         self.source_layer_name = source_layer_name
         self.source_layer_revision = source_layer_revision
         self.is_stale = False
 
     def __str__(self) -> str:
         """String representation of the surface."""
-        return f"Surface({self.name}, {len(self.points)} points, {len(self.triangles)} triangles)"
+        return f"Surface({self.name}, {self._point_count()} points, {self._n_faces} triangles)"
+
+    # ------------------------------------------------------------------
+    # Array storage
+    # ------------------------------------------------------------------
+    # Grid surfaces keep only their raster until vertices are asked for.
+    # ``_raster_backed``: the raster is the authoritative geometry;
+    # ``_grid_pending``: its vertices have not been materialised yet.
+    _raster_backed = False
+    _grid_pending = False
+
+    @property
+    def _n_points(self) -> int:
+        if self._grid_pending:
+            self._materialize_grid()
+        return self._n_vertices
+
+    @_n_points.setter
+    def _n_points(self, value: int) -> None:
+        self._n_vertices = value
+
+    def _point_count(self) -> int:
+        """Number of vertices, counted on the raster for unmaterialised grids."""
+        if self._grid_pending:
+            return int(np.count_nonzero(~np.isnan(self.grid_data)))
+        return self._n_vertices
+
+    def _reset_storage(self) -> None:
+        """Drop all geometry and the id bookkeeping that goes with it."""
+        self._grid_pending = False
+        self._vertex_buf = np.empty((0, 3), dtype=np.float64)
+        self._n_points = 0
+        self._face_buf = np.empty((0, 3), dtype=np.int32)
+        self._n_faces = 0
+        # Ids are generated lazily; ``None`` means "not needed yet".
+        self._point_ids: Optional[List[str]] = None
+        self._triangle_ids: Optional[List[str]] = None
+        self._point_index: Optional[Dict[str, int]] = None
+        self._triangle_index: Optional[Dict[str, int]] = None
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """``(N, 3)`` float64 array of vertex coordinates (zero-copy view)."""
+        n = self._n_points  # materialises a pending grid first
+        return self._vertex_buf[:n]
+
+    @property
+    def faces(self) -> np.ndarray:
+        """``(M, 3)`` int32 array of vertex indices per triangle (zero-copy view)."""
+        return self._face_buf[: self._n_faces]
+
+    @property
+    def points(self) -> PointsView:
+        """Dict-style view of the surface points keyed by point id."""
+        return PointsView(self)
+
+    @points.setter
+    def points(self, points: Mapping[str, Point3D]) -> None:
+        ids = list(points.keys()) if points else []
+        coords = np.fromiter(
+            itertools.chain.from_iterable((p.x, p.y, p.z) for p in points.values()) if ids else (),
+            dtype=np.float64,
+            count=3 * len(ids),
+        ).reshape(-1, 3)
+        self.set_arrays(coords, point_ids=ids)
+
+    @property
+    def triangles(self) -> TrianglesView:
+        """Dict-style view of the surface triangles keyed by triangle id."""
+        return TrianglesView(self)
+
+    @triangles.setter
+    def triangles(self, triangles: Mapping[str, Triangle]) -> None:
+        items = list(triangles.items()) if triangles else []
+        self._set_faces(np.empty((0, 3), dtype=np.int32))
+        rows = np.array(
+            [[self._index_for_point(p) for p in tri.get_points()] for _, tri in items],
+            dtype=np.int32,
+        ).reshape(-1, 3)
+        self._append_faces(rows, [tid for tid, _ in items])
+
+    def set_arrays(
+        self,
+        vertices: np.ndarray,
+        faces: Optional[np.ndarray] = None,
+        point_ids: Optional[Sequence[str]] = None,
+        triangle_ids: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Replace the surface geometry with *vertices* and optional *faces*.
+
+        Args:
+            vertices: ``(N, 3)`` array-like of x, y, z coordinates.
+            faces: Optional ``(M, 3)`` array-like of indices into *vertices*.
+            point_ids: Optional ids for the vertices; generated on demand if omitted.
+            triangle_ids: Optional ids for the faces; generated on demand if omitted.
+
+        Raises:
+            ValueError: If the arrays have the wrong shape or faces reference
+                vertices that do not exist.
+
+        """
+        verts = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 3)
+        tris = np.empty((0, 3), dtype=np.int32) if faces is None else np.asarray(faces)
+        tris = np.ascontiguousarray(tris, dtype=np.int32).reshape(-1, 3)
+        if tris.size and (tris.min() < 0 or tris.max() >= len(verts)):
+            raise ValueError("Face indices reference vertices outside the vertex array.")
+        if point_ids is not None and len(point_ids) != len(verts):
+            raise ValueError("point_ids must have one entry per vertex.")
+        if triangle_ids is not None and len(triangle_ids) != len(tris):
+            raise ValueError("triangle_ids must have one entry per face.")
+
+        self._reset_storage()
+        self._raster_backed = False
+        self._vertex_buf = verts
+        self._n_points = len(verts)
+        self._point_ids = list(point_ids) if point_ids is not None else None
+        self._face_buf = tris
+        self._n_faces = len(tris)
+        self._triangle_ids = list(triangle_ids) if triangle_ids is not None else None
+
+    def _set_faces(self, faces: np.ndarray, triangle_ids: Optional[Sequence[str]] = None) -> None:
+        """Replace only the face array, keeping vertices untouched."""
+        self._raster_backed = False
+        self._face_buf = np.ascontiguousarray(faces, dtype=np.int32).reshape(-1, 3)
+        self._n_faces = len(self._face_buf)
+        self._triangle_ids = list(triangle_ids) if triangle_ids is not None else None
+        self._triangle_index = None
+
+    @staticmethod
+    def _grow(buf: np.ndarray, needed: int) -> np.ndarray:
+        """Return *buf* with capacity for at least *needed* rows (amortised doubling)."""
+        if needed <= len(buf):
+            return buf
+        new = np.empty((max(needed, 2 * len(buf), 16), 3), dtype=buf.dtype)
+        new[: len(buf)] = buf
+        return new
+
+    def _append_vertices(self, coords: np.ndarray, ids: Optional[Sequence[str]] = None) -> None:
+        """Append rows to the vertex array, keeping id bookkeeping in sync."""
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        start = self._n_points
+        self._raster_backed = False
+        if ids is not None or self._point_ids is not None:
+            existing = self._ensure_point_ids()
+            new_ids = list(ids) if ids is not None else _new_ids(len(coords))
+            existing.extend(new_ids)
+            if self._point_index is not None:
+                self._point_index.update((pid, start + i) for i, pid in enumerate(new_ids))
+        self._vertex_buf = self._grow(self._vertex_buf, start + len(coords))
+        self._vertex_buf[start : start + len(coords)] = coords
+        self._n_points = start + len(coords)
+
+    def _append_faces(self, rows: np.ndarray, ids: Optional[Sequence[str]] = None) -> None:
+        """Append rows to the face array, keeping id bookkeeping in sync."""
+        rows = np.asarray(rows, dtype=np.int32).reshape(-1, 3)
+        start = self._n_faces
+        self._raster_backed = False
+        if ids is not None or self._triangle_ids is not None:
+            existing = self._ensure_triangle_ids()
+            new_ids = list(ids) if ids is not None else _new_ids(len(rows))
+            existing.extend(new_ids)
+            if self._triangle_index is not None:
+                self._triangle_index.update((tid, start + i) for i, tid in enumerate(new_ids))
+        self._face_buf = self._grow(self._face_buf, start + len(rows))
+        self._face_buf[start : start + len(rows)] = rows
+        self._n_faces = start + len(rows)
+
+    def _ensure_point_ids(self) -> List[str]:
+        """Return the per-vertex id list, generating ids on first use."""
+        if self._point_ids is None:
+            self._point_ids = _new_ids(self._n_points)
+        return self._point_ids
+
+    def _ensure_triangle_ids(self) -> List[str]:
+        """Return the per-face id list, generating ids on first use."""
+        if self._triangle_ids is None:
+            self._triangle_ids = _new_ids(self._n_faces)
+        return self._triangle_ids
+
+    def _point_lookup(self) -> Dict[str, int]:
+        """Return (building lazily) the point id -> row index map."""
+        if self._point_index is None:
+            self._point_index = {pid: i for i, pid in enumerate(self._ensure_point_ids())}
+        return self._point_index
+
+    def _triangle_lookup(self) -> Dict[str, int]:
+        """Return (building lazily) the triangle id -> row index map."""
+        if self._triangle_index is None:
+            self._triangle_index = {tid: i for i, tid in enumerate(self._ensure_triangle_ids())}
+        return self._triangle_index
+
+    def _put_point(self, point_id: str, point: Point3D) -> None:
+        """Insert or overwrite the vertex stored under *point_id*."""
+        idx = self._point_lookup().get(point_id)
+        if idx is None:
+            self._append_vertices(np.array([[point.x, point.y, point.z]]), [point_id])
+        else:
+            self._vertex_buf[idx] = (point.x, point.y, point.z)
+            self._raster_backed = False
+
+    def _index_for_point(self, point: Point3D) -> int:
+        """Return the row of *point* (by id), adding it to the surface if missing."""
+        idx = self._point_lookup().get(point.id)
+        if idx is None:
+            self._append_vertices(np.array([[point.x, point.y, point.z]]), [point.id])
+            idx = self._n_points - 1
+        return idx
+
+    def _put_triangle(self, triangle_id: str, triangle: Triangle) -> None:
+        """Insert or overwrite the face stored under *triangle_id*."""
+        row = [self._index_for_point(p) for p in triangle.get_points()]
+        existing = self._triangle_lookup().get(triangle_id)
+        if existing is None:
+            self._append_faces(np.array([row]), [triangle_id])
+        else:
+            self._face_buf[existing] = row
+
+    def _remove_faces(self, rows: np.ndarray) -> None:
+        """Delete the given face rows."""
+        keep = np.ones(self._n_faces, dtype=bool)
+        keep[rows] = False
+        ids = None
+        if self._triangle_ids is not None:
+            ids = [tid for tid, k in zip(self._triangle_ids, keep.tolist()) if k]
+        self._set_faces(self.faces[keep], ids)
+
+    def _remove_points(self, indices: np.ndarray) -> None:
+        """Delete vertices (and every face that uses them), re-indexing the rest."""
+        keep = np.ones(self._n_points, dtype=bool)
+        keep[indices] = False
+        remap = np.cumsum(keep, dtype=np.int64) - 1
+        faces = self.faces
+        face_keep = keep[faces].all(axis=1) if len(faces) else np.zeros(0, dtype=bool)
+        tri_ids = None
+        if self._triangle_ids is not None:
+            tri_ids = [tid for tid, k in zip(self._triangle_ids, face_keep.tolist()) if k]
+        point_ids = None
+        if self._point_ids is not None:
+            point_ids = [pid for pid, k in zip(self._point_ids, keep.tolist()) if k]
+        self.set_arrays(
+            self.vertices[keep],
+            remap[faces[face_keep]],
+            point_ids=point_ids,
+            triangle_ids=tri_ids,
+        )
 
     def add_point(self, point: Point3D) -> None:
         """Add a point to the surface.
@@ -247,7 +674,7 @@ class Surface:
             point: Point to add
 
         """
-        self.points[point.id] = point
+        self._put_point(point.id, point)
 
     def add_triangle(self, triangle: Triangle) -> None:
         """Add a triangle to the surface.
@@ -256,12 +683,76 @@ class Surface:
             triangle: Triangle to add
 
         """
-        # Make sure all points are in the surface
-        for point in triangle.get_points():
-            if point.id not in self.points:
-                self.add_point(point)
+        # _put_triangle adds any vertices the surface does not have yet
+        self._put_triangle(triangle.id, triangle)
+
+    def fingerprint(self) -> str:
+        """Return a content hash of the vertex coordinates and face indices.
+
+        Two surfaces with identical geometry share a fingerprint regardless of
+        name or ids, so it can key caches of derived data (e.g. interpolators).
+        The hash is recomputed on every call because callers may write into
+        :pyattr:`vertices` in place.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        if self.is_raster:
+            h.update(b"grid")
+            h.update(np.array([self.grid_spacing, *self.grid_origin], dtype=np.float64).tobytes())
+            h.update(np.int64(self.grid_data.shape).tobytes())
+            h.update(np.ascontiguousarray(self.grid_data, dtype=np.float64).tobytes())
+            return h.hexdigest()
+        h.update(np.int64(self._n_points).tobytes())
+        h.update(np.ascontiguousarray(self.vertices).tobytes())
+        h.update(np.int64(self._n_faces).tobytes())
+        h.update(np.ascontiguousarray(self.faces).tobytes())
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Exact TIN volumes
+    # ------------------------------------------------------------------
+    def triangulated_faces(self) -> np.ndarray:
+        """Return the face array, triangulating point-only surfaces on the fly."""
+        if self.is_raster:
+            return self._grid_faces()
+        if self._n_faces or self._n_points < 3:
+            return self.faces
+        from ..core.calculations.tin_volume import triangulate_points
+
+        return triangulate_points(self.vertices)
+
+    def calculate_volume_to_elevation(self, elevation: float) -> Dict[str, float]:
+        """Exact volume between this surface and a horizontal plane.
+
+        Args:
+            elevation: Elevation of the reference plane.
+
+        Returns:
+            Dict with 'cut' (surface above the plane), 'fill' (surface below
+            the plane) and 'net' (cut - fill).
+
+        """
+        from ..core.calculations.tin_volume import volumes_to_plane
+
+        above, below = volumes_to_plane(self.vertices, self.triangulated_faces(), elevation)
+        return {"cut": above, "fill": below, "net": above - below}
+
+    def calculate_volume_to_surface(self, other: "Surface") -> Dict[str, float]:
+        """Exact volume between this (base) surface and *other* over their overlap.
 
-        self.triangles[triangle.id] = triangle
+        Args:
+            other: Comparison surface.
+
+        Returns:
+            Dict with 'cut' (base above *other*), 'fill' (*other* above base)
+            and 'net' (fill - cut).
+
+        """
+        from ..core.calculations.tin_volume import volumes_between_tins
+
+        cut, fill = volumes_between_tins(
+            self.vertices, self.triangulated_faces(), other.vertices, other.triangulated_faces()
+        )
+        return {"cut": cut, "fill": fill, "net": fill - cut}
 
     # ------------------------------------------------------------------
     # Grid-surface helpers
@@ -278,41 +769,130 @@ class Surface:
         Y directions, with the *origin* tuple giving the lower-left (x, y)
         coordinate of the [0, 0] grid cell.
 
-        The method populates ``self.points`` so that grid-based Surfaces can be
-        used interchangeably with TIN-based ones elsewhere in the application.
+        Only the raster is kept.  Bounds, elevation range, sampling and
+        volumes read it directly; the vertex array (one vertex per non-NaN
+        cell, row-major) and point views are produced only when something
+        asks for :pyattr:`vertices` or :pyattr:`points`, so grid-based
+        Surfaces stay interchangeable with TIN-based ones elsewhere in the
+        application.
 
         Args:
             grid_data: 2-D ``numpy.ndarray`` of elevations. ``np.nan`` values are
-                ignored (no Point3D generated).
+                ignored (no vertex generated).
             spacing:  Grid spacing in same X/Y units as the coordinates.
             origin:   Tuple ``(x0, y0)`` for the gridʼs south-west corner.
 
         """
-        # Import here to avoid mandatory numpy dependency for all modules.
-        # import numpy as np # Removed import from here
-
+        grid_data = np.asarray(grid_data, dtype=np.float64)
+        if grid_data.ndim != 2:
+            raise ValueError("grid_data must be a 2-D array.")
+        self._reset_storage()
         self.grid_data = grid_data
         self.grid_spacing = float(spacing)
-        self.grid_origin = origin
-
-        # Rebuild the points dict so that existing algorithms that iterate over
-        # :pyattr:`points` continue to function.
-        self.points.clear()
-        rows, cols = grid_data.shape
-        x0, y0 = origin
-        for r in range(rows):
-            for c in range(cols):
-                z = grid_data[r, c]
-                if np.isnan(z):
-                    continue  # Skip empty cells
-                x = x0 + c * spacing
-                y = y0 + r * spacing
-                p = Point3D(x=x, y=y, z=float(z))
-                self.points[p.id] = p
+        self.grid_origin = (float(origin[0]), float(origin[1]))
+        self._raster_backed = True
+        self._grid_pending = True
+
+    @property
+    def is_raster(self) -> bool:
+        """True while the surface geometry is its :pyattr:`grid_data` raster."""
+        return self._raster_backed and self.grid_data is not None
+
+    def _materialize_grid(self) -> None:
+        """Build the vertex array from the raster (row-major over non-NaN cells)."""
+        self._grid_pending = False
+        x0, y0 = self.grid_origin
+        rows, cols = np.nonzero(~np.isnan(self.grid_data))
+        self._vertex_buf = np.column_stack((
+            x0 + cols * self.grid_spacing, y0 + rows * self.grid_spacing, self.grid_data[rows, cols],
+        ))
+        self._n_points = len(rows)
+        logger.debug(f"Materialised {len(rows)} vertices for grid surface '{self.name}'.")
+
+    def _grid_faces(self) -> np.ndarray:
+        """Two triangles per grid cell whose four corners all have data."""
+        valid = ~np.isnan(self.grid_data)
+        index = np.full(self.grid_data.shape, -1, dtype=np.int64)
+        index[valid] = np.arange(np.count_nonzero(valid))
+        sw, se, nw, ne = index[:-1, :-1], index[:-1, 1:], index[1:, :-1], index[1:, 1:]
+        full = (sw >= 0) & (se >= 0) & (nw >= 0) & (ne >= 0)
+        sw, se, nw, ne = sw[full], se[full], nw[full], ne[full]
+        faces = np.empty((2 * len(sw), 3), dtype=np.int32)
+        faces[0::2] = np.column_stack((sw, se, ne))
+        faces[1::2] = np.column_stack((sw, ne, nw))
+        return faces
+
+    def sample_grid(self, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+        """Bilinearly sample the raster at the nodes of a ``gx`` × ``gy`` grid.
+
+        Args:
+            gx: 1-D X coordinates (columns).
+            gy: 1-D Y coordinates (rows).
+
+        Returns:
+            np.ndarray: ``(len(gy), len(gx))`` elevations, ``NaN`` outside the
+            raster or where a contributing corner is ``NaN``.
+
+        Raises:
+            ValueError: If the surface is not raster-backed.
+
+        """
+        if not self.is_raster:
+            raise ValueError(f"Surface '{self.name}' has no raster to sample.")
+        grid, (x0, y0), step = self.grid_data, self.grid_origin, self.grid_spacing
+        n_rows, n_cols = grid.shape
+
+        def axis(coords: np.ndarray, origin: float, n: int):
+            t = (np.asarray(coords, dtype=np.float64) - origin) / step
+            inside = (t >= 0) & (t <= n - 1)
+            i0 = np.clip(np.floor(t).astype(np.int64), 0, max(n - 2, 0))
+            frac = np.where(n > 1, t - i0, 0.0)
+            return i0, np.minimum(i0 + 1, n - 1), frac, inside
+
+        c0, c1, fx, in_x = axis(gx, x0, n_cols)
+        r0, r1, fy, in_y = axis(gy, y0, n_rows)
+        fx, fy = fx[None, :], fy[:, None]
+        z = np.zeros((len(r0), len(c0)))
+        for rows, cols, weight in ((r0, c0, (1 - fx) * (1 - fy)), (r0, c1, fx * (1 - fy)),
+                                   (r1, c0, (1 - fx) * fy), (r1, c1, fx * fy)):
+            # Corners with zero weight do not count, so nodes sample exactly
+            # even when a neighbouring cell is NaN
+            z += np.where(weight > 0, grid[np.ix_(rows, cols)] * weight, 0.0)
+        z[~(in_y[:, None] & in_x[None, :])] = np.nan
+        return z
 
     # ------------------------------------------------------------------
     # Alternate constructors
     # ------------------------------------------------------------------
+    @classmethod
+    def from_arrays(
+        cls,
+        name: str,
+        vertices: np.ndarray,
+        faces: Optional[np.ndarray] = None,
+        point_ids: Optional[Sequence[str]] = None,
+        source_layer_name: Optional[str] = None,
+        source_layer_revision: Optional[int] = None,
+    ) -> "Surface":
+        """Build a surface directly from vertex and face arrays.
+
+        Args:
+            name:      Name for the new surface.
+            vertices:  ``(N, 3)`` array-like of x, y, z coordinates.
+            faces:     Optional ``(M, 3)`` array-like of vertex indices.
+            point_ids: Optional ids for the vertices (e.g. from an importer).
+            source_layer_name:     Optional source layer name.
+            source_layer_revision: Optional source layer revision.
+
+        """
+        surf = cls(
+            name=name,
+            source_layer_name=source_layer_name,
+            source_layer_revision=source_layer_revision,
+        )
+        surf.set_arrays(vertices, faces, point_ids=point_ids)
+        return surf
+
     @classmethod
     def from_point_list(
         cls,
@@ -333,12 +913,7 @@ class Surface:
                      hinting.
 
         """
-        pts_dict: Dict[str, Point3D] = {}
-        for x, y, z in points:
-            p = Point3D(x=float(x), y=float(y), z=float(z))
-            pts_dict[p.id] = p
-
-        surf = cls(name=name, points=pts_dict)
+        surf = cls.from_arrays(name, np.asarray(points, dtype=np.float64).reshape(-1, 3))
         if spacing is not None:
             surf.grid_spacing = float(spacing)
         if color is not None:
@@ -352,16 +927,20 @@ class Surface:
             Tuple (xmin, ymin, xmax, ymax) or None if surface is empty
 
         """
-        if not self.points:
+        if self.is_raster:
+            valid = ~np.isnan(self.grid_data)
+            rows, cols = np.flatnonzero(valid.any(axis=1)), np.flatnonzero(valid.any(axis=0))
+            if not len(rows):
+                return None
+            (x0, y0), step = self.grid_origin, self.grid_spacing
+            return (float(x0 + cols[0] * step), float(y0 + rows[0] * step),
+                    float(x0 + cols[-1] * step), float(y0 + rows[-1] * step))
+        if not self._n_points:
             return None
 
-        # Get min/max x and y values
-        points_list = list(self.points.values())
-        xmin = min(p.x for p in points_list)
-        ymin = min(p.y for p in points_list)
-        xmax = max(p.x for p in points_list)
-        ymax = max(p.y for p in points_list)
-
+        xy = self.vertices[:, :2]
+        xmin, ymin = xy.min(axis=0).tolist()
+        xmax, ymax = xy.max(axis=0).tolist()
         return (xmin, ymin, xmax, ymax)
 
     def get_elevation_range(self) -> Optional[Tuple[float, float]]:
@@ -371,14 +950,15 @@ class Surface:
             Tuple (zmin, zmax) or None if surface is empty
 
         """
-        if not self.points:
+        if self.is_raster:
+            if np.isnan(self.grid_data).all():
+                return None
+            return (float(np.nanmin(self.grid_data)), float(np.nanmax(self.grid_data)))
+        if not self._n_points:
             return None
 
-        points_list = list(self.points.values())
-        zmin = min(p.z for p in points_list)
-        zmax = max(p.z for p in points_list)
-
-        return (zmin, zmax)
+        z = self.vertices[:, 2]
+        return (float(z.min()), float(z.max()))
 
     # --- Convenience elevation properties ---------------------------------
     @property
@@ -395,12 +975,21 @@ class Surface:
 
     def to_dict(self) -> Dict[str, Any]:
         """Serializes the surface to a dictionary."""
+        point_ids = self._ensure_point_ids()
+        point_dicts = [
+            {"x": x, "y": y, "z": z, "id": pid}
+            for pid, (x, y, z) in zip(point_ids, self.vertices.tolist())
+        ]
+        triangles = {
+            tid: {"p1": point_dicts[a], "p2": point_dicts[b], "p3": point_dicts[c], "id": tid}
+            for tid, (a, b, c) in zip(self._ensure_triangle_ids(), self.faces.tolist())
+        }
         surface_dict = {
             "name": self.name,
             "surface_type": self.SURFACE_TYPE_TIN,
             "id": self.id,
-            "points": {pid: p.to_dict() for pid, p in self.points.items()},
-            "triangles": {tid: t.to_dict() for tid, t in self.triangles.items()},
+            "points": {pd["id"]: pd for pd in point_dicts},
+            "triangles": triangles,
             "metadata": self.metadata,
             "source_layer_name": self.source_layer_name,
             "source_layer_revision": self.source_layer_revision,
@@ -410,64 +999,126 @@ class Surface:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Surface":
         """Deserializes a surface from a dictionary, handling legacy list format for points."""
-        # Deserialize points first
-        points_dict: Dict[str, Point3D] = {}
+        name = data.get("name", "Unknown")
+        point_ids: List[str] = []
+        coords: List[Tuple[float, float, float]] = []
         points_data = data.get("points", {})
 
         # --- Handle legacy list format for points ---
         if isinstance(points_data, list):
-            logger.warning(f"Loading legacy surface '{data.get('name', 'Unknown')}' with list of points.")
-            # Assume list contains point data dicts, generate IDs if missing
+            logger.warning(f"Loading legacy surface '{name}' with list of points.")
             for i, p_data in enumerate(points_data):
                 if isinstance(p_data, dict):
-                    # Point3D.from_dict should handle potentially missing 'id'
-                    point = Point3D.from_dict(p_data)
-                    # Use point's internal ID if generated, otherwise use index as fallback key
-                    pid = point.id if point.id else str(i)
-                    points_dict[pid] = point
+                    point_ids.append(p_data.get("id") or _new_id())
+                    coords.append((float(p_data["x"]), float(p_data["y"]), float(p_data["z"])))
                 else:
                     logger.warning(f"Skipping invalid point data in list at index {i}: {p_data}")
         elif isinstance(points_data, dict):
-             # --- Standard dictionary format ---
-             for pid, p_data in points_data.items():
-                  points_dict[pid] = Point3D.from_dict(p_data)
-        else:
-             logger.error(f"Invalid format for points data in surface '{data.get('name', 'Unknown')}': {type(points_data)}")
-             # Proceed with empty points dict? Or raise error?
-             # Let's proceed with empty for now.
-
-        # Deserialize triangles, linking to points
-        triangles_dict: Dict[str, Triangle] = {}
-        triangles_data = data.get("triangles", {})
-
-        # --- Handle legacy list format for triangles ---
-        if isinstance(triangles_data, list):
-            logger.warning(f"Loading legacy surface '{data.get('name', 'Unknown')}' with list of triangles.")
-            # Assume list contains triangle data dicts
-            for i, t_data in enumerate(triangles_data):
-                if isinstance(t_data, dict):
-                    # Triangle.from_dict should handle potentially missing 'id' and use points_dict
-                    triangle = Triangle.from_dict(t_data, points_dict)
-                    # Use triangle's internal ID if generated, otherwise use index as fallback key
-                    tid = triangle.id if triangle.id else str(i)
-                    triangles_dict[tid] = triangle
-                else:
-                    logger.warning(f"Skipping invalid triangle data in list at index {i}: {t_data}")
-        elif isinstance(triangles_data, dict):
-             # --- Standard dictionary format ---
-             for tid, t_data in triangles_data.items():
-                  triangles_dict[tid] = Triangle.from_dict(t_data, points_dict)
+            # --- Standard dictionary format ---
+            for pid, p_data in points_data.items():
+                point_ids.append(pid)
+                coords.append((float(p_data["x"]), float(p_data["y"]), float(p_data["z"])))
         else:
-             logger.error(f"Invalid format for triangles data in surface '{data.get('name', 'Unknown')}': {type(triangles_data)}")
-             # Proceed with empty triangles dict.
+            logger.error(f"Invalid format for points data in surface '{name}': {type(points_data)}")
+            # Proceed with empty points.
 
-        # Create the Surface instance
         surface = cls(
             name=data.get("name", "Unnamed Surface"),
-            points=points_dict,
-            triangles=triangles_dict,
             source_layer_name=data.get("source_layer_name"),
             source_layer_revision=data.get("source_layer_revision"),
         )
+        surface.set_arrays(np.array(coords, dtype=np.float64).reshape(-1, 3), point_ids=point_ids)
+
+        # Deserialize triangles, linking to points by id
+        triangles_data = data.get("triangles", {})
+        if isinstance(triangles_data, list):
+            logger.warning(f"Loading legacy surface '{name}' with list of triangles.")
+            tri_items = [(t.get("id") if isinstance(t, dict) else None, t) for t in triangles_data]
+        elif isinstance(triangles_data, dict):
+            tri_items = list(triangles_data.items())
+        else:
+            logger.error(f"Invalid format for triangles data in surface '{name}': {type(triangles_data)}")
+            tri_items = []
+
+        rows: List[List[int]] = []
+        tri_ids: List[str] = []
+        for i, (tid, t_data) in enumerate(tri_items):
+            if not isinstance(t_data, dict):
+                logger.warning(f"Skipping invalid triangle data in list at index {i}: {t_data}")
+                continue
+            try:
+                rows.append([surface._resolve_point_ref(t_data[key]) for key in ("p1", "p2", "p3")])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping triangle {tid or i} in surface '{name}': {e}")
+                continue
+            tri_ids.append(tid or _new_id())
+        surface._append_faces(np.array(rows, dtype=np.int32).reshape(-1, 3), tri_ids)
+        migrated = surface.migrate_legacy_ids()
+        if migrated:
+            logger.info(f"Migrated {len(migrated)} legacy uuid ids in surface '{name}' to compact ids.")
         # is_stale is handled during project load
         return surface
+
+    def migrate_legacy_ids(self) -> Dict[str, str]:
+        """Replace uuid-style point/triangle ids from older projects with compact ids.
+
+        The old -> new mapping is returned and also kept (unsaved) in
+        :pyattr:`legacy_id_map` so callers still holding an old id can
+        translate it.
+
+        Returns:
+            Dict mapping each replaced legacy id to its new id.
+
+        """
+        mapping: Dict[str, str] = {}
+        for ids in (self._point_ids, self._triangle_ids):
+            if not ids:
+                continue
+            legacy = [i for i, value in enumerate(ids) if is_legacy_id(value)]
+            for i, new in zip(legacy, _new_ids(len(legacy))):
+                mapping[ids[i]] = new
+                ids[i] = new
+        if mapping:
+            self._point_index = None
+            self._triangle_index = None
+            self.legacy_id_map.update(mapping)
+        return mapping
+
+    def _resolve_point_ref(self, p_data: Dict[str, Any]) -> int:
+        """Map a serialized triangle corner to a vertex row, adding it if unknown."""
+        pid = p_data.get("id")
+        idx = self._point_lookup().get(pid) if pid else None
+        if idx is None:
+            if not pid:
+                logger.warning("Triangle corner without point id during deserialization. Creating new point.")
+            point = Point3D.from_dict(p_data)
+            idx = self._index_for_point(point)
+        return idx
+
+
+# Compact ids: a random per-process prefix plus a hexadecimal counter, e.g.
+# ``"3fa85f64.1a2b"``.  The prefix keeps ids from different sessions (and
+# therefore from saved projects) apart; the counter keeps them short.
+_ID_PREFIX = f"{secrets.randbits(32):08x}."
+_id_lock = threading.Lock()
+_id_next = 0
+
+
+def _new_ids(count: int) -> List[str]:
+    """Return *count* fresh, compact unique identifiers for points or triangles."""
+    global _id_next
+    with _id_lock:
+        start = _id_next
+        _id_next += count
+    prefix = _ID_PREFIX
+    return [f"{prefix}{i:x}" for i in range(start, start + count)]
+
+
+def _new_id() -> str:
+    """Return one fresh, compact unique identifier for a point or triangle."""
+    return _new_ids(1)[0]
+
+
+def is_legacy_id(value: object) -> bool:
+    """True for the 36-character uuid4 strings older versions used as ids."""
+    return isinstance(value, str) and len(value) == 36 and value.count("-") == 4
@@ -57,6 +57,16 @@ class SettingsService(Singleton):
         # --- NEW: last used scale for PDF calibration ---
         "last_scale_world_units": "ft",
         "last_scale_world_per_in": 20.0,
+        # Memory budget (MB) for cached surface interpolators/triangulations
+        "interpolator_cache_mb": 512,
+        # Working-memory budget (MB) for one tile of the grid volume engine
+        "volume_tile_budget_mb": 256,
+        # Parallel tile workers for grid volumes (0 = all cores, 1 = serial)
+        "volume_workers": 0,
+        "volume_use_processes": False,
+        "volume_session_mb": 1024,
+        # Parallel triangulation workers for rebuilding derived surfaces (0 = all cores)
+        "surface_rebuild_workers": 0,
     }
 
     # ------------------------------------------------------------------
@@ -214,6 +224,63 @@ class SettingsService(Singleton):
         self.set("vertex_line_thickness", int(width))
         self.save()
 
+    # ------------------------------------------------------------------
+    # Volume engine preferences
+    # ------------------------------------------------------------------
+    def interpolator_cache_mb(self) -> int:
+        """Return the memory budget (MB) for cached surface interpolators."""
+        return int(self.get("interpolator_cache_mb", self._defaults["interpolator_cache_mb"]))
+
+    def set_interpolator_cache_mb(self, val: int) -> None:
+        """Persist the interpolator cache memory budget (MB)."""
+        self.set("interpolator_cache_mb", int(val))
+        self.save()
+
+    def volume_tile_budget_mb(self) -> float:
+        """Return the per-tile working-memory budget (MB) for grid volumes."""
+        return float(self.get("volume_tile_budget_mb", self._defaults["volume_tile_budget_mb"]))
+
+    def set_volume_tile_budget_mb(self, val: float) -> None:
+        """Persist the per-tile working-memory budget (MB) for grid volumes."""
+        self.set("volume_tile_budget_mb", float(val))
+        self.save()
+
+    def volume_workers(self) -> int:
+        """Return the number of parallel volume tile workers (0 = all cores)."""
+        return int(self.get("volume_workers", self._defaults["volume_workers"]))
+
+    def set_volume_workers(self, val: int) -> None:
+        """Persist the number of parallel volume tile workers."""
+        self.set("volume_workers", max(int(val), 0))
+        self.save()
+
+    def volume_use_processes(self) -> bool:
+        """Return True if volume tiles run in worker processes instead of threads."""
+        return bool(self.get("volume_use_processes", self._defaults["volume_use_processes"]))
+
+    def set_volume_use_processes(self, flag: bool) -> None:
+        """Persist the process-vs-thread choice for volume tile workers."""
+        self.set("volume_use_processes", bool(flag))
+        self.save()
+
+    def volume_session_mb(self) -> int:
+        """Return the memory budget (MB) for tiles kept between grid volume runs."""
+        return int(self.get("volume_session_mb", self._defaults["volume_session_mb"]))
+
+    def set_volume_session_mb(self, val: int) -> None:
+        """Persist the memory budget for incremental grid volume sessions (MB)."""
+        self.set("volume_session_mb", int(val))
+        self.save()
+
+    def surface_rebuild_workers(self) -> int:
+        """Return the number of parallel surface rebuild workers (0 = all cores)."""
+        return int(self.get("surface_rebuild_workers", self._defaults["surface_rebuild_workers"]))
+
+    def set_surface_rebuild_workers(self, val: int) -> None:
+        """Persist the number of parallel surface rebuild workers."""
+        self.set("surface_rebuild_workers", max(int(val), 0))
+        self.save()
+
     # ------------------------------------------------------------------
     # Spline / smoothing preference helpers …
     # ------------------------------------------------------------------
@@ -15,38 +15,19 @@ def surface_to_polydata(surface):
 
     """
     # ------------------------------------------------------------------
-    # Build point array (handle both list-of-tuples and dict-of-Point3D)
+    # Build point and faces arrays (array-backed Surface or legacy tuples)
     # ------------------------------------------------------------------
-    if isinstance(surface.points, dict):
-        # Assume dict of Point3D instances
-        point_items = list(surface.points.values())
-        pts = np.array([[p.x, p.y, p.z] for p in point_items], dtype=float)
-        id_to_index = {p.id: idx for idx, p in enumerate(point_items)}
+    faces = None
+    if hasattr(surface, "vertices"):
+        # Array-backed Surface: vertex/face arrays are used without copying
+        pts = surface.vertices
+        if len(surface.faces):
+            faces = np.hstack([np.full((len(surface.faces), 1), 3, dtype=np.int64),
+                               surface.faces.astype(np.int64)]).ravel()
     else:
-        # Assume iterable of (x, y, z) tuples
+        # Assume iterable of (x, y, z) tuples and index-triplet triangles
         pts = np.array([[x, y, z] for x, y, z in surface.points], dtype=float)
-        id_to_index = None  # Not needed for tuple-based triangles
-
-    # ------------------------------------------------------------------
-    # Build faces array if triangles are present and reference by objects or indices
-    # ------------------------------------------------------------------
-    faces = None
-    if hasattr(surface, "triangles") and surface.triangles:
-        # If triangles is a dict of Triangle objects
-        first = next(iter(surface.triangles.values()))
-        if hasattr(first, "p1"):
-            # Triangle object path
-            face_list = []
-            for tri in surface.triangles.values():
-                if id_to_index is None:
-                    continue  # Should not happen
-                face_list.extend([3,
-                                  id_to_index.get(tri.p1.id, -1),
-                                  id_to_index.get(tri.p2.id, -1),
-                                  id_to_index.get(tri.p3.id, -1)])
-            faces = np.array(face_list, dtype=int)
-        else:
-            # Assume list/iterable of index triplets
+        if getattr(surface, "triangles", None):
             faces = np.hstack([np.full((len(surface.triangles), 1), 3),
                                np.array(list(surface.triangles))]).ravel()
 
@@ -1,8 +1,9 @@
 import logging
+import threading
 from typing import Dict, List, Optional
 
 # PySide6 imports
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtWidgets import (
     QComboBox,
     QDialog,
@@ -10,6 +11,7 @@ from PySide6.QtWidgets import (
     QFormLayout,
     QLabel,
     QLineEdit,
+    QProgressBar,
     QSizePolicy,
     QSpinBox,
     QVBoxLayout,
@@ -21,12 +23,17 @@ from PySide6.QtWidgets import (
 from ...core.importers.csv_parser import CSVParser
 from ...core.importers.file_parser import (
     FileParser,  # Import base or specific parsers as needed
+    FileParserError,
 )
+from ...core.importers.landxml_index import LandXMLIndex
+from ...core.importers.landxml_parser import LandXMLParser
 
 
 class ImportOptionsDialog(QDialog):
     """Dialog for configuring import options for various file types."""
 
+    _index_ready = Signal(object)  # indexing thread -> GUI thread (LandXMLIndex or error message)
+
     def __init__(self, parent: Optional[QWidget], parser: FileParser, default_name: str, filename: Optional[str] = None):
         super().__init__(parent)
         self.setWindowTitle("Import Options")
@@ -108,6 +115,26 @@ class ImportOptionsDialog(QDialog):
                 # Use textChanged for editable combo box to catch user input
                 self.combo_delimiter.currentTextChanged.connect(self._update_csv_column_options)
 
+        elif isinstance(self.parser, LandXMLParser) and self.filename:
+            # --- LandXML: pick one surface from the file's surface index ---
+            self.combo_surface = QComboBox()
+            self.combo_surface.setToolTip("Select the surface to import from this file.")
+            self.label_surfaces = QLabel()
+            layout.addRow("Surface:", self.combo_surface)
+            layout.addRow(self.label_surfaces)
+            index = self.parser.cached_surface_index(self.filename)
+            if index is not None:
+                self._on_index_ready(index)
+            else:
+                # Indexing reads the whole file: do it off the GUI thread
+                self.combo_surface.setEnabled(False)
+                self.label_surfaces.setText("Indexing surfaces... (the first surface is imported if you continue now)")
+                self.progress_index = QProgressBar()
+                self.progress_index.setRange(0, 0)  # busy indicator
+                layout.addRow(self.progress_index)
+                self._index_ready.connect(self._on_index_ready)
+                threading.Thread(target=self._build_surface_index, name="landxml-index", daemon=True).start()
+
         # Add elif blocks here for other parsers (DXFParser, PDFParser, etc.)
         # elif isinstance(self.parser, DXFParser):
         #     # Add DXF specific options (e.g., layer selection)
@@ -205,6 +232,35 @@ class ImportOptionsDialog(QDialog):
         if not selected_z and len(headers) > 2:
              self.combo_z.setCurrentIndex(2)
 
+    def _build_surface_index(self):
+        """Indexing thread: build (and cache) the file's surface index."""
+        try:
+            result = self.parser.get_surface_index(self.filename)
+        except FileParserError as e:
+            result = str(e)
+        try:
+            self._index_ready.emit(result)
+        except RuntimeError:  # Dialog already destroyed
+            pass
+
+    @Slot(object)
+    def _on_index_ready(self, index):
+        """List the surfaces of *index* (or report why the file could not be indexed)."""
+        progress = getattr(self, "progress_index", None)
+        if progress is not None:
+            progress.hide()
+        if not isinstance(index, LandXMLIndex):
+            self.logger.warning(f"Could not list surfaces of '{self.filename}': {index}")
+            self.label_surfaces.setText(f"Could not list surfaces: {index}")
+            return
+        for entry in index.surfaces:
+            self.combo_surface.addItem(f"{entry.name} ({entry.n_points:,} points, {entry.n_faces:,} faces)",
+                                       entry.name)
+        self.combo_surface.setEnabled(bool(self.combo_surface.count()))
+        self.label_surfaces.setText("" if self.combo_surface.count()
+                                    else "No surfaces found; CgPoints will be imported.")
+        self.label_surfaces.setVisible(not self.combo_surface.count())
+
     def get_options(self) -> Dict:
         """Get the parser-specific options selected by the user."""
         options = {}
@@ -238,6 +294,10 @@ class ImportOptionsDialog(QDialog):
                  self.logger.error("Invalid column selection (missing or error state). Options not fully set.")
                  # Potentially raise an error or return indication of failure?
 
+        elif isinstance(self.parser, LandXMLParser) and getattr(self, "combo_surface", None) is not None:
+            if self.combo_surface.count():
+                options["surface_name"] = self.combo_surface.currentData()
+
         # Add elif blocks for other parsers
         # elif isinstance(self.parser, DXFParser):
         #     options['layer'] = self.layer_combo.currentText() if self.layer_combo.currentText() != "All Layers" else None
@@ -0,0 +1,181 @@
+"""import_manager.py
+Import survey files off the GUI thread.
+
+:class:`ImportJobManager` runs :class:`~digcalc_project.src.core.importers.import_job.ImportJob`
+instances in a worker thread.  Progress reports are forwarded to the GUI
+thread as signals, a job can be cancelled at any time (it stops before its
+next chunk), and the finished surface is added to the project that was
+current when the import started – or discarded if that project has been
+closed in the meantime.
+
+Example
+-------
+>>> manager = ImportJobManager(project_controller)
+>>> manager.import_progress.connect(on_progress)
+>>> job = manager.start(CSVParser(), "survey.csv", options, "Existing Surface")
+>>> manager.cancel(job)
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from ..core.importers.file_parser import FileParser, FileParserError
+from ..core.importers.import_job import ImportCancelled, ImportJob, ImportProgress
+from ..models.project import Project
+from ..models.surface import Surface
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .project_controller import ProjectController
+
+__all__ = ["ImportJobManager"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ImportResult:
+    """Outcome of one job, handed from the worker to the GUI thread."""
+
+    job: ImportJob
+    project: Optional[Project]
+    surface: Optional[Surface] = None
+    error: Optional[str] = None
+    cancelled: bool = False
+
+
+class ImportJobManager(QObject):
+    """Run file imports in the background and add the results to the project.
+
+    Signals:
+        import_started (str): An import was submitted (job name).
+        import_progress (str, object): Job name and its :class:`ImportProgress`.
+        import_finished (str): Name of the surface added to the project.
+        import_failed (str, str): Job name and error message.
+        import_cancelled (str): An import was cancelled or its project closed.
+    """
+
+    import_started = Signal(str)
+    import_progress = Signal(str, object)
+    import_finished = Signal(str)
+    import_failed = Signal(str, str)
+    import_cancelled = Signal(str)
+    _job_progress = Signal(object, object)  # worker thread -> GUI thread
+    _job_finished = Signal(object)
+
+    def __init__(self, controller: ProjectController, max_workers: int = 1,
+                 parent: Optional[QObject] = None) -> None:
+        """Initialize the manager.
+
+        Args:
+            controller: Controller owning the current project.
+            max_workers: Number of files that may import concurrently.
+            parent: Optional Qt parent.
+
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._controller = controller
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix="file-import")
+        self._futures: Dict[ImportJob, Future] = {}
+        self._job_progress.connect(self._on_job_progress)
+        self._job_finished.connect(self._on_job_finished)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self, parser: FileParser, file_path: str, options: Optional[Dict] = None,
+              surface_name: Optional[str] = None) -> ImportJob:
+        """Queue an import of *file_path* and return immediately.
+
+        Args:
+            parser: Parser for the file.
+            file_path: File to import.
+            options: Parser-specific options.
+            surface_name: Name for the new surface (made unique by the project).
+
+        Returns:
+            ImportJob: The queued job, e.g. for :meth:`cancel`.
+
+        """
+        job = ImportJob(parser, file_path, options, surface_name)
+        project = self._controller.get_current_project()
+        self.logger.info(f"Starting background import of '{file_path}' with {type(parser).__name__}.")
+        self._futures[job] = self._executor.submit(self._run, job, project)
+        self.import_started.emit(job.name)
+        return job
+
+    def cancel(self, job: Optional[ImportJob] = None) -> None:
+        """Cancel *job* (all running and queued imports by default)."""
+        for running in ([job] if job is not None else list(self._futures)):
+            running.cancel()
+
+    def is_busy(self) -> bool:
+        """True while an import is running or queued."""
+        return bool(self._futures)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until running imports finish (their results are delivered via the event loop)."""
+        for future in list(self._futures.values()):
+            future.exception(timeout=timeout)
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop the worker threads."""
+        self.cancel()
+        self._executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _run(self, job: ImportJob, project: Optional[Project]) -> None:
+        """Worker thread: parse the file, forwarding progress to the GUI thread."""
+        result = _ImportResult(job, project)
+        try:
+            result.surface = job.run(lambda progress: self._job_progress.emit(job, progress))
+        except ImportCancelled:
+            result.cancelled = True
+        except FileParserError as e:
+            result.error = str(e)
+        except Exception as e:  # Surface the error on the GUI thread instead of losing it
+            logger.exception(f"Unexpected error importing '{job.file_path}'")
+            result.error = f"Unexpected error: {e}"
+        finally:
+            self._job_finished.emit(result)
+
+    @Slot(object, object)
+    def _on_job_progress(self, job: ImportJob, progress: ImportProgress) -> None:
+        if job in self._futures and not job.cancelled:
+            self.import_progress.emit(job.name, progress)
+
+    @Slot(object)
+    def _on_job_finished(self, result: _ImportResult) -> None:
+        """GUI thread: add the surface to its project if that is still open."""
+        job = result.job
+        self._futures.pop(job, None)
+        project = self._controller.get_current_project()
+
+        if result.cancelled or job.cancelled or result.project is not project:
+            self.logger.info(f"Import of '{job.file_path}' cancelled.")
+            self.import_cancelled.emit(job.name)
+            return
+        if result.error is not None:
+            self.logger.error(f"Import of '{job.file_path}' failed: {result.error}")
+            self.import_failed.emit(job.name, result.error)
+            return
+        if result.surface is None:
+            message = f"No surface data found in '{job.file_path}'."
+            self.logger.warning(message)
+            self.import_failed.emit(job.name, message)
+            return
+
+        project.add_surface(result.surface)
+        self.logger.info(f"Imported surface '{result.surface.name}' from '{job.file_path}'.")
+        self._controller.rebuild_lowest()
+        self._controller.set_project_modified(True)
+        self.import_finished.emit(result.surface.name)
@@ -32,10 +32,12 @@ from PySide6.QtWidgets import (
     QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
     QSpinBox,
     QStatusBar,
     QStyle,
     QToolBar,
+    QToolButton,
     QTreeWidget,
     QTreeWidgetItem,
     QVBoxLayout,
@@ -66,7 +68,7 @@ from digcalc_project.src.ui.docks.pdf_thumbnail_dock import PdfThumbnailDock  #
 # from src.ui.project_controller import ProjectController # OLD
 from digcalc_project.src.ui.project_controller import ProjectController  # NEW
 
-from ..core.calculations.volume_calculator import VolumeCalculator
+from ..core.geometry.incremental_tin import IncrementalTin
 from ..core.geometry.surface_builder import SurfaceBuilder, SurfaceBuilderError
 
 # Local imports - Use relative paths
@@ -132,7 +134,8 @@ class MainWindow(QMainWindow):
         self._selected_scene_item: Optional[QGraphicsPathItem] = None
         self.pdf_dpi_setting = 300
         self._last_volume_calculation_params: Optional[dict] = None # Cache params
-        self._last_dz_cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None # Cache dz grid
+        # Project artifact key of the last grid volume run (its dz grid lives in project.artifacts)
+        self._volume_artifact: Optional[str] = None
         self._last_pad_elev: float | None = None  # Remember last pad elevation
 
         # --- Rebuild Engine Members ---
@@ -178,6 +181,18 @@ class MainWindow(QMainWindow):
             self.setStatusBar(status_bar)
         status_bar.addPermanentWidget(self.scale_pill)
 
+        # Background import progress, shown only while a file is importing
+        self.import_progress_bar = QProgressBar()
+        self.import_progress_bar.setRange(0, 100)
+        self.import_progress_bar.setMaximumWidth(160)
+        self.import_progress_bar.setVisible(False)
+        self.cancel_import_button = QToolButton()
+        self.cancel_import_button.setText("Cancel Import")
+        self.cancel_import_button.setVisible(False)
+        self.cancel_import_button.clicked.connect(lambda: self.project_controller.import_manager.cancel())
+        status_bar.addPermanentWidget(self.import_progress_bar)
+        status_bar.addPermanentWidget(self.cancel_import_button)
+
         self._update_scale_pill()   # Set initial state
         # --- END NEW ---
 
@@ -343,6 +358,17 @@ class MainWindow(QMainWindow):
             self.project_controller.project_closed.connect(lambda: self._update_ui_for_project(None))
             self.project_controller.project_modified.connect(self._update_window_title)
             self.project_controller.surfaces_rebuilt.connect(self._on_surfaces_rebuilt)
+            scheduler = self.project_controller.rebuild_scheduler
+            scheduler.rebuild_started.connect(self._on_rebuild_started)
+            scheduler.surface_rebuilt.connect(self._on_surface_rebuilt)
+            scheduler.surface_stale.connect(self._on_surface_marked_stale)
+            scheduler.rebuild_failed.connect(self._on_surface_rebuild_failed)
+            importer = self.project_controller.import_manager
+            importer.import_started.connect(self._on_import_started)
+            importer.import_progress.connect(self._on_import_progress)
+            importer.import_finished.connect(self._on_import_finished)
+            importer.import_failed.connect(self._on_import_failed)
+            importer.import_cancelled.connect(self._on_import_cancelled)
             # Connect import actions through controller
             if hasattr(self, "import_csv_action"):
                 self.import_csv_action.triggered.connect(lambda: self.project_controller.on_import_file("csv"))
@@ -877,27 +903,27 @@ class MainWindow(QMainWindow):
                 self.statusBar().showMessage(f"Calculating volumes (Grid: {resolution})...", 0)
 
                 try:
-                    # Use project obtained from controller
+                    # Wait for pending layer rebuilds so both surfaces are current
+                    self.project_controller.refresh_surfaces([existing_name, proposed_name])
                     existing_surface = project.get_surface(existing_name)
                     proposed_surface = project.get_surface(proposed_name)
 
                     if not existing_surface or not proposed_surface:
                          raise ValueError("Selected surface(s) not found in project.")
 
-                    if not existing_surface.points or not proposed_surface.points:
+                    # Bounds, unlike the point count, do not evaluate lazy surfaces
+                    if existing_surface.get_bounds() is None or proposed_surface.get_bounds() is None:
                          raise ValueError("Selected surface(s) have no data points for calculation.")
 
-                    # VolumeCalculator expects the active Project so it can
-                    # extend bounding boxes with regions and log context.
-                    calculator = VolumeCalculator(project)
-                    results = calculator.calculate_surface_to_surface(
-                        surface1=existing_surface,
-                        surface2=proposed_surface,
-                        grid_resolution=resolution,
-                    )
-                    cut_volume = results["cut_volume"]
-                    fill_volume = results["fill_volume"]
-                    net_volume = results["net_volume"]
+                    # The project caches the result until either surface or a
+                    # region changes; its calculator then recomputes only the
+                    # affected grid tiles.
+                    key = project.volume_artifact(existing_name, proposed_name, resolution)
+                    results = project.artifacts.get(key)
+                    self._volume_artifact = key
+                    cut_volume = results["cut"]
+                    fill_volume = results["fill"]
+                    net_volume = results["net"]
 
                     self.statusBar().showMessage(f"Calculation complete: Cut={cut_volume:.2f}, Fill={fill_volume:.2f}, Net={net_volume:.2f}", 5000)
                     self.logger.info(f"Volume calculation successful: Cut={cut_volume:.2f}, Fill={fill_volume:.2f}, Net={net_volume:.2f}")
@@ -940,6 +966,9 @@ class MainWindow(QMainWindow):
             # Perform any MainWindow-specific cleanup before closing
             if hasattr(self, "visualization_panel"):
                  self.visualization_panel.clear_pdf_background()
+            self._rebuild_timer.stop()
+            self.project_controller.rebuild_scheduler.shutdown()
+            self.project_controller.import_manager.shutdown()
             self.logger.info("Closing application.")
             event.accept()
         else:
@@ -1601,6 +1630,7 @@ class MainWindow(QMainWindow):
                     layer_name=selected_layer,
                     polylines_data=valid_polys_for_build, # Pass the filtered list
                     revision=current_layer_rev,
+                    tin=project.layer_tins.setdefault(selected_layer, IncrementalTin()),
                 )
                 surface.name = surface_name
                 # Use project variable
@@ -1652,7 +1682,7 @@ class MainWindow(QMainWindow):
             self.logger.warning("Attempted to queue rebuild for None layer name.")
 
     def _process_rebuild_queue(self):
-        """Processes layers marked for rebuild, rebuilding derived surfaces."""
+        """Hands the queued layers to the background rebuild scheduler."""
         # Get project from controller
         project = self.project_controller.get_current_project()
         if not project or not self._rebuild_needed_layers:
@@ -1665,116 +1695,100 @@ class MainWindow(QMainWindow):
         self._rebuild_needed_layers.clear() # Clear queue before processing
 
         self.logger.info(f"Processing rebuild queue for layers: {layers_to_process}")
-        # Use project variable
-        surfaces_to_check = list(project.surfaces.values()) # Copy to avoid issues if modified
-
-        processed_count = 0
-        for surf in surfaces_to_check:
-            # Check if surface exists in project (might have been deleted)
-            # Use project variable
-            if surf.name not in project.surfaces:
-                 continue
-            if surf.source_layer_name in layers_to_process:
-                # Pass project to rebuild method
-                self._rebuild_surface_now(project, surf.name)
-                processed_count += 1
-
-        self.logger.info(f"Finished processing rebuild queue. Rebuilt {processed_count} surfaces derived from {layers_to_process}.")
-
-    # Pass project explicitly
-    def _rebuild_surface_now(self, project: Project, surface_name: str):
-        """Rebuilds a specific surface if necessary."""
-        if not project: return # Check passed project
-        surf = project.surfaces.get(surface_name)
-
-        if not surf or not surf.source_layer_name:
-            self.logger.debug(f"Skipping rebuild for '{surface_name}': No surface or source layer.")
+        # Builds run off the GUI thread; results arrive via _on_surface_rebuilt
+        scheduler = self.project_controller.rebuild_scheduler
+        queued = [layer for layer in sorted(layers_to_process) if scheduler.schedule(layer)]
+        self.logger.info(f"Queued background rebuilds for layers: {queued}")
+
+    @Slot(str)
+    def _on_rebuild_started(self, layer_name: str):
+        """Shows progress while a layer's surfaces rebuild in the background."""
+        self.statusBar().showMessage(f"Rebuilding surfaces from layer '{layer_name}'...", 0)
+
+    @Slot(str)
+    def _on_surface_rebuilt(self, surface_name: str):
+        """Refreshes the views of one surface after the scheduler replaced or revalidated it."""
+        project = self.project_controller.get_current_project()
+        surf = project.surfaces.get(surface_name) if project else None
+        if surf is None:
             return
+        if hasattr(self.visualization_panel, "update_surface_mesh"):
+            self.visualization_panel.update_surface_mesh(surf)
+        if hasattr(self.project_panel, "_update_tree_item_text"): # Check if method exists
+            self.project_panel._update_tree_item_text(surface_name)
+        self.statusBar().showMessage(f"Surface '{surface_name}' rebuilt successfully.", 3000)
+
+    @Slot(str)
+    def _on_surface_marked_stale(self, surface_name: str):
+        """Updates the project tree for a surface the scheduler could not rebuild."""
+        if hasattr(self.project_panel, "_update_tree_item_text"): # Check if method exists
+            self.project_panel._update_tree_item_text(surface_name)
+
+    @Slot(str, str)
+    def _on_surface_rebuild_failed(self, surface_name: str, message: str):
+        """Reports a failed background rebuild; the surface is left stale."""
+        self._on_surface_marked_stale(surface_name)
+        self.statusBar().showMessage(f"Rebuild failed for '{surface_name}'.", 5000)
+        QMessageBox.warning(self, "Rebuild Failed", f"Could not rebuild surface '{surface_name}':\n{message}")
+    # --- End Rebuild Helpers ---
 
-        layer = surf.source_layer_name
-        # Use project variable
-        current_layer_rev = project.layer_revisions.get(layer, 0)
-
-        self.logger.debug(f"Rebuild check for '{surface_name}': Layer='{layer}', CurrentLayerRev={current_layer_rev}, SurfaceSavedRev={surf.source_layer_revision}")
-
-        # --- Check if already up-to-date ---
-        if surf.source_layer_revision is not None and surf.source_layer_revision == current_layer_rev:
-             # --- Add specific log here ---
-             self.logger.info(f"CONDITION MET: Surface '{surface_name}' revision ({surf.source_layer_revision}) matches current layer revision ({current_layer_rev}). Skipping rebuild.")
-             # --- End add ---
-             self.logger.debug(f" -> Surface '{surface_name}' is already up-to-date (Revision {current_layer_rev}). Skipping rebuild.")
-             if surf.is_stale:
-                  # Restore original code to clear stale state
-                  surf.is_stale = False
-                  # Use project variable
-                  project.is_modified = True
-                  if hasattr(self.project_panel, "_update_tree_item_text"):
-                      self.project_panel._update_tree_item_text(surf.name)
-             return
-
-        self.logger.debug(f" -> Surface '{surface_name}' needs rebuild (SavedRev={surf.source_layer_revision} != CurrentRev={current_layer_rev}).")
-        # ... (rest of rebuild logic) ...
-
-        polys_data = project.traced_polylines.get(layer, [])
-        valid_polys = [
-            p for p in polys_data
-            if isinstance(p, dict) and p.get("elevation") is not None
-        ]
-
-        if not valid_polys:
-            logger.warning(f"Layer '{layer}' has no valid polylines with elevation to rebuild surface '{surface_name}'. Marking as stale.")
-            surf.is_stale = True
-            project.is_modified = True
-            if hasattr(self.project_panel, "_update_tree_item_text"): # Check if method exists
-                self.project_panel._update_tree_item_text(surf.name)
+    # --- Background Import Helpers ---
+    def _set_import_widgets_visible(self, visible: bool):
+        """Shows the import progress bar and cancel button while imports run."""
+        self.import_progress_bar.setVisible(visible)
+        self.cancel_import_button.setVisible(visible)
+        if not visible:
+            self.import_progress_bar.setValue(0)
+
+    @Slot(str)
+    def _on_import_started(self, name: str):
+        """Shows progress while a file imports in the background."""
+        self._set_import_widgets_visible(True)
+        self.statusBar().showMessage(f"Importing '{name}'...", 0)
+
+    @Slot(str, object)
+    def _on_import_progress(self, name: str, progress):
+        """Updates the progress bar with the bytes read and rows parsed so far."""
+        self.import_progress_bar.setValue(int(progress.fraction * 100))
+        self.statusBar().showMessage(
+            f"Importing '{name}': {progress.bytes_read / 1e6:,.1f} of {progress.total_bytes / 1e6:,.1f} MB, "
+            f"{progress.rows:,} rows", 0)
+
+    @Slot(str)
+    def _on_import_finished(self, surface_name: str):
+        """Displays a surface once its background import has been added to the project."""
+        self._set_import_widgets_visible(self.project_controller.import_manager.is_busy())
+        project = self.project_controller.get_current_project()
+        surf = project.surfaces.get(surface_name) if project else None
+        if surf is None:
             return
-
-        self.statusBar().showMessage(f"Rebuilding surface '{surface_name}' from layer '{layer}'...", 0)
-        try:
-            # Use SurfaceBuilder directly
-            new_surf = SurfaceBuilder.build_from_polylines(layer, valid_polys, current_layer_rev)
-            new_surf.name = surface_name # Keep the original name
-            new_surf.is_stale = False # Mark as not stale
-
-            # Replace in project (use project variable)
-            project.surfaces[surface_name] = new_surf
-            project.is_modified = True
-
-            # Update visualization - Use update_surface_mesh (defined in Part 4)
-            if hasattr(self.visualization_panel, "update_surface_mesh"):
-                self.visualization_panel.update_surface_mesh(new_surf)
-            else:
-                 logger.error("VisualizationPanel does not have 'update_surface_mesh' method.")
-
-            # Update project panel
-            if hasattr(self.project_panel, "_update_tree_item_text"): # Check if method exists
-                self.project_panel._update_tree_item_text(new_surf.name)
-
-            self.logger.info(f"Successfully rebuilt surface '{surface_name}' from layer '{layer}' (New Rev: {current_layer_rev}).")
-            self.statusBar().showMessage(f"Surface '{surface_name}' rebuilt successfully.", 3000)
-
-        except SurfaceBuilderError as e:
-            logger.error(f"Failed to rebuild surface '{surface_name}': {e}")
-            QMessageBox.warning(self, "Rebuild Failed", f"Could not rebuild surface '{surface_name}':\n{e}")
-            self.statusBar().showMessage(f"Rebuild failed for '{surface_name}'.", 5000)
-            surf.is_stale = True
-            project.is_modified = True
-            if hasattr(self.project_panel, "_update_tree_item_text"): # Check if method exists
-                self.project_panel._update_tree_item_text(surf.name)
-        except Exception as e:
-            logger.exception(f"Unexpected error rebuilding surface '{surface_name}'")
-            QMessageBox.critical(self, "Rebuild Error", f"An unexpected error occurred rebuilding '{surface_name}':\n{e}")
-            self.statusBar().showMessage(f"Rebuild error for '{surface_name}'.", 5000)
-            surf.is_stale = True
-            project.is_modified = True
-            if hasattr(self.project_panel, "_update_tree_item_text"): # Check if method exists
-                 self.project_panel._update_tree_item_text(surf.name)
-    # --- End Rebuild Helpers ---
+        if hasattr(self, "project_panel"):
+            self.project_panel._update_tree()
+        if hasattr(self.visualization_panel, "update_surface_mesh"):
+            self.visualization_panel.update_surface_mesh(surf)
+        self._update_analysis_actions_state()
+        self._update_view_actions_state()
+        self.project_controller.surfaces_rebuilt.emit()
+        self.statusBar().showMessage(f"Imported surface '{surface_name}'.", 5000)
+
+    @Slot(str, str)
+    def _on_import_failed(self, name: str, message: str):
+        """Reports a failed background import."""
+        self._set_import_widgets_visible(self.project_controller.import_manager.is_busy())
+        self.statusBar().showMessage(f"Import of '{name}' failed.", 5000)
+        QMessageBox.warning(self, "Import Failed", f"Could not import '{name}':\n{message}")
+
+    @Slot(str)
+    def _on_import_cancelled(self, name: str):
+        """Clears the import progress after a cancelled import."""
+        self._set_import_widgets_visible(self.project_controller.import_manager.is_busy())
+        self.statusBar().showMessage(f"Import of '{name}' cancelled.", 3000)
+    # --- End Background Import Helpers ---
 
     def _clear_cutfill_state(self):
         """Resets the cut/fill map action and clears visualization."""
         self.logger.debug("Clearing cut/fill map state.")
-        self._last_dz_cache = None
+        self._volume_artifact = None
         self.cutfill_action.setChecked(False)
         self.cutfill_action.setEnabled(False)
         # Ensure the visualization is also cleared/hidden
@@ -2195,6 +2209,11 @@ class MainWindow(QMainWindow):
     @Slot()
     def _on_surfaces_rebuilt(self):
         """Refresh visualizations after surfaces are rebuilt."""
+        # Only drop the cut/fill map if the rebuilt surfaces feed it
+        project = self.project_controller.get_current_project()
+        if self._volume_artifact and project is not None and self._volume_artifact in project.artifacts \
+                and project.artifacts.is_stale(self._volume_artifact):
+            self._clear_cutfill_state()
         if hasattr(self, "visualization_panel"):
             # For now, just force re-display of any surfaces already visible
             for surf in self.project_controller.get_current_project().surfaces.values():
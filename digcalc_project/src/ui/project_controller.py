@@ -6,6 +6,7 @@ and maintains the current project state.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
@@ -15,12 +16,12 @@ from PySide6.QtCore import QObject, Signal
 # --- End Add ---
 from PySide6.QtWidgets import QFileDialog, QMessageBox
 
-from ..core.geometry.surface_builder import lowest_surface
-
 # Local imports (use relative paths if within the same package structure)
 from ..models.project import Project
 from ..models.serializers import ProjectLoadError, ProjectSerializer
 from ..models.surface import Surface
+from .import_manager import ImportJobManager
+from .rebuild_scheduler import SurfaceRebuildScheduler
 
 # Use TYPE_CHECKING to avoid circular imports with MainWindow
 if TYPE_CHECKING:
@@ -72,6 +73,10 @@ class ProjectController(QObject):
         # self._create_default_project() # Moved logic here, removed method call
         # --- Lowest composite surface holder ---
         self._lowest_surface: Surface | None = None
+        # Traced-layer surfaces are rebuilt off the GUI thread
+        self.rebuild_scheduler = SurfaceRebuildScheduler(self, parent=self)
+        # File imports are parsed off the GUI thread as well
+        self.import_manager = ImportJobManager(self, parent=self)
 
     # --------------------------------------------------------------------------
     # Project State Management
@@ -86,6 +91,9 @@ class ProjectController(QObject):
 
         """
         self.logger.info(f"Setting current project to: {project.name if project else 'None'}")
+        # Builds for the outgoing project must not publish into the new one
+        self.rebuild_scheduler.cancel()
+        self.import_manager.cancel()
         self.current_project = project
         # Trigger UI updates in MainWindow through its methods
         # self.main_window._update_ui_for_project(self.current_project) # Let signal handle this
@@ -292,6 +300,52 @@ Do you want to save them?""",
         self.logger.debug("User chose to Cancel.")
         return False # Operation cancelled, do not proceed
 
+    # Dialog filters for the File > Import actions
+    IMPORT_FILTERS = {
+        "csv": "CSV Files (*.csv *.txt);;All Files (*)",
+        "landxml": "LandXML Files (*.xml *.landxml);;All Files (*)",
+        "dxf": "DXF Files (*.dxf);;All Files (*)",
+    }
+
+    def on_import_file(self, kind: str):
+        """Handles the File > Import actions.
+
+        Asks for a file and its import options, then parses it in the
+        background through :pyattr:`import_manager`; the surface is added
+        to the project when the import finishes.
+
+        Args:
+            kind: ``"csv"``, ``"landxml"`` or ``"dxf"`` (selects the file filter).
+
+        """
+        from PySide6.QtWidgets import QDialog
+
+        from ..core.importers.file_parser import FileParser
+        from .dialogs.import_options_dialog import ImportOptionsDialog
+
+        self.logger.debug(f"Import {kind} action triggered.")
+        if not self.current_project:
+            self.logger.warning("on_import_file called but there is no active project.")
+            return
+        file_path, _ = QFileDialog.getOpenFileName(
+            self.main_window, f"Import {kind.upper()} File", "",
+            self.IMPORT_FILTERS.get(kind, "All Files (*)"),
+        )
+        if not file_path:
+            self.logger.debug("Import cancelled by user (no file selected).")
+            return
+
+        parser = FileParser.get_parser_for_file(file_path)
+        if parser is None:
+            QMessageBox.warning(self.main_window, "Import Error",
+                                f"Unsupported file type: {Path(file_path).suffix or file_path}")
+            return
+        dialog = ImportOptionsDialog(self.main_window, parser, Path(file_path).stem, file_path)
+        if dialog.exec() != QDialog.Accepted:
+            self.logger.debug("Import cancelled by user (options dialog).")
+            return
+        self.import_manager.start(parser, file_path, dialog.get_options(), dialog.get_surface_name())
+
     # --- Renamed to set_project_modified and emit signal ---
     def set_project_modified(self, modified: bool = True):
         """Marks the current project's dirty state and emits project_modified if it changed."""
@@ -307,21 +361,34 @@ Do you want to save them?""",
     # --------------------------------------------------------------------------
     # Surface Rebuild Helpers
     # --------------------------------------------------------------------------
-    def rebuild_surfaces(self):
+    def rebuild_surfaces(self, workers: Optional[int] = None):
         """Rebuild all derived surfaces based on current traced polylines.
 
         This method is called when tracing data changes (e.g., pad elevations
         added).  It will:
 
-        1. Clear the MainWindow's cached cut/fill grids.
-        2. Iterate over existing surfaces and rebuild them using SurfaceBuilder
-           if their source layer still has valid polylines with elevation.
+        1. Triangulate every source layer that still has valid polylines with
+           elevation.  Layers are independent, so they are built concurrently
+           in a thread pool (Qhull and the NumPy kernels release the GIL);
+           surfaces sharing a source layer reuse a single build.
+        2. Rebuild the composites that depend on those surfaces (the *Lowest*
+           surface) once every base surface is in place.
         3. Emit the *surfaces_rebuilt* signal so that views (2-D/3-D) can refresh.
+           Cut/fill results that do not depend on the rebuilt layers stay valid
+           (see ``Project.artifacts``).
+
+        Args:
+            workers: Number of build threads; ``None`` uses the
+                ``surface_rebuild_workers`` setting and ``0`` all cores.
+
         """
+        from digcalc_project.src.core.calculations.parallel_volume import resolve_worker_count
+        from digcalc_project.src.core.geometry.incremental_tin import IncrementalTin
         from digcalc_project.src.core.geometry.surface_builder import (
             SurfaceBuilder,
             SurfaceBuilderError,
         )
+        from digcalc_project.src.services.settings_service import SettingsService
 
         if not self.current_project:
             self.logger.warning("rebuild_surfaces called but there is no active project.")
@@ -329,24 +396,52 @@ Do you want to save them?""",
 
         project = self.current_project
 
-        # 1. Clear cached dz/cut-fill state in the MainWindow (if attribute exists)
-        if hasattr(self.main_window, "_clear_cutfill_state"):
-            self.main_window._clear_cutfill_state()
-
-        rebuilt_count = 0
-        for surf_name, surf in list(project.surfaces.items()):
+        # 1. One build per source layer, shared by every surface derived from it
+        targets: dict[str, list[str]] = {}
+        for surf_name, surf in project.surfaces.items():
             src_layer = getattr(surf, "source_layer_name", None)
-            if not src_layer:
-                continue  # Skip surfaces without a source layer
+            if src_layer:  # Skip surfaces without a source layer
+                targets.setdefault(src_layer, []).append(surf_name)
 
+        jobs = {}
+        for src_layer, names in targets.items():
             polylines = project.traced_polylines.get(src_layer, [])
             valid_polys = [p for p in polylines if isinstance(p, dict) and p.get("elevation") is not None]
             if not valid_polys:
-                self.logger.info("Layer '%s' has no valid polylines with elevation for rebuilding '%s'.", src_layer, surf_name)
+                self.logger.info("Layer '%s' has no valid polylines with elevation for rebuilding %s.", src_layer, names)
                 continue
+            jobs[src_layer] = (valid_polys, project.layer_revisions.get(src_layer, 0),
+                               project.layer_tins.setdefault(src_layer, IncrementalTin()))
 
+        def build(src_layer: str):
+            valid_polys, revision, tin = jobs[src_layer]
             try:
-                new_surf = SurfaceBuilder.build_from_polylines(src_layer, valid_polys, project.layer_revisions.get(src_layer, 0))
+                return SurfaceBuilder.build_from_polylines(src_layer, valid_polys, revision, tin=tin)
+            except SurfaceBuilderError as e:
+                self.logger.error("Failed to rebuild surfaces %s: %s", targets[src_layer], e)
+            except Exception as e:  # Catch-all to avoid crashing the UI loop
+                self.logger.exception("Unexpected error rebuilding surfaces %s: %s", targets[src_layer], e)
+            return None
+
+        if workers is None:
+            workers = SettingsService().surface_rebuild_workers()
+        workers = min(resolve_worker_count(workers), len(jobs))
+        if workers > 1:
+            self.logger.debug("Rebuilding %d layer(s) on %d threads.", len(jobs), workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="surface-rebuild") as pool:
+                built = dict(zip(jobs, pool.map(build, jobs)))
+        else:
+            built = {src_layer: build(src_layer) for src_layer in jobs}
+
+        rebuilt_count = 0
+        for src_layer, new_surf in built.items():
+            if new_surf is None:
+                continue
+            for i, surf_name in enumerate(targets[src_layer]):
+                if i:  # Further surfaces of the same layer get their own copy of the arrays
+                    new_surf = Surface.from_arrays(
+                        surf_name, new_surf.vertices.copy(), new_surf.faces.copy(),
+                        source_layer_name=src_layer, source_layer_revision=new_surf.source_layer_revision)
                 new_surf.name = surf_name  # Keep original name
                 new_surf.source_layer_name = src_layer
                 project.surfaces[surf_name] = new_surf
@@ -356,16 +451,12 @@ Do you want to save them?""",
                 if hasattr(self.main_window, "visualization_panel") and \
                    hasattr(self.main_window.visualization_panel, "update_surface_mesh"):
                     self.main_window.visualization_panel.update_surface_mesh(new_surf)
-            except SurfaceBuilderError as e:
-                self.logger.error("Failed to rebuild surface '%s': %s", surf_name, e)
-            except Exception as e:  # Catch-all to avoid crashing the UI loop
-                self.logger.exception("Unexpected error rebuilding surface '%s': %s", surf_name, e)
 
         if rebuilt_count:
             self.logger.info("Rebuilt %d surface(s) successfully.", rebuilt_count)
 
-            # --- Ensure lowest composite surface stays in sync ---
-            self._rebuild_lowest()
+            # 2. Composites only once all of their inputs are rebuilt
+            self.rebuild_lowest()
 
             # Mark project modified and emit events
             self.set_project_modified(True)
@@ -375,6 +466,28 @@ Do you want to save them?""",
         else:
             self.logger.info("No surfaces required rebuilding.")
 
+    def refresh_surfaces(self, surface_names) -> None:
+        """Bring *surface_names* up to date with their source layers before use.
+
+        Outdated layers are rebuilt through :attr:`rebuild_scheduler`, which
+        installs the results and emits the usual signals; this blocks until
+        they are published.  Naming the *Lowest* composite refreshes its
+        design and existing inputs and then the composite itself.
+        """
+        project = self.current_project
+        if project is None:
+            return
+        names = set(surface_names)
+        lowest = project.LOWEST_SURFACE in names
+        if lowest:
+            names |= {"Design Surface", "Existing Surface"}
+        layers = {s.source_layer_name for s in map(project.surfaces.get, names) if s is not None and s.source_layer_name}
+        for layer in layers:
+            self.rebuild_scheduler.schedule(layer)
+        self.rebuild_scheduler.flush()
+        if lowest:
+            self.rebuild_lowest()
+
     # ----------------------------------------------------------------------
     # Lowest composite surface helpers
     # ----------------------------------------------------------------------
@@ -382,24 +495,28 @@ Do you want to save them?""",
         """Return the current lowest-elevation composite surface if available."""
         return self._lowest_surface
 
-    def _rebuild_lowest(self):
+    def rebuild_lowest(self):
         """(Re)compute the *Lowest* composite surface.
 
         This function requires both a *design* and *existing* surface to be
         present on the current project.  When generated, the surface is added
         to ``project.surfaces`` using the key ``"Lowest"`` so downstream UI
-        elements can find it by name.
+        elements can find it by name.  Collaborators that change surfaces
+        (the rebuild scheduler, the import manager) call it afterwards.
         """
         if (self.current_project
                 and self.current_project.get_surface("Design Surface")
                 and self.current_project.get_surface("Existing Surface")):
-            design = self.current_project.get_surface("Design Surface")
-            existing = self.current_project.get_surface("Existing Surface")
+            artifacts = self.current_project.artifacts
             try:
-                self._lowest_surface = lowest_surface(design, existing)  # type: ignore[arg-type]
-                # Store/update on project for persistence/visualisation
-                self.current_project.surfaces[self._lowest_surface.name] = self._lowest_surface
-                self.surfacesChanged.emit()
+                # Recomputed only when the design or existing surface changed
+                key = self.current_project.lowest_artifact()
+                before = artifacts.revision(key)
+                self._lowest_surface = artifacts.get(key)
+                if self._lowest_surface is not None:
+                    self.current_project.surfaces[self._lowest_surface.name] = self._lowest_surface
+                if artifacts.revision(key) != before:
+                    self.surfacesChanged.emit()
             except Exception as err:
                 self.logger.error("Failed to build lowest surface: %s", err, exc_info=True)
 
@@ -0,0 +1,280 @@
+"""rebuild_scheduler.py
+Rebuild traced-layer surfaces off the GUI thread.
+
+Editing a traced polyline bumps its layer revision and queues the surfaces
+derived from that layer for a rebuild.  :class:`SurfaceRebuildScheduler`
+snapshots the layer's polylines on the GUI thread, triangulates them in a
+worker thread and hands the finished surface back to the GUI thread, where
+it is installed in the project only if it still matches the layer's current
+revision.
+
+Builds for one layer never overlap – they share the layer's
+:class:`~digcalc_project.src.core.geometry.incremental_tin.IncrementalTin` –
+so requests that arrive while a build is running are coalesced: only the
+newest snapshot is kept and it starts as soon as the running build ends.  A
+queued build whose revision has been superseded before it starts is dropped
+without running, and a finished build whose revision is out of date is
+discarded instead of being published.
+
+Example
+-------
+>>> scheduler = SurfaceRebuildScheduler(project_controller)
+>>> scheduler.surface_rebuilt.connect(on_surface_ready)
+>>> scheduler.schedule("Contours")   # returns immediately
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QCoreApplication, QObject, Signal, Slot
+
+from ..core.geometry.incremental_tin import IncrementalTin
+from ..core.geometry.surface_builder import SurfaceBuilder, SurfaceBuilderError
+from ..models.project import Project
+from ..models.surface import Surface
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .project_controller import ProjectController
+
+__all__ = ["SurfaceRebuildScheduler"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _RebuildJob:
+    """Snapshot of one layer taken on the GUI thread."""
+
+    project: Project
+    layer: str
+    revision: int
+    polylines: List[Dict[str, Any]]
+    tin: IncrementalTin
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    surface: Optional[Surface] = None
+    error: Optional[str] = None
+
+
+class SurfaceRebuildScheduler(QObject):
+    """Run layer surface rebuilds in the background and publish the results.
+
+    Signals:
+        rebuild_started (str): A build for the layer has been submitted.
+        surface_rebuilt (str): A surface was replaced with an up-to-date build.
+        surface_stale (str): A surface could not be rebuilt and is now stale.
+        rebuild_failed (str, str): Surface name and error message of a failed build.
+    """
+
+    rebuild_started = Signal(str)
+    surface_rebuilt = Signal(str)
+    surface_stale = Signal(str)
+    rebuild_failed = Signal(str, str)
+    _job_finished = Signal(object)  # worker thread -> GUI thread
+
+    def __init__(self, controller: ProjectController, max_workers: int = 2,
+                 parent: Optional[QObject] = None) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            controller: Controller owning the current project; its
+                ``surfaces_rebuilt`` signal is emitted after each publish.
+            max_workers: Number of layers that may build concurrently.
+            parent: Optional Qt parent.
+
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._controller = controller
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix="surface-rebuild")
+        self._running: Dict[str, _RebuildJob] = {}
+        self._pending: Dict[str, _RebuildJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._job_finished.connect(self._on_job_finished)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def schedule(self, layer_name: str) -> bool:
+        """Queue a rebuild of the surfaces derived from *layer_name*.
+
+        Surfaces already at the layer's current revision only have their
+        stale flag cleared; nothing is built for them.
+
+        Args:
+            layer_name: Traced layer whose polylines changed.
+
+        Returns:
+            bool: True if a background build was queued.
+
+        """
+        project = self._controller.get_current_project()
+        if project is None or not layer_name:
+            return False
+
+        revision = project.layer_revisions.get(layer_name, 0)
+        targets = self._derived_surfaces(project, layer_name)
+        outdated = [s for s in targets if s.source_layer_revision != revision]
+        for surf in targets:
+            if surf.source_layer_revision == revision and surf.is_stale:
+                surf.is_stale = False
+                project.is_modified = True
+                self.surface_rebuilt.emit(surf.name)
+        if not outdated:
+            self.logger.debug(f"Surfaces of layer '{layer_name}' are up to date (revision {revision}).")
+            return False
+
+        polylines = self._snapshot(project, layer_name)
+        if not polylines:
+            self.logger.warning(f"Layer '{layer_name}' has no valid polylines with elevation. Marking derived surfaces stale.")
+            for surf in outdated:
+                surf.is_stale = True
+                self.surface_stale.emit(surf.name)
+            project.is_modified = True
+            return False
+
+        running = self._running.get(layer_name)
+        if running is not None and running.revision == revision and running.project is project:
+            self._pending.pop(layer_name, None)
+            return True  # the running build is already current
+
+        job = _RebuildJob(project, layer_name, revision, polylines,
+                          project.layer_tins.setdefault(layer_name, IncrementalTin()))
+        if running is not None:
+            running.cancelled.set()  # its result can no longer be published
+            superseded = self._pending.get(layer_name)
+            if superseded is not None:
+                self.logger.debug(f"Dropping queued rebuild of '{layer_name}' rev {superseded.revision}.")
+            self._pending[layer_name] = job
+            return True
+
+        self._submit(job)
+        return True
+
+    def cancel(self, layer_name: Optional[str] = None) -> None:
+        """Drop queued builds and discard running ones (all layers by default)."""
+        layers = [layer_name] if layer_name else list(set(self._running) | set(self._pending))
+        for layer in layers:
+            self._pending.pop(layer, None)
+            job = self._running.get(layer)
+            if job is not None:
+                job.cancelled.set()
+
+    def is_busy(self, layer_name: Optional[str] = None) -> bool:
+        """True while a build is running or queued (for *layer_name* or any layer)."""
+        if layer_name:
+            return layer_name in self._running or layer_name in self._pending
+        return bool(self._running or self._pending)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until running builds finish (their results are delivered via the event loop)."""
+        for future in list(self._futures.values()):
+            future.exception(timeout=timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every running and queued build has been published.
+
+        Unlike :meth:`wait` this also delivers the results, so the project's
+        surfaces are current when it returns.  Call it from the GUI thread.
+        """
+        while self._running or self._pending:
+            self.wait(timeout)
+            QCoreApplication.processEvents()
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop the worker threads."""
+        self.cancel()
+        self._executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _derived_surfaces(project: Project, layer_name: str) -> List[Surface]:
+        return [s for s in project.surfaces.values() if s.source_layer_name == layer_name]
+
+    @staticmethod
+    def _snapshot(project: Project, layer_name: str) -> List[Dict[str, Any]]:
+        """Copy the layer's polylines so later edits cannot race the worker."""
+        snapshot = []
+        for poly in project.traced_polylines.get(layer_name, []):
+            if isinstance(poly, dict) and poly.get("elevation") is not None:
+                try:
+                    points = np.array(poly.get("points") or [], dtype=np.float64)
+                except (TypeError, ValueError):
+                    points = list(poly.get("points") or [])  # let the builder report it
+                snapshot.append({"points": points, "elevation": poly["elevation"]})
+        return snapshot
+
+    def _submit(self, job: _RebuildJob) -> None:
+        self._running[job.layer] = job
+        self.logger.debug(f"Submitting background rebuild of '{job.layer}' rev {job.revision}.")
+        self._futures[job.layer] = self._executor.submit(self._run, job)
+        self.rebuild_started.emit(job.layer)
+
+    def _run(self, job: _RebuildJob) -> None:
+        """Worker thread: build the surface unless the job was cancelled first."""
+        try:
+            if not job.cancelled.is_set():
+                job.surface = SurfaceBuilder.build_from_polylines(
+                    job.layer, job.polylines, job.revision, tin=job.tin)
+        except SurfaceBuilderError as e:
+            job.error = str(e)
+        except Exception as e:  # Surface the error on the GUI thread instead of losing it
+            logger.exception(f"Unexpected error rebuilding layer '{job.layer}'")
+            job.error = f"Unexpected error: {e}"
+        finally:
+            self._job_finished.emit(job)
+
+    @Slot(object)
+    def _on_job_finished(self, job: _RebuildJob) -> None:
+        """GUI thread: publish the result if it is still current, then start queued work."""
+        if self._running.get(job.layer) is job:
+            del self._running[job.layer]
+            self._futures.pop(job.layer, None)
+        try:
+            self._publish(job)
+        finally:
+            pending = self._pending.pop(job.layer, None)
+            if pending is not None:
+                if pending.project is self._controller.get_current_project():
+                    self._submit(pending)
+                else:
+                    self.logger.debug(f"Dropping queued rebuild of '{pending.layer}': project closed.")
+
+    def _publish(self, job: _RebuildJob) -> None:
+        project = job.project
+        current = project.layer_revisions.get(job.layer, 0)
+        if job.cancelled.is_set() or project is not self._controller.get_current_project() or job.revision != current:
+            self.logger.debug(f"Discarding rebuild of '{job.layer}' rev {job.revision} (current rev {current}).")
+            return
+
+        targets = [s for s in self._derived_surfaces(project, job.layer) if s.source_layer_revision != job.revision]
+        if job.error is not None:
+            self.logger.error(f"Failed to rebuild surfaces of layer '{job.layer}': {job.error}")
+            for surf in targets:
+                surf.is_stale = True
+                project.is_modified = True
+                self.rebuild_failed.emit(surf.name, job.error)
+            return
+
+        for i, old in enumerate(targets):
+            new_surf = job.surface if i == 0 else Surface.from_arrays(
+                old.name, job.surface.vertices.copy(), job.surface.faces.copy(),
+                source_layer_name=job.layer, source_layer_revision=job.revision)
+            new_surf.name = old.name  # Keep the original name
+            new_surf.is_stale = False
+            project.surfaces[old.name] = new_surf
+            self.logger.info(f"Rebuilt surface '{old.name}' from layer '{job.layer}' (Rev: {job.revision}).")
+            self.surface_rebuilt.emit(old.name)
+
+        if targets:
+            self._controller.rebuild_lowest()
+            self._controller.set_project_modified(True)
+            self._controller.surfaces_rebuilt.emit()
@@ -956,18 +956,14 @@ class VisualizationPanel(QWidget):
              return
          # ... rest of adjust logic using np ...
          try:
-            points_list = list(surface.points.values())
-            if not points_list: return # No points to adjust to
+            vertices = surface.vertices
+            if not len(vertices): return # No points to adjust to
 
-            x_vals = [p.x for p in points_list]
-            y_vals = [p.y for p in points_list]
-            z_vals = [p.z for p in points_list]
+            mins = vertices.min(axis=0)
+            maxs = vertices.max(axis=0)
+            center_x, center_y, center_z = ((mins + maxs) / 2).tolist()
 
-            center_x = (min(x_vals) + max(x_vals))/2
-            center_y = (min(y_vals) + max(y_vals))/2
-            center_z = (min(z_vals) + max(z_vals))/2
-
-            size = max(max(x_vals) - min(x_vals), max(y_vals) - min(y_vals), max(z_vals) - min(z_vals), 1)
+            size = max(float((maxs - mins).max()), 1)
             distance = size * 2 # Adjust multiplier as needed
 
             center_vec = pyqtgraph.Vector(center_x, center_y, center_z)
@@ -988,34 +984,17 @@ class VisualizationPanel(QWidget):
              return None
          # ... rest of mesh creation using np ...
          try:
-            points_list = list(surface.points.values())
-            points_id_map = {p.id: i for i, p in enumerate(points_list)}
-            vertices = np.array([[p.x, p.y, p.z] for p in points_list])
-            faces = []
-            # ... face creation loop ...
-            for tri_id, triangle in surface.triangles.items():
-                try:
-                    i1 = points_id_map[triangle.p1.id]
-                    i2 = points_id_map[triangle.p2.id]
-                    i3 = points_id_map[triangle.p3.id]
-                    faces.append([i1, i2, i3])
-                except (KeyError, AttributeError) as e:
-                    self.logger.warning(f"Invalid triangle ID {tri_id} in surface {surface.name}: {e}")
-                    continue
-
-            if not faces: return None
-            faces = np.array(faces)
+            vertices = surface.vertices
+            faces = surface.faces
+            if not len(faces): return None
             # ... color calculation ...
             z_min = np.min(vertices[:, 2])
             z_max = np.max(vertices[:, 2])
             z_range = max(z_max - z_min, 0.1)
-            colors = np.zeros((len(faces), 4))
-            # ... color loop ...
-            for i, face in enumerate(faces):
-                z_avg = np.mean(vertices[face, 2])
-                t = np.clip((z_avg - z_min) / z_range, 0, 1)
-                # Simple blue-red gradient
-                colors[i] = [t, 0, 1-t, 0.7] # R, G, B, Alpha
+            z_avg = vertices[faces, 2].mean(axis=1)
+            t = np.clip((z_avg - z_min) / z_range, 0, 1)
+            # Simple blue-red gradient: R, G, B, Alpha
+            colors = np.column_stack((t, np.zeros_like(t), 1 - t, np.full_like(t, 0.7)))
 
             return {"vertices": vertices, "faces": faces, "colors": colors}
          except Exception as e:
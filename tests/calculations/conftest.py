@@ -0,0 +1,18 @@
+"""Shared fixtures for the volume calculation tests."""
+import numpy as np
+import pytest
+from scipy.spatial import Delaunay
+
+from src.models.surface import Surface
+
+
+@pytest.fixture
+def bumpy():
+    """Factory of wavy 40 x 40 ft TIN surfaces: ``bumpy(name, seed, offset)``."""
+    def make(name: str, seed: int, offset: float) -> Surface:
+        rng = np.random.default_rng(seed)
+        xy = np.vstack([rng.uniform(0, 40, size=(150, 2)), [[0, 0], [40, 0], [40, 40], [0, 40]]])
+        z = np.cos(xy[:, 0] / 5.0) + np.sin(xy[:, 1] / 4.0) + offset
+        return Surface.from_arrays(name, np.column_stack([xy, z]), Delaunay(xy).simplices)
+
+    return make
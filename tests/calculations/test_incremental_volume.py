@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.core.calculations.volume_calculator import VolumeCalculator
+from src.models.project import Project
+from src.models.region import Region
+from src.models.surface import Surface
+
+
+def _project() -> Project:
+    proj = Project(name="Incremental")
+    proj.regions.append(Region(name="Pad", polygon=[(5, 5), (12, 5), (12, 10), (5, 10)], strip_depth_ft=0.5))
+    proj.regions.append(Region(name="Road", polygon=[(20, 25), (35, 25), (35, 30), (20, 30)], strip_depth_ft=0.25))
+    return proj
+
+
+def _assert_same(a, b):
+    assert np.isclose(a["cut"], b["cut"]) and np.isclose(a["fill"], b["fill"])
+    assert np.allclose(a["dz_grid"], b["dz_grid"], equal_nan=True)
+
+
+def test_region_edit_recomputes_only_covered_tiles(bumpy):
+    existing, design = bumpy("EG", 1, 0.0), bumpy("FG", 2, 0.3)
+    proj = _project()
+    calc = VolumeCalculator(proj)
+    first = calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.05)
+    total_tiles = calc.last_recomputed_tiles
+
+    proj.regions[0].strip_depth_ft = 2.0
+    again = calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.05)
+    assert 0 < calc.last_recomputed_tiles < total_tiles
+    assert again["fill"] > first["fill"]  # deeper stripping lowers the existing grade
+    _assert_same(again, VolumeCalculator(proj).calculate_grid_method(existing, design, 0.5,
+                                                                      tile_budget_mb=0.05, reuse=False))
+
+    calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.05)
+    assert calc.last_recomputed_tiles == 0
+
+
+def test_local_surface_edit_recomputes_only_touched_tiles(bumpy):
+    existing, design = bumpy("EG", 1, 0.0), bumpy("FG", 2, 0.3)
+    proj = _project()
+    calc = VolumeCalculator(proj)
+    calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.05)
+    total_tiles = calc.last_recomputed_tiles
+
+    # Raise the design vertex nearest a corner of the site
+    vertices = design.vertices.copy()
+    vertices[int(np.argmin(np.hypot(vertices[:, 0] - 2, vertices[:, 1] - 2))), 2] += 3.0
+    edited = Surface.from_arrays("FG", vertices, design.faces)
+
+    again = calc.calculate_grid_method(existing, edited, 0.5, tile_budget_mb=0.05)
+    assert 0 < calc.last_recomputed_tiles < total_tiles
+    _assert_same(again, VolumeCalculator(proj).calculate_grid_method(existing, edited, 0.5,
+                                                                      tile_budget_mb=0.05, reuse=False))
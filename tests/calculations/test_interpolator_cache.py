@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.core.calculations.interpolator_cache import InterpolatorCache
+from src.core.calculations.volume_calculator import VolumeCalculator
+from src.models.project import Project
+from src.models.surface import Surface
+
+
+def _plane(z: float, name: str) -> Surface:
+    # Point-only surface: forces the Delaunay interpolation path
+    verts = np.array([[0, 0, z], [10, 0, z], [10, 10, z], [0, 10, z]], dtype=float)
+    return Surface.from_arrays(name, verts)
+
+
+def test_repeat_runs_reuse_interpolators():
+    cache = InterpolatorCache()
+    cache.clear()
+    calc = VolumeCalculator(Project(name="Cache"))
+    existing, proposed = _plane(0.0, "EG"), _plane(1.0, "FG")
+
+    first = calc.calculate_grid_method(existing, proposed, grid_resolution=1.0)
+    assert cache.misses == 2 and cache.hits == 0
+
+    # Different resolution, same geometry -> both interpolators come from cache
+    calc.calculate_grid_method(existing, proposed, grid_resolution=0.5)
+    assert cache.hits == 2 and cache.misses == 2
+    assert first["fill"] > 0
+
+    # Editing the geometry changes the fingerprint and forces a rebuild
+    proposed.vertices[:, 2] = 2.0
+    calc.calculate_grid_method(existing, proposed, grid_resolution=1.0)
+    assert cache.misses == 3
+    cache.clear()
+
+
+def test_budget_evicts_least_recently_used():
+    cache = InterpolatorCache()
+    cache.clear()
+    old_budget = cache.budget_bytes
+    try:
+        cache.set_budget(100)
+        cache.put("a", object(), nbytes=40)
+        cache.put("b", object(), nbytes=40)
+        assert cache.get("a") is not None  # "b" is now least recent
+        cache.put("c", object(), nbytes=40)
+        assert "b" not in cache and "a" in cache and "c" in cache
+        assert cache.nbytes == 80
+
+        cache.put("huge", object(), nbytes=1000)
+        assert "huge" not in cache
+    finally:
+        cache.set_budget(old_budget)
+        cache.clear()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from src.core.calculations.volume_calculator import VolumeCalculator
+from src.models.project import Project
+from src.models.surface import Surface
+
+
+def _plane_grid(name: str, z0: float, slope: float) -> Surface:
+    axis = np.arange(41) * 0.5  # 0..20
+    grid = z0 + slope * axis[None, :] + 0.1 * axis[:, None]
+    surf = Surface(name)
+    surf.set_grid_data(grid, 0.5, (0.0, 0.0))
+    return surf
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_raster_surfaces_match_their_tin_and_stay_unmaterialised(use_processes):
+    existing, design = _plane_grid("EG", 10.0, 0.2), _plane_grid("FG", 11.0, 0.0)
+    calc = VolumeCalculator(Project(name="Raster"))
+    raster = calc.calculate_grid_method(existing, design, 0.7, workers=2,
+                                        use_processes=use_processes, reuse=False)
+    assert existing._grid_pending and design._grid_pending
+
+    as_tin = [Surface.from_arrays(s.name, s.vertices, s.triangulated_faces()) for s in (existing, design)]
+    tin = VolumeCalculator(Project(name="Tin")).calculate_grid_method(*as_tin, 0.7, workers=1, reuse=False)
+    assert raster["cut"] == pytest.approx(tin["cut"]) and raster["fill"] == pytest.approx(tin["fill"])
+    assert np.allclose(raster["dz_grid"], tin["dz_grid"], equal_nan=True)
+
+
+def test_default_reuse_keeps_rasters_unmaterialised():
+    existing, design = _plane_grid("EG", 10.0, 0.2), _plane_grid("FG", 11.0, 0.0)
+    calc = VolumeCalculator(Project(name="Raster"))
+    first = calc.calculate_grid_method(existing, design, 0.7, workers=1)
+    again = calc.calculate_grid_method(existing, design, 0.7, workers=1)
+    assert existing._grid_pending and design._grid_pending
+    assert again["cut"] == pytest.approx(first["cut"]) and again["fill"] == pytest.approx(first["fill"])
@@ -20,3 +20,55 @@ def test_two_slice():
     # Both slices should be pure fill (no cut) with positive volume
     assert slices[0].fill > 0 and slices[0].cut == 0
     assert slices[1].fill > 0 and slices[1].cut == 0
+
+
+def _plane_pair():
+    import numpy as np
+
+    from digcalc_project.src.models.surface import Surface
+
+    verts = np.array([[0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 10, 0]], dtype=float)
+    faces = np.array([[0, 1, 2], [0, 2, 3]])
+    ref = Surface.from_arrays("Ref", verts, faces)
+    # Design rises from z=-2 at x=0 to z=+8 at x=10: cut on the left, fill on the right
+    design = verts.copy()
+    design[:, 2] = design[:, 0] - 2.0
+    return ref, Surface.from_arrays("Design", design, faces)
+
+
+def test_arbitrary_edges_match_column_overlap():
+    """Band volumes equal the summed overlap of each cell column with the band."""
+    import numpy as np
+
+    ref, design = _plane_pair()
+    edges = [-2.0, -1.0, 0.0, 3.0, 8.0]
+    slices = VolumeCalculator(project=None).compute_slice_volumes(ref, design, band_edges=edges, grid_resolution=0.5)
+
+    zd = np.arange(0, 10.25, 0.5) - 2.0  # design elevation per grid column
+    rows = len(zd)
+    for s, lo, hi in zip(slices, edges[:-1], edges[1:]):
+        fill = np.clip(np.minimum(zd, hi) - max(lo, 0.0), 0, None).sum() * rows * 0.25
+        cut = np.clip(min(hi, 0.0) - np.maximum(zd, lo), 0, None).sum() * rows * 0.25
+        assert (s.z_bottom, s.z_top) == (lo, hi)
+        assert np.isclose(s.fill, fill) and np.isclose(s.cut, cut)
+
+
+def test_region_breakdown_sums_to_total():
+    from digcalc_project.src.models.project import Project
+    from digcalc_project.src.models.region import Region
+
+    ref, design = _plane_pair()
+    proj = Project(name="Slices")
+    proj.regions.append(Region(name="West", polygon=[(-1, -1), (5, -1), (5, 11), (-1, 11)]))
+    calc = VolumeCalculator(project=proj)
+
+    total = calc.compute_slice_volumes(ref, design, slice_thickness_ft=2.0)
+    by_region = calc.compute_region_slice_volumes(ref, design, slice_thickness_ft=2.0)
+    west = by_region[proj.regions[0].id]
+
+    assert set(by_region) == {None, proj.regions[0].id}
+    for i, s in enumerate(total):
+        assert abs(s.cut - (west[i].cut + by_region[None][i].cut)) < 1e-9
+        assert abs(s.fill - (west[i].fill + by_region[None][i].fill)) < 1e-9
+    # All cut lies west of x=2, so the unassigned (east) part has none
+    assert sum(s.cut for s in west) > 0 and sum(s.cut for s in by_region[None]) == 0
@@ -47,3 +47,22 @@ def test_region_stripping_depth():
     # assert math.isclose(result["cut"], 10000, abs_tol=1e-3) # Original assertion check
     assert math.isclose(result["fill"], 2500.0, abs_tol=1e-3) # Corrected: Expecting fill based on default grid size
     assert result["cut"] == 0
+
+
+def test_region_priority_and_default_fallback():
+    proj = Project(name="Priority")
+    # First region wins where regions overlap
+    proj.regions.append(Region(name="Deep", polygon=[(0,0),(50,0),(50,100),(0,100)], strip_depth_ft=2.0))
+    proj.regions.append(Region(name="Shallow", polygon=[(0,0),(100,0),(100,100),(0,100)], strip_depth_ft=1.0))
+    # Region without its own depth falls back to the (zero) global default
+    proj.regions.append(Region(name="Default", polygon=[(-100,-100),(-1,-100),(-1,-1),(-100,-1)]))
+
+    existing = flat_surface(z=10, size=200, name="Existing")
+    design   = flat_surface(z=10, size=200, name="Design")
+
+    result = VolumeCalculator(project=proj).calculate_grid_method(existing, design)
+
+    # Interior nodes only: Deep covers x=1..49, Shallow adds x=50..99 (y=1..99)
+    expected = 2.0 * 49 * 99 + 1.0 * 50 * 99
+    assert math.isclose(result["fill"], expected, abs_tol=1e-3)
+    assert result["cut"] == 0
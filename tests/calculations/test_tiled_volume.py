@@ -0,0 +1,70 @@
+import numpy as np
+
+from src.core.calculations.volume_calculator import VolumeCalculator
+from src.models.project import Project
+from src.models.region import Region
+from src.models.surface import Surface
+
+
+def _calculator() -> VolumeCalculator:
+    proj = Project(name="Tiles")
+    proj.regions.append(Region(name="Pad", polygon=[(5, 5), (25, 5), (25, 20), (5, 20)], strip_depth_ft=0.5))
+    return VolumeCalculator(proj)
+
+
+def test_tiled_matches_single_tile(bumpy, tmp_path):
+    existing, design = bumpy("EG", 1, 0.0), bumpy("FG", 2, 0.3)
+    calc = _calculator()
+
+    whole = calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=1024)
+    # ~0.01 MB -> ~100 nodes per tile, i.e. dozens of tiles
+    tiled = calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.01,
+                                       dz_memmap_path=str(tmp_path / "dz.npy"))
+
+    assert np.isclose(tiled["cut"], whole["cut"]) and np.isclose(tiled["fill"], whole["fill"])
+    assert isinstance(tiled["dz_grid"], np.memmap)
+    assert np.array_equal(np.asarray(tiled["dz_grid"]), whole["dz_grid"], equal_nan=True)
+    assert np.array_equal(np.load(tmp_path / "dz.npy"), whole["dz_grid"], equal_nan=True)
+
+
+def test_totals_only_skips_dz_grid(bumpy):
+    existing, design = bumpy("EG", 1, 0.0), bumpy("FG", 2, 0.3)
+    result = _calculator().calculate_grid_method(existing, design, 1.0, tile_budget_mb=0.01,
+                                                 return_dz_grid=False)
+    assert result["dz_grid"] is None
+    assert result["fill"] > 0
+
+
+def test_parallel_backends_match_serial(bumpy):
+    existing, design = bumpy("EG", 1, 0.0), bumpy("FG", 2, 0.3)
+    calc = _calculator()
+    serial = calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.05, workers=1)
+
+    for use_processes in (False, True):
+        par = calc.calculate_grid_method(existing, design, 0.5, tile_budget_mb=0.05,
+                                         workers=2, use_processes=use_processes, reuse=False)
+        assert np.isclose(par["cut"], serial["cut"]) and np.isclose(par["fill"], serial["fill"])
+        assert np.array_equal(par["dz_grid"], serial["dz_grid"], equal_nan=True)
+
+
+def test_sparse_grid_skips_uncovered_tiles(bumpy):
+    # Two surfaces far apart overlapping only in a small corner
+    existing, design = bumpy("EG", 1, 0.0), bumpy("FG", 2, 0.3)
+    far = Surface.from_arrays("Far", existing.vertices + [300.0, 300.0, 0.0], existing.faces)
+    both = Surface.from_arrays(
+        "EG+Far", np.vstack([existing.vertices, far.vertices]),
+        np.vstack([existing.faces, far.faces + len(existing.vertices)]),
+    )
+    calc = _calculator()
+    # A stray region far away must not enlarge the grid
+    calc.project.regions.append(Region(name="Stray", polygon=[(900, 900), (950, 900), (950, 950)]))
+
+    dense = calc.calculate_grid_method(both, design, 1.0, tile_budget_mb=0.05, reuse=False)
+    sparse = calc.calculate_grid_method(both, design, 1.0, tile_budget_mb=0.05, reuse=False, sparse=True)
+
+    assert dense["grid_x"].max() < 400
+    assert np.isclose(sparse["cut"], dense["cut"]) and np.isclose(sparse["fill"], dense["fill"])
+    dz = sparse["dz_grid"]
+    assert dz.shape == dense["dz_grid"].shape
+    assert dz.stored_cells < dz.size / 10
+    assert np.array_equal(np.asarray(dz), dense["dz_grid"], equal_nan=True)
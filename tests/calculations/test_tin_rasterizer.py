@@ -0,0 +1,40 @@
+import numpy as np
+from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import Delaunay
+
+from src.core.calculations.tin_rasterizer import rasterize_tin
+
+
+def test_matches_linear_interpolation_on_same_tin():
+    rng = np.random.default_rng(3)
+    xy = rng.uniform(0, 50, size=(200, 2))
+    z = np.sin(xy[:, 0] / 7.0) * 3 + xy[:, 1] * 0.2
+    faces = Delaunay(xy).simplices
+    gx = np.arange(0, 50.5, 0.5)
+    gy = np.arange(0, 50.5, 0.5)
+
+    # Small chunk size exercises the batching loop
+    got = rasterize_tin(np.column_stack([xy, z]), faces, gx, gy, chunk_cells=5000)
+
+    mx, my = np.meshgrid(gx, gy)
+    expected = LinearNDInterpolator(xy, z)(mx, my)
+    assert got.shape == (len(gy), len(gx))
+    assert np.array_equal(np.isnan(got), np.isnan(expected))
+    assert np.allclose(got[~np.isnan(got)], expected[~np.isnan(expected)])
+
+
+def test_honours_concave_face_topology():
+    """An L-shaped TIN leaves its notch empty instead of filling the hull."""
+    verts = np.array([
+        [0, 0, 0], [2, 0, 0], [2, 1, 0], [1, 1, 0], [1, 2, 0], [0, 2, 0],
+    ], dtype=float)
+    verts[:, 2] = verts[:, 0] + verts[:, 1]
+    faces = np.array([[0, 1, 2], [0, 2, 3], [0, 3, 4], [0, 4, 5]])
+    g = np.array([0.0, 0.5, 1.0, 1.5, 2.0])
+
+    z = rasterize_tin(verts, faces, g, g)
+
+    assert np.isnan(z[4, 4]) and np.isnan(z[3, 3])  # (2,2) and (1.5,1.5) are in the notch
+    assert z[2, 2] == 2.0  # shared vertex (1,1)
+    assert z[0, 4] == 2.0 and z[4, 0] == 2.0
+    assert np.count_nonzero(np.isnan(z)) == 4
@@ -0,0 +1,72 @@
+import numpy as np
+from scipy.spatial import Delaunay
+
+from src.core.calculations.tin_rasterizer import rasterize_tin
+from src.core.calculations.tin_volume import split_prism_volumes, volumes_between_tins
+from src.models.calculation import VolumeCalculation
+from src.models.surface import Surface
+
+SQUARE = np.array([[0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 10, 0]], dtype=float)
+SQUARE_FACES = np.array([[0, 1, 2], [0, 2, 3]])
+
+
+def _sloped(seed: int) -> Surface:
+    """z = x - 2 on a random triangulation of the 10 x 10 square."""
+    rng = np.random.default_rng(seed)
+    xy = np.vstack([rng.uniform(0, 10, size=(40, 2)), SQUARE[:, :2]])
+    return Surface.from_arrays("Sloped", np.column_stack([xy, xy[:, 0] - 2.0]), Delaunay(xy).simplices)
+
+
+def test_split_prism_volumes_cases():
+    area = np.full(4, 6.0)
+    h = np.array([[1.0, 2.0, 3.0], [-1.0, -2.0, -3.0], [3.0, -1.0, -1.0], [1.0, 1.0, -1.0]])
+    above, below = split_prism_volumes(area, h)
+    assert np.allclose(above - below, area * h.sum(axis=1) / 3)
+    assert np.allclose(above[:2], [12.0, 0.0]) and np.allclose(below[:2], [0.0, 12.0])
+    # One corner up: cap = A c^3 / (3 (c-a)(c-b)) = 6*27/(3*4*4)
+    assert np.isclose(above[2], 6 * 27 / 48)
+    # Two corners up: mirror of the one-corner case
+    assert np.isclose(below[3], 6 * 1 / (3 * 2 * 2))
+
+
+def test_surface_to_plane_splits_at_zero_crossing():
+    volumes = _sloped(0).calculate_volume_to_elevation(0.0)
+    # Above: integral of (x - 2) over 2 < x < 10; below: of (2 - x) over 0 < x < 2
+    assert np.isclose(volumes["cut"], 320.0) and np.isclose(volumes["fill"], 20.0)
+    assert np.isclose(volumes["net"], 300.0)
+
+
+def test_tin_over_tin_with_different_triangulations():
+    flat = Surface.from_arrays("Flat", SQUARE, SQUARE_FACES)
+    result = flat.calculate_volume_to_surface(_sloped(1))
+    assert np.isclose(result["cut"], 20.0) and np.isclose(result["fill"], 320.0)
+
+    # Two triangulations of the same plane have no volume between them
+    same = _sloped(2).calculate_volume_to_surface(_sloped(3))
+    assert same["cut"] < 1e-9 and same["fill"] < 1e-9
+
+
+def test_matches_fine_grid_on_random_tins():
+    rng = np.random.default_rng(5)
+    corners = SQUARE[:, :2] * 10
+    xy1 = np.vstack([rng.uniform(0, 100, size=(200, 2)), corners])
+    xy2 = np.vstack([rng.uniform(0, 100, size=(200, 2)), corners])
+    v1 = np.column_stack([xy1, np.sin(xy1[:, 0] / 10) * 3])
+    v2 = np.column_stack([xy2, np.cos(xy2[:, 1] / 10) * 3])
+    f1, f2 = Delaunay(xy1).simplices, Delaunay(xy2).simplices
+
+    cut, fill = volumes_between_tins(v1, f1, v2, f2)
+
+    res = 0.1
+    g = np.arange(res / 2, 100, res)
+    dz = rasterize_tin(v2, f2, g, g) - rasterize_tin(v1, f1, g, g)
+    assert np.isclose(cut, np.clip(-dz, 0, None).sum() * res * res, rtol=1e-3)
+    assert np.isclose(fill, np.clip(dz, 0, None).sum() * res * res, rtol=1e-3)
+
+
+def test_volume_calculation_model_uses_exact_engine():
+    calc = VolumeCalculation("Pad", VolumeCalculation.TYPE_SURFACE_TO_ELEVATION, _sloped(4))
+    calc.set_reference_elevation(0.0)
+    results = calc.calculate()
+    assert np.isclose(results["cut_volume"], 320.0) and np.isclose(results["fill_volume"], 20.0)
+    assert results["total_area"] == 100.0
@@ -45,3 +45,37 @@ def mocker(monkeypatch):
                 return dummy
 
         return _StubMocker(monkeypatch)
+
+
+@pytest.fixture
+def traced_layer():
+    """Factory of five random traced polylines at ``base`` .. ``base + 4``: ``traced_layer(seed, base)``."""
+    import numpy as np
+
+    def make(seed, base):
+        rng = np.random.default_rng(seed)
+        return [{"points": rng.uniform(0, 40, size=(25, 2)).tolist(), "elevation": base + e} for e in range(5)]
+
+    return make
+
+
+@pytest.fixture
+def traced_project(traced_layer):
+    """Factory of a project with surfaces triangulated from traced layers.
+
+    ``traced_project(name, [(surface_name, layer, seed, base), ...])``; the
+    surfaces are built at revision 0.
+    """
+    from digcalc_project.src.core.geometry.surface_builder import SurfaceBuilder
+    from digcalc_project.src.models.project import Project
+
+    def make(name, specs):
+        project = Project(name=name)
+        for surface_name, layer, seed, base in specs:
+            project.traced_polylines[layer] = traced_layer(seed, base)
+            surf = SurfaceBuilder.build_from_polylines(layer, project.traced_polylines[layer], 0)
+            surf.name = surface_name
+            project.surfaces[surface_name] = surf
+        return project
+
+    return make
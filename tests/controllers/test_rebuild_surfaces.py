@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from digcalc_project.src.ui.project_controller import ProjectController
+
+
+@pytest.fixture
+def controller(qtbot, traced_project):
+    ctrl = ProjectController(SimpleNamespace())
+    project = traced_project("Parallel", [("Existing Surface", "EG", 1, 100.0), ("Design Surface", "FG", 2, 95.0),
+                                          ("Pad", "Pads", 3, 98.0), ("Pad copy", "Pads", 3, 98.0)])
+    ctrl.current_project = project
+    yield ctrl
+    ctrl.rebuild_scheduler.shutdown()
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_rebuild_surfaces_builds_layers_then_lowest(qtbot, controller, workers):
+    project = controller.current_project
+    project.traced_polylines["Pads"][0]["points"][0] = [20.0, 20.0]
+    for layer in ("EG", "FG", "Pads"):
+        project.layer_revisions[layer] = 1
+
+    with qtbot.waitSignal(controller.surfaces_rebuilt):
+        controller.rebuild_surfaces(workers=workers)
+
+    for name in ("Existing Surface", "Design Surface", "Pad", "Pad copy"):
+        assert project.surfaces[name].name == name
+        assert project.surfaces[name].source_layer_revision == 1
+    assert project.surfaces["Pad"] is not project.surfaces["Pad copy"]
+    assert np.array_equal(project.surfaces["Pad"].faces, project.surfaces["Pad copy"].faces)
+    assert [20.0, 20.0] in project.surfaces["Pad"].vertices[:, :2].tolist()
+
+    # The composite was rebuilt from the new base surfaces
+    lowest = controller.lowest_surface()
+    assert lowest is not None and project.surfaces[lowest.name] is lowest
+
+
+def test_refresh_surfaces_publishes_through_the_scheduler(qtbot, controller, traced_layer):
+    project = controller.current_project
+    project.traced_polylines["EG"] = traced_layer(4, 101.0)
+    project._bump_layer_revision("EG")
+    pad = project.surfaces["Pad"]
+
+    with qtbot.waitSignal(controller.surfaces_rebuilt):
+        controller.refresh_surfaces(["Lowest"])
+
+    assert project.surfaces["Existing Surface"].source_layer_revision == 1
+    assert project.surfaces["Pad"] is pad
+    assert project.surfaces["Lowest"] is controller.lowest_surface()
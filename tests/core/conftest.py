@@ -0,0 +1,28 @@
+"""Shared fixtures for the core geometry tests."""
+import numpy as np
+import pytest
+
+from digcalc_project.src.models.surface import Surface
+
+
+@pytest.fixture
+def plane_grid():
+    """Factory of rasters of ``z = z0 + slope * x``: ``plane_grid(name, spacing, origin, size, z0, slope)``."""
+    def make(name, spacing, origin, size, z0, slope):
+        n = int(round(size / spacing)) + 1
+        x = origin[0] + np.arange(n) * spacing
+        surf = Surface(name)
+        surf.set_grid_data(np.tile(z0 + slope * x, (n, 1)), spacing, origin)
+        return surf
+
+    return make
+
+
+@pytest.fixture
+def plane_tin():
+    """Factory of two-triangle TINs of ``z = z0 + slope * x``: ``plane_tin(name, size, z0, slope)``."""
+    def make(name, size, z0, slope):
+        xy = np.array([[0, 0], [size, 0], [size, size], [0, size]], dtype=float)
+        return Surface.from_arrays(name, np.column_stack([xy, z0 + slope * xy[:, 0]]), [[0, 1, 2], [0, 2, 3]])
+
+    return make
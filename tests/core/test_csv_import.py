@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.geometry.grid_generator import GridGenerator
+from digcalc_project.src.core.importers import csv_parser
+from digcalc_project.src.core.importers.csv_parser import CSVParser
+from digcalc_project.src.core.importers.file_parser import FileParserError
+
+
+@pytest.fixture
+def survey_csv(tmp_path):
+    path = tmp_path / "drone.csv"
+    rows = ["# exported", "Id,Easting,Northing,Elevation"]
+    rows += [f"P{i},{100 + i},{200 + 2 * i},{50 + 0.5 * i}" for i in range(300)]
+    rows[50] = "P48,oops,296,74"          # non-numeric
+    rows[120] = "P118,218"                # short
+    rows[200] = "P198,298,596,inf"        # non-finite
+    rows.insert(250, "")                  # blank lines are not errors
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+def test_chunked_parse_matches_rows_and_counts_bad_ones(survey_csv, monkeypatch):
+    monkeypatch.setattr(csv_parser, "CHUNK_BYTES", 256)  # many small blocks
+    parser = CSVParser()
+    surface = parser.parse(str(survey_csv), {"skip_rows": 1, "x_col": "Easting", "y_col": "Northing",
+                                             "z_col": "Elevation"})
+
+    assert surface.name == "drone" and len(surface.vertices) == 297
+    assert parser.bad_rows == 3 and parser.bad_row_lines == [51, 121, 201]
+    good = np.array([i for i in range(300) if i not in (48, 118, 198)], dtype=float)
+    assert np.array_equal(surface.vertices, np.column_stack([100 + good, 200 + 2 * good, 50 + 0.5 * good]))
+    assert parser.validate() and parser.get_bounds() == (100.0, 200.0, 399.0, 798.0)
+    assert len(parser.get_points()) == 297
+
+
+def test_positional_columns_and_delimiter(tmp_path):
+    path = tmp_path / "points.txt"
+    path.write_text("1;2;3\n4;5;6\n")
+    surface = CSVParser().parse(str(path), {"delimiter": ";"})
+    assert surface.vertices.tolist() == [[1, 2, 3], [4, 5, 6]]
+
+
+def test_chunks_stream_into_grid_binning(survey_csv):
+    parser = CSVParser()
+    options = {"skip_rows": 1, "x_col": "Easting", "y_col": "Northing", "z_col": "Elevation"}
+    grid, origin = GridGenerator().bin_points(parser.iter_chunks(str(survey_csv), options), 10.0,
+                                              "min", bounds=(100, 200, 399, 798))
+    assert origin == (100.0, 200.0) and np.nanmin(grid) == pytest.approx(50.0)
+
+
+def test_missing_header_column_and_file(survey_csv, tmp_path):
+    with pytest.raises(FileParserError):
+        CSVParser().parse(str(survey_csv), {"skip_rows": 1, "x_col": "X", "y_col": "Northing", "z_col": "Z"})
+    with pytest.raises(FileParserError):
+        CSVParser().parse(str(tmp_path / "missing.csv"))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.geometry.grid_generator import GridGenerator, fill_grid_holes
+from digcalc_project.src.models.surface import Point3D
+
+
+@pytest.fixture
+def cloud():
+    rng = np.random.default_rng(11)
+    xy = rng.uniform(0, 10, size=(5000, 2))
+    z = 100 + xy[:, 0] * 0.5 + rng.normal(0, 0.1, len(xy))
+    return np.column_stack([xy, z])
+
+
+@pytest.mark.parametrize("aggregation", ["mean", "min", "max", "median", "count"])
+def test_binning_matches_per_node_reference(cloud, aggregation):
+    grid, origin = GridGenerator().bin_points(cloud, 1.0, aggregation, chunk_size=777)
+    assert origin == pytest.approx((cloud[:, 0].min(), cloud[:, 1].min()))
+
+    col = np.floor(cloud[:, 0] - origin[0] + 0.5).astype(int)
+    row = np.floor(cloud[:, 1] - origin[1] + 0.5).astype(int)
+    reduce = {"mean": np.mean, "min": np.min, "max": np.max, "median": np.median, "count": len}[aggregation]
+    for r, c in [(0, 0), (3, 4), (5, 9), (10, 10)]:
+        z = cloud[(row == r) & (col == c), 2]
+        expected = reduce(z) if len(z) else (0 if aggregation == "count" else np.nan)
+        assert grid[r, c] == pytest.approx(expected, rel=1e-12, nan_ok=True)  # full float64 precision
+
+
+def test_streamed_chunks_and_point_objects_agree(cloud):
+    gen = GridGenerator()
+    whole, _ = gen.bin_points(cloud, 0.5)
+    bounds = (*cloud[:, :2].min(axis=0), *cloud[:, :2].max(axis=0))
+    streamed, _ = gen.bin_points(iter(np.array_split(cloud, 7)), 0.5, bounds=bounds)
+    objects, _ = gen.bin_points([Point3D(*p) for p in cloud[:500]], 0.5,
+                                bounds=bounds)
+    np.testing.assert_allclose(streamed, whole, equal_nan=True)
+    assert objects.shape == whole.shape
+
+    with pytest.raises(ValueError):
+        gen.bin_points(iter([cloud]), 0.5)
+
+
+def test_list_of_uneven_chunks(cloud):
+    gen = GridGenerator()
+    whole, _ = gen.bin_points(cloud, 0.5)
+    listed, _ = gen.bin_points([cloud[:10], cloud[10:17], cloud[17:]], 0.5)
+    np.testing.assert_allclose(listed, whole, equal_nan=True)
+
+
+def test_fill_holes_only_fills_enclosed_gaps():
+    grid = np.ones((7, 7))
+    grid[3, 3] = np.nan          # enclosed hole
+    grid[0, :] = np.nan          # open edge
+    filled = fill_grid_holes(grid)
+    assert filled[3, 3] == 1.0 and np.isnan(filled[0]).all()
+
+
+def test_generate_from_points_builds_grid_surface(cloud):
+    surface = GridGenerator().generate_from_points(cloud, 2.0, "Scan", aggregation="max", fill_holes=True)
+    assert surface.grid_spacing == 2.0 and surface.grid_data.shape == (6, 6)
+    assert len(surface.vertices) == np.count_nonzero(~np.isnan(surface.grid_data))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.importers import csv_parser
+from digcalc_project.src.core.importers.csv_parser import CSVParser
+from digcalc_project.src.core.importers.file_parser import FileParserError
+from digcalc_project.src.core.importers.import_job import ImportCancelled, ImportJob
+from digcalc_project.src.core.importers.dxf_parser import DXFParser
+from digcalc_project.src.models.surface import Surface
+
+
+@pytest.fixture
+def points_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_parser, "CHUNK_BYTES", 512)
+    path = tmp_path / "points.csv"
+    path.write_text("".join(f"{i},{2 * i},{0.5 * i}\n" for i in range(2000)))
+    return path
+
+
+def test_chunked_job_reports_bytes_and_rows(points_csv):
+    reports = []
+    job = ImportJob(CSVParser(), str(points_csv), surface_name="Existing", progress_interval=0)
+    surface = job.run(reports.append)
+
+    assert surface.name == "Existing" and len(surface.vertices) == 2000
+    assert len(reports) > 10
+    assert [r.rows for r in reports] == sorted(r.rows for r in reports)
+    assert np.all(np.diff([r.bytes_read for r in reports]) >= 0)
+    size = points_csv.stat().st_size
+    assert reports[-1].rows == 2000 and reports[-1].bytes_read == reports[-1].total_bytes == size
+    assert reports[-1].fraction == 1.0 and job.progress is reports[-1]
+
+
+def test_cancel_stops_before_the_next_chunk(points_csv):
+    job = ImportJob(CSVParser(), str(points_csv), progress_interval=0)
+    seen = []
+
+    def on_progress(progress):
+        seen.append(progress.rows)
+        if len(seen) == 3:
+            job.cancel()
+
+    with pytest.raises(ImportCancelled):
+        job.run(on_progress)
+    assert len(seen) == 3 and job.cancelled
+
+
+def test_parsers_without_chunks_fall_back_to_parse(monkeypatch, tmp_path):
+    path = tmp_path / "tin.dxf"
+    path.write_text("0\nEOF\n")
+    parser = DXFParser()
+    monkeypatch.setattr(parser, "parse", lambda *_: Surface.from_arrays("tin", np.eye(3)))
+    reports = []
+
+    surface = ImportJob(parser, str(path)).run(reports.append)
+    assert not parser.supports_chunks and surface.name == "tin"
+    assert [(r.rows, r.fraction) for r in reports] == [(3, 1.0)]
+
+
+def test_errors_are_parser_errors(tmp_path):
+    with pytest.raises(FileParserError):
+        ImportJob(CSVParser(), str(tmp_path / "missing.csv")).run()
@@ -0,0 +1,164 @@
+import os
+
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.importers import landxml_index, landxml_parser
+from digcalc_project.src.core.importers.file_parser import FileParserError
+from digcalc_project.src.core.importers.import_job import ImportJob
+from digcalc_project.src.core.importers.landxml_parser import LandXMLParser
+
+HEADER = '<?xml version="1.0" encoding="utf-8"?>\n<LandXML xmlns="http://www.landxml.org/schema/LandXML-1.2" version="1.2">\n'
+
+
+def _surface_xml(name, ids, size):
+    """A size x size node TIN with the given point ids (row-major), as LandXML."""
+    rows = [f'<Surface name="{name}"><Definition surfType="TIN"><Pnts>']
+    for k, pid in enumerate(ids):
+        r, c = divmod(k, size)
+        rows.append(f'<P id="{pid}">{10.0 * r} {10.0 * c} {r + 0.5 * c}</P>')
+    rows.append("</Pnts><Faces>")
+    for r in range(size - 1):
+        for c in range(size - 1):
+            a, b, d, e = (ids[i] for i in (r * size + c, r * size + c + 1, (r + 1) * size + c, (r + 1) * size + c + 1))
+            rows.append(f"<F>{a} {b} {e}</F><F>{a} {e} {d}</F>")
+    rows.append("</Faces></Definition></Surface>")
+    return "\n".join(rows)
+
+
+@pytest.fixture
+def two_surfaces(tmp_path):
+    path = tmp_path / "site.xml"
+    path.write_text(HEADER + "<Surfaces>" + _surface_xml("EG", list(range(1, 101)), 10)
+                    + _surface_xml("FG", [f"fg{i}" for i in range(25)], 5) + "</Surfaces></LandXML>\n")
+    return path
+
+
+def test_streamed_tin_matches_the_file(two_surfaces, monkeypatch):
+    monkeypatch.setattr(landxml_parser, "CHUNK_ROWS", 16)
+    parser = LandXMLParser()
+    chunks = list(parser.iter_chunks(str(two_surfaces)))
+    assert len(chunks) > 10 and max(len(c.values) for c in chunks) <= 16
+    assert {c.surface for c in chunks} == {"EG"}  # FG is listed but not decoded
+
+    surface = parser.build_surface(str(two_surfaces), chunks)
+    assert surface.name == "EG" and parser.get_available_surfaces() == ["EG", "FG"]
+    assert len(surface.vertices) == 100 and len(surface.faces) == 2 * 81
+    # Northing Easting Elevation -> x, y, z; point 12 is row 1, column 1
+    assert surface.vertices[11].tolist() == [10.0, 10.0, 1.5]
+    assert surface.faces[0].tolist() == [0, 1, 11]
+    assert parser.get_points()[11].id == "12" and parser.get_bounds() == (0.0, 0.0, 90.0, 90.0)
+
+
+def test_select_surface_with_string_ids(two_surfaces):
+    parser = LandXMLParser()
+    surface = parser.parse(str(two_surfaces), {"surface_name": "FG"})
+    assert surface.name == "FG" and len(surface.vertices) == 25 and len(surface.faces) == 32
+    assert surface.faces[1].tolist() == [0, 6, 5]
+
+    with pytest.raises(FileParserError):
+        parser.parse(str(two_surfaces), {"surface_name": "Subgrade"})
+
+
+def test_bad_rows_and_unknown_face_ids_are_skipped(tmp_path):
+    path = tmp_path / "bad.xml"
+    path.write_text(HEADER + '<Surfaces><Surface name="S"><Definition><Pnts>'
+                    '<P id="7">0 0 1</P><P id="9">0 10 2</P><P id="3">10 0 3</P><P id="4">oops</P><P>1 1 1</P>'
+                    '</Pnts><Faces><F>7 9 3</F><F>7 3 4</F><F>9</F></Faces></Definition></Surface></Surfaces></LandXML>')
+    surface = LandXMLParser().parse(str(path))
+    assert len(surface.vertices) == 3 and surface.faces.tolist() == [[0, 1, 2]]
+
+
+def test_cgpoints_fallback_and_invalid_files(tmp_path):
+    cg = tmp_path / "cg.xml"
+    cg.write_text(HEADER + '<CgPoints><CgPoint name="a">200 100 50</CgPoint><CgPoint>210 110 55</CgPoint>'
+                  "</CgPoints></LandXML>")
+    surface = LandXMLParser().parse(str(cg))
+    assert surface.name == "cg_Points" and surface.vertices.tolist() == [[100, 200, 50], [110, 210, 55]]
+
+    other = tmp_path / "other.xml"
+    other.write_text("<NotLandXML><Surfaces/></NotLandXML>")
+    broken = tmp_path / "broken.xml"
+    broken.write_text(HEADER + "<Surfaces>")
+    for path in (other, broken, tmp_path / "missing.xml"):
+        with pytest.raises(FileParserError):
+            LandXMLParser().parse(str(path))
+
+
+def test_landxml_imports_as_a_job(two_surfaces, monkeypatch):
+    monkeypatch.setattr(landxml_parser, "CHUNK_ROWS", 16)
+    reports = []
+    surface = ImportJob(LandXMLParser(), str(two_surfaces), progress_interval=0).run(reports.append)
+    assert len(surface.faces) == 162 and reports[-1].rows == 100 + 162
+    assert reports[-1].fraction == 1.0 and np.all(np.diff([r.rows for r in reports]) >= 0)
+
+
+def test_index_lists_surfaces_once_and_loads_only_their_bytes(two_surfaces, monkeypatch):
+    calls = []
+    real_build = landxml_index.build_index
+    monkeypatch.setattr(landxml_index, "build_index", lambda path: calls.append(path) or real_build(path))
+
+    parser = LandXMLParser()
+    assert parser.get_available_surfaces(str(two_surfaces)) == ["EG", "FG"]
+    index = parser.get_surface_index(str(two_surfaces))
+    assert [(s.n_points, s.n_faces) for s in index.surfaces] == [(100, 162), (25, 32)]
+    assert len(calls) == 1  # listed and looked up from the cache
+
+    fg = index.get("FG")
+    surface = parser.parse(str(two_surfaces), {"surface_name": "FG"})
+    assert len(surface.vertices) == 25 and len(calls) == 1
+    assert parser.bytes_read <= fg.nbytes and parser.expected_bytes(str(two_surfaces), {"surface_name": "FG"}) == fg.nbytes
+
+    # An edited file gets a new fingerprint and is indexed again
+    two_surfaces.write_text(two_surfaces.read_text().replace('name="FG"', 'name="Subgrade"'))
+    os.utime(two_surfaces, ns=(0, 10**9))
+    assert parser.get_available_surfaces(str(two_surfaces)) == ["EG", "Subgrade"] and len(calls) == 2
+
+
+def test_byte_ranges_keep_prefixes_and_encoding(tmp_path):
+    path = tmp_path / "latin.xml"
+    path.write_bytes(('<?xml version="1.0" encoding="ISO-8859-1"?>\n'
+                      '<lx:LandXML xmlns:lx="http://www.landxml.org/schema/LandXML-1.2"><lx:Surfaces>'
+                      '<lx:Surface name="Böschung"/>'
+                      '<lx:Surface name="Sohle"><lx:Definition><lx:Pnts><lx:P id="1">0 0 1</lx:P>'
+                      '<lx:P id="2">0 5 1</lx:P><lx:P id="3">5 0 2</lx:P></lx:Pnts>'
+                      '<lx:Faces><lx:F>1 2 3</lx:F></lx:Faces></lx:Definition></lx:Surface>'
+                      '</lx:Surfaces></lx:LandXML>').encode("latin-1"))
+    parser = LandXMLParser()
+    assert parser.get_available_surfaces(str(path)) == ["Böschung", "Sohle"]
+    surface = parser.parse(str(path), {"surface_name": "Sohle"})
+    assert surface.name == "Sohle" and surface.faces.tolist() == [[0, 1, 2]]
+    with pytest.raises(FileParserError):
+        parser.parse(str(path))  # the first surface is empty
+
+
+def test_scanned_blocks_match_the_xml_reader(two_surfaces, monkeypatch):
+    monkeypatch.setattr(landxml_parser, "SCAN_BYTES", 64)  # elements cut across blocks
+    two_surfaces.write_text(two_surfaces.read_text().replace("<F>1 2 12</F>", '<F i="1">1 2 12</F>'))
+    reference = LandXMLParser()
+    with open(two_surfaces, "rb") as f:
+        expected = reference.build_surface(str(two_surfaces), list(reference._stream(f)))
+
+    skipped = []
+    real_stream = LandXMLParser._stream
+    monkeypatch.setattr(LandXMLParser, "_stream",
+                        lambda self, f, *args, skip=None: skipped.append(skip) or real_stream(self, f, *args, skip=skip))
+    surface = LandXMLParser().parse(str(two_surfaces))
+    assert not skipped  # decoded from the raw bytes alone
+    assert np.array_equal(surface.vertices, expected.vertices) and np.array_equal(surface.faces, expected.faces)
+
+    # A comment midway hands the rest to iterparse without repeating rows
+    two_surfaces.write_text(two_surfaces.read_text().replace('<P id="50">', '<!-- edited --><P id="50">'))
+    surface = LandXMLParser().parse(str(two_surfaces))
+    assert len(skipped) == 1 and 0 < skipped[0]["points"] <= 49 and skipped[0]["faces"] == 0
+    assert np.array_equal(surface.vertices, expected.vertices) and np.array_equal(surface.faces, expected.faces)
+
+
+def test_ids_that_are_not_canonical_integers_stay_text(tmp_path):
+    path = tmp_path / "zeros.xml"
+    path.write_text(HEADER + '<Surfaces><Surface name="S"><Definition><Pnts>'
+                    '<P id="007">0 0 1</P><P id="7">0 10 2</P><P id="08">10 0 3</P>'
+                    '</Pnts><Faces><F>7 08 007</F></Faces></Definition></Surface></Surfaces></LandXML>')
+    parser = LandXMLParser()
+    surface = parser.parse(str(path))
+    assert surface.faces.tolist() == [[1, 2, 0]] and [p.id for p in parser.get_points()] == ["007", "7", "08"]
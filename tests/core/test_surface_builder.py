@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.geometry.surface_builder import SurfaceBuilder, SurfaceBuilderError
+
+
+def test_build_from_polylines_dedupes_and_triangulates():
+    polylines = [
+        {"points": [(0, 0), (10, 0), (10, 10)], "elevation": 5.0},
+        # Repeats (10, 10) at the same elevation and adds one new vertex
+        {"points": [(10, 10), (0, 10)], "elevation": 5.0},
+        {"points": [(5, 5)], "elevation": None},  # skipped: no elevation
+    ]
+    surf = SurfaceBuilder.build_from_polylines("Contours", polylines, revision=3)
+
+    assert surf.name == "Contours_Surface"
+    assert surf.source_layer_name == "Contours" and surf.source_layer_revision == 3
+    assert surf.vertices.tolist() == [[0, 0, 5], [10, 0, 5], [10, 10, 5], [0, 10, 5]]
+    assert surf.faces.shape == (2, 3)
+    assert np.isclose(surf.calculate_volume_to_elevation(0.0)["cut"], 500.0)
+
+
+def test_build_from_polylines_needs_three_points():
+    with pytest.raises(SurfaceBuilderError):
+        SurfaceBuilder.build_from_polylines("Thin", [{"points": [(0, 0), (1, 1)], "elevation": 1.0}], 1)
+
+
+def test_incremental_tin_matches_full_delaunay_after_edits():
+    from scipy.spatial import Delaunay
+
+    from digcalc_project.src.core.geometry.incremental_tin import IncrementalTin
+
+    def triangles(vertices, faces):
+        return sorted(tuple(sorted(map(tuple, t))) for t in vertices[faces][:, :, :2].tolist())
+
+    rng = np.random.default_rng(7)
+    pts = rng.uniform(0, 100, size=(400, 3))
+    tin = IncrementalTin()
+    assert tin.update(pts, revision=1) is False  # first build is a full triangulation
+
+    for revision in range(2, 40):
+        op = revision % 3
+        if op == 0:
+            pts = np.vstack([pts, rng.uniform(10, 90, size=(1, 3))])
+        elif op == 1:
+            pts = np.delete(pts, rng.integers(len(pts)), axis=0)
+        else:
+            pts = pts.copy()
+            pts[rng.integers(len(pts)), :2] += rng.normal(0, 1.0, 2)
+        tin.update(pts, revision)
+        assert tin.revision == revision
+        assert triangles(tin.vertices, tin.faces) == triangles(tin.vertices, Delaunay(tin.vertices[:, :2]).simplices)
+    assert tin.local_edits > 20
+
+
+def test_build_from_polylines_reuses_layer_tin():
+    from digcalc_project.src.core.geometry.incremental_tin import IncrementalTin
+
+    rng = np.random.default_rng(3)
+    polylines = [{"points": rng.uniform(0, 50, size=(30, 2)).tolist(), "elevation": float(e)} for e in range(10)]
+    tin = IncrementalTin()
+    first = SurfaceBuilder.build_from_polylines("L", polylines, revision=1, tin=tin)
+
+    polylines[4]["points"][7][0] += 0.25  # drag one vertex
+    second = SurfaceBuilder.build_from_polylines("L", polylines, revision=2, tin=tin)
+    fresh = SurfaceBuilder.build_from_polylines("L", polylines, revision=2)
+
+    assert tin.full_rebuilds == 1 and second.source_layer_revision == 2
+    assert len(second.vertices) == len(first.vertices) == len(fresh.vertices)
+    assert np.isclose(second.calculate_volume_to_elevation(0.0)["cut"],
+                      fresh.calculate_volume_to_elevation(0.0)["cut"])
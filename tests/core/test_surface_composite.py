@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.geometry.surface_builder import lowest_surface
+from digcalc_project.src.core.geometry.surface_composite import (
+    clip_surface,
+    composite_surfaces,
+    shared_grid,
+)
+
+
+def test_lowest_of_grids_with_different_spacing(plane_grid):
+    coarse = plane_grid("Existing", 2.0, (0.0, 0.0), 20.0, 10.0, 0.0)
+    fine = plane_grid("Design", 0.5, (0.0, 0.0), 20.0, 5.0, 0.5)  # crosses 10 at x = 10
+    low = lowest_surface(fine, coarse)
+
+    assert low.name == "Lowest" and low.metadata["color"] == "yellow"
+    assert low.is_raster and low.grid_spacing == 0.5 and low.grid_data.shape == (41, 41)
+    x = np.arange(41) * 0.5
+    assert np.allclose(low.grid_data, np.minimum(5.0 + 0.5 * x, 10.0)[None, :])
+    assert low._grid_pending  # no point objects were created
+
+
+def test_min_keeps_the_only_surface_where_the_other_is_missing(plane_grid):
+    left = plane_grid("Left", 1.0, (0.0, 0.0), 10.0, 3.0, 0.0)
+    right = plane_grid("Right", 1.0, (5.0, 0.0), 10.0, 1.0, 0.0)
+    low = composite_surfaces(left, right, "min")
+    assert low.get_bounds() == (0.0, 0.0, 15.0, 10.0)
+    assert np.all(low.grid_data[:, :5] == 3.0) and np.all(low.grid_data[:, 5:] == 1.0)
+
+
+def test_operations_mix_tins_and_grids(plane_grid, plane_tin):
+    tin = plane_tin("Tin", 20.0, 4.0, 0.25)
+    grid = plane_grid("Grid", 1.0, (0.0, 0.0), 20.0, 6.0, 0.0)
+    x = np.arange(21.0)
+
+    high = composite_surfaces(tin, grid, "max")
+    assert np.allclose(high.grid_data, np.maximum(4.0 + 0.25 * x, 6.0)[None, :])
+    diff = composite_surfaces(tin, grid, "difference", spacing=2.0)
+    assert diff.grid_data.shape == (11, 11)
+    assert np.allclose(diff.grid_data, (4.0 + 0.25 * x[::2] - 6.0)[None, :])
+
+    with pytest.raises(ValueError):
+        composite_surfaces(tin, grid, "median")
+
+
+def test_clip_by_polygon(plane_grid):
+    grid = plane_grid("Grid", 1.0, (0.0, 0.0), 20.0, 6.0, 0.0)
+    clipped = clip_surface(grid, [(2.5, 2.5), (12.5, 2.5), (12.5, 8.5), (2.5, 8.5)])
+    assert clipped.get_bounds() == (3.0, 3.0, 12.0, 8.0)
+    assert np.count_nonzero(~np.isnan(clipped.grid_data)) == 10 * 6
+
+    with pytest.raises(ValueError):
+        clip_surface(grid, [(30, 30), (40, 30), (40, 40)])
+
+
+def test_tin_only_grid_spacing_follows_vertex_count(plane_tin):
+    tin = plane_tin("Tin", 100.0, 0.0, 0.0)
+    gx, gy = shared_grid([tin])
+    assert gx[0] == 0.0 and gx[-1] >= 100.0 and gy[-1] >= 100.0
+    assert len(gx) * len(gy) <= 2 * 16 * 4
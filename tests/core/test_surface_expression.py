@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.calculations.interpolator_cache import InterpolatorCache
+from digcalc_project.src.core.calculations.volume_calculator import VolumeCalculator
+from digcalc_project.src.core.geometry.surface_composite import composite_surfaces
+from digcalc_project.src.core.geometry.surface_expression import (
+    ExpressionSurface,
+    SurfaceExpression,
+    as_expression,
+    clip,
+    maximum,
+    minimum,
+    offset,
+)
+from digcalc_project.src.models.project import Project
+from digcalc_project.src.models.surface import Surface
+
+
+def test_expression_surface_is_not_evaluated_until_sampled(plane_grid, plane_tin):
+    design, existing = plane_tin("Design", 40.0, 5.0, 0.25), plane_grid("Existing", 1.0, (0.0, 0.0), 40.0, 10.0, 0.0)
+    lowest = ExpressionSurface("Lowest", minimum(design, existing))
+
+    assert lowest.is_raster and lowest.grid_spacing == 1.0
+    assert lowest.get_bounds() == (0.0, 0.0, 40.0, 40.0)
+    assert lowest.fingerprint() == ExpressionSurface("Again", minimum(design, existing)).fingerprint()
+    assert not lowest.is_evaluated
+
+    # Nodes are evaluated exactly; the eager composite agrees
+    z = lowest.sample_grid(np.array([0.0, 10.0, 30.0]), np.array([2.0, 7.0]))
+    assert np.allclose(z, [[5.0, 7.5, 10.0]] * 2)
+    assert not lowest.is_evaluated
+    assert np.allclose(lowest.grid_data, composite_surfaces(design, existing, "min").grid_data)
+    assert lowest.is_evaluated and len(lowest.vertices) == 41 * 41
+    # The raster is the cached tile itself, not a second copy
+    assert lowest.grid_data is lowest.expression.sample(*lowest._axes) and not lowest.grid_data.flags.writeable
+    with pytest.raises(TypeError):
+        SurfaceExpression()
+
+
+def test_volume_samples_expression_tiles_and_reuses_them(plane_grid, plane_tin):
+    existing, design = plane_grid("Existing", 1.0, (0.0, 0.0), 40.0, 10.0, 0.0), plane_tin("Design", 40.0, 5.0, 0.25)
+    stripped = (as_expression(existing) - 0.5).to_surface("Stripped")
+    calc = VolumeCalculator(Project(name="Lazy"))
+
+    lazy = calc.calculate_grid_method(stripped, design, 1.0, tile_budget_mb=0.01, workers=1, reuse=False)
+    assert not stripped.is_evaluated
+    eager = Surface("Eager")
+    eager.set_grid_data(np.full((41, 41), 9.5), 1.0, (0.0, 0.0))
+    expected = calc.calculate_grid_method(eager, design, 1.0, workers=1, reuse=False)
+    assert lazy["cut"] == pytest.approx(expected["cut"]) and lazy["fill"] == pytest.approx(expected["fill"])
+
+    cache = InterpolatorCache()
+    hits = cache.hits
+    again = calc.calculate_grid_method(stripped, design, 1.0, tile_budget_mb=0.01, workers=1, reuse=False)
+    assert again["cut"] == lazy["cut"] and cache.hits > hits
+
+
+def test_default_reuse_samples_expression_lazily(plane_grid, plane_tin):
+    design, existing = plane_tin("Design", 40.0, 5.0, 0.25), plane_grid("Existing", 1.0, (0.0, 0.0), 40.0, 10.0, 0.0)
+    lowest = ExpressionSurface("Lowest", minimum(design, existing))
+    calc = VolumeCalculator(Project(name="Session"))
+
+    first = calc.calculate_grid_method(lowest, design, 1.0, tile_budget_mb=0.01, workers=1)
+    again = calc.calculate_grid_method(lowest, design, 1.0, tile_budget_mb=0.01, workers=1)
+    assert not lowest.is_evaluated and lowest.get_bounds() is not None
+    assert again["cut"] == pytest.approx(first["cut"]) and again["fill"] == pytest.approx(first["fill"])
+
+
+def test_offset_max_and_clip(plane_grid, plane_tin):
+    low, high = plane_grid("Low", 1.0, (0.0, 0.0), 10.0, 2.0, 0.0), plane_tin("High", 10.0, 1.0, 0.5)
+    gx, gy = np.array([0.0, 4.0, 8.0]), np.array([5.0])
+
+    assert np.allclose(offset(low, 0.5).sample(gx, gy), [[2.5, 2.5, 2.5]])
+    assert np.allclose((as_expression(high) - low).sample(gx, gy), [[-1.0, 1.0, 3.0]])
+    assert np.allclose(maximum(low, high).sample(gx, gy), [[2.0, 3.0, 5.0]])
+
+    pad = clip(high, [(2, 2), (6, 2), (6, 8), (2, 8)])
+    assert pad.bounds() == (2.0, 2.0, 6.0, 8.0)
+    assert np.allclose(pad.sample(gx, gy), [[np.nan, 3.0, np.nan]], equal_nan=True)
+    with pytest.raises(ValueError):
+        clip(high, [(0, 0), (1, 1)])
+
+
+def test_project_lowest_is_lazy(plane_grid, plane_tin):
+    project = Project(name="Lowest")
+    project.surfaces["Design Surface"] = plane_tin("Design Surface", 20.0, 5.0, 0.5)
+    project.surfaces["Existing Surface"] = plane_grid("Existing Surface", 0.5, (0.0, 0.0), 20.0, 8.0, 0.0)
+
+    lowest = project.artifacts.get(project.lowest_artifact())
+    assert isinstance(lowest, ExpressionSurface) and "Lowest" not in project.surfaces
+    assert not lowest.is_evaluated and lowest.metadata["color"] == "yellow"
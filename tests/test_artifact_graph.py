@@ -0,0 +1,89 @@
+import pytest
+
+from digcalc_project.src.core.geometry.surface_builder import SurfaceBuilder
+from digcalc_project.src.models.artifact_graph import ArtifactCycleError, ArtifactGraph
+
+
+def test_graph_recomputes_lazily_with_early_cutoff():
+    revs = {"a": 1}
+    calls = []
+    graph = ArtifactGraph()
+    graph.define("a", lambda: revs["a"] // 2, probe=lambda: revs["a"], fingerprint=lambda v: v)
+    graph.define("b", lambda a: calls.append("b") or a * 10, inputs=["a"])
+    graph.define("c", lambda b: calls.append("c") or b + 1, inputs=["b"])
+
+    assert graph.get("c") == 1 and calls == ["b", "c"]
+    assert graph.get("c") == 1 and calls == ["b", "c"]  # cached
+
+    revs["a"] = 0  # same value (0 // 2 == 1 // 2): revision kept, dependants untouched
+    assert graph.is_stale("c")
+    graph.get("c")
+    assert calls == ["b", "c"] and not graph.is_stale("c")
+
+    revs["a"] = 4
+    assert graph.get("c") == 21 and calls == ["b", "c", "b", "c"]
+    assert graph.downstream("a") == {"b", "c"}
+
+    graph.define("a", lambda c: c, inputs=["c"])
+    with pytest.raises(ArtifactCycleError):
+        graph.get("c")
+
+
+@pytest.fixture
+def project(traced_project):
+    return traced_project("Artifacts", [("Existing Surface", "EG", 1, 100.0), ("Design Surface", "FG", 2, 97.0),
+                                        ("Pad", "Pads", 3, 98.0)])
+
+
+def _rebuild(project, name, layer):
+    surf = SurfaceBuilder.build_from_polylines(layer, project.traced_polylines[layer], project.layer_revisions[layer])
+    surf.name = name
+    project.surfaces[name] = surf
+    return surf
+
+
+def test_unrelated_layer_edit_keeps_volume(project, traced_layer):
+    key = project.volume_artifact("Existing Surface", "Design Surface", 2.0)
+    first = project.artifacts.get(key)
+    lowest_key = project.lowest_artifact()
+    lowest = project.artifacts.get(lowest_key)
+    assert "Lowest" not in project.surfaces  # the graph does not install surfaces
+
+    # Editing and rebuilding the pad layer touches neither the volume nor Lowest
+    project.traced_polylines["Pads"][0]["points"][0] = [1.0, 1.0]
+    project._bump_layer_revision("Pads")
+    pad = _rebuild(project, "Pad", "Pads")
+    assert project.artifacts.get(project.surface_artifact("Pad")) is pad
+    assert not project.artifacts.is_stale(key) and not project.artifacts.is_stale(lowest_key)
+    assert project.artifacts.get(key) is first and project.artifacts.get(lowest_key) is lowest
+
+    # Editing the existing-ground layer flags everything downstream of it ...
+    old_existing = project.surfaces["Existing Surface"]
+    project.traced_polylines["EG"] = traced_layer(4, 101.0)
+    project._bump_layer_revision("EG")
+    assert project.artifacts.is_stale(key) and project.artifacts.is_stale(lowest_key)
+    # ... but the graph never rebuilds the surface: until it is replaced the
+    # installed one is used and nothing is recomputed
+    assert project.artifacts.get(key) is first
+    assert project.surfaces["Existing Surface"] is old_existing
+
+    _rebuild(project, "Existing Surface", "EG")
+    assert project.artifacts.is_stale(key)
+    again = project.artifacts.get(key)
+    assert again is not first and again["cut"] != first["cut"]
+    assert project.artifacts.get(lowest_key) is not lowest
+
+
+def test_report_tracks_its_sections(project):
+    volume = project.volume_artifact("Existing Surface", "Design Surface", 2.0)
+    slices = project.slice_artifact("Existing Surface", "Design Surface", 2.0, slice_thickness_ft=1.0)
+    report = project.report_artifact(volume, slices)
+
+    data = project.artifacts.get(report)
+    assert set(data) == {volume, slices} and data[slices]
+    revision = project.artifacts.revision(report)
+    project.artifacts.get(report)
+    assert project.artifacts.revision(report) == revision
+
+    project.regions = []  # unchanged region state keeps everything valid
+    assert not project.artifacts.is_stale(report)
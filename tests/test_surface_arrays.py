@@ -0,0 +1,130 @@
+import numpy as np
+
+from digcalc_project.src.models.surface import Point3D, Surface, Triangle
+
+
+def _square() -> Surface:
+    verts = np.array([[0, 0, 1], [10, 0, 2], [10, 10, 3], [0, 10, 4]], dtype=float)
+    faces = np.array([[0, 1, 2], [0, 2, 3]])
+    return Surface.from_arrays("Square", verts, faces)
+
+
+def test_arrays_are_zero_copy():
+    """vertices/faces expose the stored arrays with the documented dtypes."""
+    surf = _square()
+    assert surf.vertices.shape == (4, 3) and surf.vertices.dtype == np.float64
+    assert surf.faces.shape == (2, 3) and surf.faces.dtype == np.int32
+    surf.vertices[0, 2] = 9.0
+    assert next(iter(surf.points.values())).z == 9.0
+    surf.vertices[0, 2] = 1.0
+    assert surf.get_bounds() == (0.0, 0.0, 10.0, 10.0)
+    assert surf.get_elevation_range() == (1.0, 4.0)
+
+
+def test_dict_views_match_arrays():
+    """Legacy points/triangles views are consistent with the arrays."""
+    surf = _square()
+    assert len(surf.points) == 4 and len(surf.triangles) == 2
+    zs = sorted(p.z for p in surf.points.values())
+    assert zs == [1.0, 2.0, 3.0, 4.0]
+    for tri in surf.triangles.values():
+        for p in tri.get_points():
+            assert p.id in surf.points
+
+
+def test_legacy_mutation_writes_through():
+    """add_point/add_triangle and dict assignment update the arrays."""
+    surf = Surface(name="Legacy")
+    a, b, c = Point3D(0, 0, 0), Point3D(1, 0, 0), Point3D(0, 1, 5)
+    surf.add_triangle(Triangle(a, b, c))
+    assert surf.vertices.shape == (3, 3)
+    assert surf.faces.tolist() == [[0, 1, 2]]
+
+    surf.points[c.id] = Point3D(0, 1, 7, point_id=c.id)
+    assert surf.vertices[2, 2] == 7.0
+
+    del surf.points[a.id]
+    assert len(surf.points) == 2
+    assert len(surf.triangles) == 0
+
+
+def test_dict_round_trip_preserves_ids():
+    """to_dict/from_dict keep ids and face topology."""
+    surf = _square()
+    data = surf.to_dict()
+    clone = Surface.from_dict(data)
+    assert list(clone.points) == list(surf.points)
+    assert np.array_equal(clone.vertices, surf.vertices)
+    assert np.array_equal(clone.faces, surf.faces)
+
+
+def test_points_and_triangles_are_slotted_with_lazy_ids():
+    p1, p2, p3 = Point3D(0, 0, 0), Point3D(1, 0, 0), Point3D(0, 1, 0)
+    assert not hasattr(p1, "__dict__")
+    assert p1._id is None
+    assert p1.id == p1.id and len(p1.id) < 36
+    assert Triangle(p1, p2, p3) == Triangle(p3, p1, p2)
+    assert Triangle(p1, p2, p3) != Triangle(p1, p2, Point3D(0, 1, 0))
+
+
+def test_legacy_uuid_ids_are_migrated_on_load():
+    import uuid
+
+    pts = {str(uuid.uuid4()): (x, y, z) for x, y, z in [(0, 0, 1), (10, 0, 2), (10, 10, 3)]}
+    point_dicts = {pid: {"x": x, "y": y, "z": z, "id": pid} for pid, (x, y, z) in pts.items()}
+    old_tid = str(uuid.uuid4())
+    a, b, c = point_dicts.values()
+    data = {"name": "Old", "points": point_dicts,
+            "triangles": {old_tid: {"p1": a, "p2": b, "p3": c, "id": old_tid}}}
+
+    surf = Surface.from_dict(data)
+    assert len(surf.points) == 3 and len(surf.triangles) == 1
+    assert all(len(pid) < 36 for pid in surf.points)
+    assert set(surf.legacy_id_map) == set(pts) | {old_tid}
+    new_a = surf.points[surf.legacy_id_map[a["id"]]]
+    assert (new_a.x, new_a.y, new_a.z) == (0.0, 0.0, 1.0)
+    # Compact ids survive a save/load round trip unchanged
+    assert set(Surface.from_dict(surf.to_dict()).points) == set(surf.points)
+
+
+def _ramp_grid() -> Surface:
+    """10x20 raster of z = 100 + x, with one missing cell."""
+    x = 5.0 + np.arange(20) * 2.0
+    grid = np.tile(100.0 + x, (10, 1))
+    grid[3, 4] = np.nan
+    surf = Surface("Grid")
+    surf.set_grid_data(grid, 2.0, (5.0, 7.0))
+    return surf
+
+
+def test_grid_surface_stays_raster_until_points_are_requested():
+    """Bounds, ranges and counts are answered from the raster without vertices."""
+    surf = _ramp_grid()
+    assert surf.is_raster and surf._grid_pending
+    assert surf.get_bounds() == (5.0, 7.0, 43.0, 25.0)
+    assert surf.get_elevation_range() == (105.0, 143.0)
+    assert len(surf.points) == 199 and "199 points" in str(surf)
+    fingerprint = surf.fingerprint()
+    assert surf._grid_pending
+
+    # Materialised on demand, row-major over the non-NaN cells
+    assert surf.vertices.shape == (199, 3) and not surf._grid_pending
+    assert tuple(surf.vertices[0]) == (5.0, 7.0, 105.0)
+    assert surf.is_raster and surf.fingerprint() == fingerprint
+
+    # Editing the point geometry hands authority back to the vertex arrays
+    surf.add_point(Point3D(0.0, 0.0, 0.0))
+    assert not surf.is_raster and surf.get_bounds() == (0.0, 0.0, 43.0, 25.0)
+
+
+def test_grid_surface_samples_and_triangulates_its_raster():
+    surf = _ramp_grid()
+    z = surf.sample_grid(np.array([4.0, 6.0, 13.0, 44.0]), np.array([8.0, 13.0]))
+    assert np.allclose(z[:, :2], [[np.nan, 106.0]] * 2, equal_nan=True)
+    assert np.isnan(z[:, 3]).all()
+    assert np.isnan(z[1, 2]) and z[0, 2] == 113.0  # next to the missing cell
+
+    faces = surf.triangulated_faces()
+    assert faces.shape == (2 * (9 * 19 - 4), 3) and surf._grid_pending
+    plane = surf.calculate_volume_to_elevation(100.0)
+    assert plane["fill"] == 0.0 and plane["cut"] > 0.0
@@ -0,0 +1,29 @@
+"""Shared fixtures for the UI tests."""
+import pytest
+from PySide6.QtCore import QObject, Signal
+
+
+class _Controller(QObject):
+    """Minimal stand-in for ``ProjectController`` used by the background workers."""
+
+    surfaces_rebuilt = Signal()
+
+    def __init__(self, project):
+        super().__init__()
+        self.project = project
+        self.modified = False
+
+    def get_current_project(self):
+        return self.project
+
+    def rebuild_lowest(self):
+        pass
+
+    def set_project_modified(self, modified=True):
+        self.modified = modified
+
+
+@pytest.fixture
+def make_controller(qtbot):
+    """Factory building a controller stub around a project (``qtbot`` provides the QApplication)."""
+    return _Controller
@@ -0,0 +1,30 @@
+from digcalc_project.src.core.calculations.interpolator_cache import InterpolatorCache
+from digcalc_project.src.core.importers.landxml_parser import LandXMLParser
+from digcalc_project.src.ui.dialogs.import_options_dialog import ImportOptionsDialog
+
+XML = """<?xml version="1.0" encoding="utf-8"?>
+<LandXML version="1.2"><Surfaces>
+<Surface name="EG"><Definition surfType="TIN"><Pnts><P id="1">0 0 1</P><P id="2">0 1 1</P><P id="3">1 0 1</P></Pnts>
+<Faces><F>1 2 3</F></Faces></Definition></Surface>
+<Surface name="FG"><Definition surfType="TIN"><Pnts><P id="1">0 0 2</P></Pnts></Definition></Surface>
+</Surfaces></LandXML>
+"""
+
+
+def test_landxml_surfaces_are_indexed_off_the_gui_thread(qtbot, tmp_path):
+    path = tmp_path / "site.xml"
+    path.write_text(XML)
+    InterpolatorCache().clear()
+    parser = LandXMLParser()
+
+    dialog = ImportOptionsDialog(None, parser, "site", str(path))
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: dialog.combo_surface.count() == 2, timeout=10000)
+    assert dialog.combo_surface.isEnabled() and dialog.progress_index.isHidden()
+    dialog.combo_surface.setCurrentIndex(1)
+    assert dialog.get_options()["surface_name"] == "FG"
+
+    # Once indexed, the surfaces are listed straight from the cache
+    again = ImportOptionsDialog(None, parser, "site", str(path))
+    qtbot.addWidget(again)
+    assert again.combo_surface.count() == 2 and not hasattr(again, "progress_index")
@@ -0,0 +1,40 @@
+import pytest
+
+from digcalc_project.src.core.importers.csv_parser import CSVParser
+from digcalc_project.src.models.project import Project
+from digcalc_project.src.ui.import_manager import ImportJobManager
+
+
+@pytest.fixture
+def points_csv(tmp_path):
+    path = tmp_path / "points.csv"
+    path.write_text("".join(f"{i},{i % 7},{0.1 * i}\n" for i in range(500)))
+    return path
+
+
+def test_import_adds_surface_to_project(qtbot, make_controller, points_csv):
+    project = Project(name="Import")
+    controller = make_controller(project)
+    manager = ImportJobManager(controller)
+    progress = []
+    manager.import_progress.connect(lambda name, p: progress.append(p))
+
+    with qtbot.waitSignal(manager.import_finished, timeout=10000) as blocker:
+        manager.start(CSVParser(), str(points_csv), surface_name="Existing Surface")
+    assert blocker.args == ["Existing Surface"]
+    assert len(project.surfaces["Existing Surface"].vertices) == 500
+    assert progress and progress[-1].rows == 500
+    assert controller.modified and not manager.is_busy()
+    manager.shutdown()
+
+
+def test_result_for_a_closed_project_is_discarded(qtbot, make_controller, points_csv):
+    project = Project(name="Old")
+    controller = make_controller(project)
+    manager = ImportJobManager(controller)
+
+    with qtbot.waitSignal(manager.import_cancelled, timeout=10000):
+        manager.start(CSVParser(), str(points_csv), surface_name="Existing Surface")
+        controller.project = Project(name="New")
+    assert not project.surfaces and not controller.project.surfaces
+    manager.shutdown()
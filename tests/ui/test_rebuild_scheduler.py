@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from digcalc_project.src.core.geometry.surface_builder import SurfaceBuilder
+from digcalc_project.src.models.project import Project
+from digcalc_project.src.ui.rebuild_scheduler import SurfaceRebuildScheduler
+
+
+def _contours(seed):
+    rng = np.random.default_rng(seed)
+    return [{"points": rng.uniform(0, 50, size=(20, 2)).tolist(), "elevation": float(e)} for e in range(6)]
+
+
+@pytest.fixture
+def project():
+    proj = Project(name="Rebuild")
+    proj.traced_polylines["Contours"] = _contours(1)
+    proj.layer_revisions["Contours"] = 1
+    surf = SurfaceBuilder.build_from_polylines("Contours", proj.traced_polylines["Contours"], 1)
+    surf.name = "Existing"
+    proj.surfaces["Existing"] = surf
+    return proj
+
+
+def test_rebuild_runs_in_background_and_publishes(qtbot, make_controller, project):
+    controller = make_controller(project)
+    scheduler = SurfaceRebuildScheduler(controller)
+    project.traced_polylines["Contours"][0]["points"][3][0] += 1.0
+    project.layer_revisions["Contours"] = 2
+
+    with qtbot.waitSignal(controller.surfaces_rebuilt, timeout=10000):
+        assert scheduler.schedule("Contours") is True
+    surf = project.surfaces["Existing"]
+    assert surf.name == "Existing" and surf.source_layer_revision == 2 and not surf.is_stale
+    assert controller.modified and not scheduler.is_busy()
+    # Nothing left to do at the current revision
+    assert scheduler.schedule("Contours") is False
+    scheduler.shutdown()
+
+
+def test_superseded_revisions_are_coalesced(qtbot, make_controller, project):
+    controller = make_controller(project)
+    scheduler = SurfaceRebuildScheduler(controller)
+    published = []
+    scheduler.surface_rebuilt.connect(lambda name: published.append(project.surfaces[name].source_layer_revision))
+
+    for rev in range(2, 6):
+        project.traced_polylines["Contours"] = _contours(rev)
+        project.layer_revisions["Contours"] = rev
+        scheduler.schedule("Contours")
+
+    qtbot.waitUntil(lambda: not scheduler.is_busy(), timeout=10000)
+    # Revisions 3 and 4 were replaced in the queue and never built; 2 was discarded
+    assert published == [5]
+    expected = SurfaceBuilder.build_from_polylines("Contours", _contours(5), 5)
+    assert len(project.surfaces["Existing"].vertices) == len(expected.vertices)
+    scheduler.shutdown()
+
+
+def test_results_for_a_closed_project_are_dropped(qtbot, make_controller, project):
+    controller = make_controller(project)
+    scheduler = SurfaceRebuildScheduler(controller)
+    project.layer_revisions["Contours"] = 2
+    old_surface = project.surfaces["Existing"]
+
+    scheduler.schedule("Contours")
+    controller.project = Project(name="Other")
+    scheduler.cancel()
+    qtbot.waitUntil(lambda: not scheduler.is_busy(), timeout=10000)
+    assert project.surfaces["Existing"] is old_surface
+    scheduler.shutdown()